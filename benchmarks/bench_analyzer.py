@@ -0,0 +1,55 @@
+"""Static analysis of a generated code base: in-process vs. across worker processes.
+
+Run with `python -m benchmarks.bench_analyzer`.
+"""
+
+import os
+import tempfile
+import time
+
+from pieceful.analyzer import analyze_files, build_graph, iter_python_files
+
+FILES = 5_000
+
+MODULE = '''
+from typing import Annotated
+from pieceful import Piece, Scope
+
+
+class Service{i}:
+    pass
+
+
+@Piece("service_{i}", scope=Scope.ORIGINAL)
+class Service{i}Impl(Service{i}):
+    def __init__(
+        self,
+        previous: Annotated[Service{previous}, "service_{previous}"],
+        retries: Annotated[int, lambda: 3],
+        timeout: float = 1.0,
+    ) -> None:
+        self.previous = previous
+''' + "\n".join(f"def helper_{{i}}_{j}(value):\n    return value * {j}\n" for j in range(40))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(FILES):
+            with open(os.path.join(root, f"service_{i}.py"), "w") as file:
+                file.write(MODULE.format(i=i, previous=(i - 1) % FILES))
+        files = list(iter_python_files([root]))
+
+        results = {}
+        for processes in (1, max(2, os.cpu_count() or 1)):
+            start = time.perf_counter()
+            graph = build_graph(analyze_files(files, processes))
+            results[processes] = time.perf_counter() - start
+            assert len(graph.pieces) == FILES and not graph.missing
+
+    print(f"files: {FILES}, cycles found: {len(graph.cycles)}")
+    for processes, elapsed in results.items():
+        print(f"{processes:>3} process(es): {elapsed * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
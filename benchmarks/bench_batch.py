@@ -0,0 +1,65 @@
+"""Registering 10k pieces one by one vs. `register_many` (single validation pass and publish).
+
+Run with `python -m benchmarks.bench_batch`.
+"""
+
+import time
+from typing import Annotated
+
+from pieceful import InitStrategy, register_many, register_piece, register_piece_factory
+from pieceful.registry import registry
+
+N = 10_000
+
+
+class Base:
+    pass
+
+
+def _definitions() -> list[tuple]:
+    definitions: list[tuple] = []
+    for i in range(N):
+        cls = type(f"Piece{i}", (Base,), {})
+        if i % 2:
+            # every other piece is a factory depending on the previous piece
+            dependency = Annotated[Base, f"Piece{i - 1}"]
+
+            def factory(dependency: dependency, cls=cls) -> Base:  # type: ignore[valid-type]
+                return cls()
+
+            factory.__annotations__["return"] = cls
+            definitions.append((factory, f"Piece{i}", InitStrategy.EAGER if i % 10 == 1 else InitStrategy.LAZY))
+        else:
+            definitions.append((cls, f"Piece{i}"))
+    return definitions
+
+
+def _one_by_one(definitions: list[tuple]) -> None:
+    for constructor, *options in definitions:
+        if isinstance(constructor, type):
+            register_piece(constructor, *options)
+        else:
+            register_piece_factory(constructor, *options)
+
+
+def _measure(register, definitions: list[tuple]) -> float:
+    registry.clear()
+    start = time.perf_counter()
+    register(definitions)
+    elapsed = time.perf_counter() - start
+    assert len(registry.registry) == N
+    return elapsed
+
+
+def main() -> None:
+    definitions = _definitions()
+    one_by_one = _measure(_one_by_one, definitions)
+    batch = _measure(register_many, definitions)
+
+    print(f"pieces: {N}")
+    print(f"one by one:    {one_by_one * 1e3:8.1f} ms")
+    print(f"register_many: {batch * 1e3:8.1f} ms ({one_by_one / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Spin-up of `spawn` process pool: workers importing the application vs. loading a blueprint.
+
+The generated application has many modules of pieces and a bootstrap module importing all of them
+(and sleeping to simulate other start-up work). Each task needs pieces of a single module.
+
+Run with `python -m benchmarks.bench_blueprint`.
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pieceful import provide
+from pieceful.blueprint import Blueprint, load_blueprint
+from pieceful.registry import registry
+
+MODULES = 40
+PIECES = 50
+WORKERS = 4
+BOOTSTRAP_SECONDS = 0.3
+
+
+def _write_app(root: str) -> None:
+    package = os.path.join(root, "bench_app")
+    os.mkdir(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    for m in range(MODULES):
+        with open(os.path.join(package, f"services_{m}.py"), "w") as file:
+            file.write("from typing import Annotated\nfrom pieceful import Piece\n")
+            for p in range(PIECES):
+                dependency = f', previous: Annotated[object, "service_{m}_{p - 1}"]' if p else ""
+                file.write(
+                    f'\n\n@Piece("service_{m}_{p}")\nclass Service{p}:\n'
+                    f"    def __init__(self{dependency}) -> None:\n        pass\n"
+                )
+    with open(os.path.join(package, "bootstrap.py"), "w") as file:
+        file.write(f"import time\ntime.sleep({BOOTSTRAP_SECONDS})\n")
+        file.write("".join(f"import bench_app.services_{m}\n" for m in range(MODULES)))
+
+
+def _import_app(root: str) -> None:
+    sys.path.insert(0, root)
+    importlib.import_module("bench_app.bootstrap")
+
+
+def _load_blueprint(root: str, blueprint: Blueprint) -> None:
+    sys.path.insert(0, root)
+    load_blueprint(blueprint)
+
+
+def _task(i: int) -> str:
+    return type(provide(object, f"service_{i % MODULES}_{PIECES - 1}")).__name__
+
+
+def _spin_up(initializer, initargs) -> float:
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with ProcessPoolExecutor(WORKERS, context, initializer=initializer, initargs=initargs) as pool:
+        results = list(pool.map(_task, range(WORKERS * 4)))
+    assert results == [f"Service{PIECES - 1}"] * len(results)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as root:
+        _write_app(root)
+        _import_app(root)
+        blueprint = registry.blueprint()
+
+        imported = _spin_up(_import_app, (root,))
+        loaded = _spin_up(_load_blueprint, (root, blueprint))
+
+    print(f"pieces: {MODULES * PIECES} in {MODULES} modules, workers: {WORKERS}, tasks: {WORKERS * 4}")
+    print(f"import application: {imported * 1e3:8.1f} ms")
+    print(f"load blueprint:     {loaded * 1e3:8.1f} ms ({imported / loaded:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Type-only lookups with the type index (`Registry.implementation`) and with scanning registry
+(`Registry._find_all`, as behind `get_pieces_by_supertype`), when registrations and lookups interleave
+(as during startup) and when registry does not change anymore.
+
+Run with `python -m benchmarks.bench_by_type`.
+"""
+
+import time
+import timeit
+
+from pieceful.enums import Scope
+from pieceful.piece_data import piece_data_factory
+from pieceful.registry import Registry
+
+N = 2_000
+LOOKUPS = 100_000
+
+
+def _types() -> list[tuple[type, type]]:
+    """Pairs of interface and its only implementation."""
+    pairs = []
+    for i in range(N):
+        interface = type(f"Interface{i}", (), {})
+        pairs.append((interface, type(f"Implementation{i}", (interface,), {})))
+    return pairs
+
+
+def _scan(registry: Registry, interface: type) -> None:
+    (match,) = registry._find_all(interface)
+
+
+def _startup(pairs: list[tuple[type, type]], lookup) -> float:
+    """Registers implementations, each followed by lookup of a previously registered interface."""
+    registry = Registry()
+    start = time.perf_counter()
+    for i, (_, implementation) in enumerate(pairs):
+        registry.add(implementation.__name__, piece_data_factory(implementation, Scope.UNIVERSAL, implementation))
+        lookup(registry, pairs[i // 2][0])
+    return time.perf_counter() - start
+
+
+def _steady(pairs: list[tuple[type, type]], lookup) -> float:
+    registry = Registry()
+    for _, implementation in pairs:
+        registry.add(implementation.__name__, piece_data_factory(implementation, Scope.UNIVERSAL, implementation))
+    interface = pairs[N // 2][0]
+    return min(timeit.repeat(lambda: lookup(registry, interface), number=LOOKUPS, repeat=5)) / LOOKUPS * 1e9
+
+
+def main() -> None:
+    pairs = _types()
+    cases = {"scan": _scan, "index": Registry.implementation}
+
+    print(f"pieces: {N}")
+    for case, lookup in cases.items():
+        print(
+            f"{case:>6}: startup {_startup(pairs, lookup) * 1e3:.1f} ms, "
+            f"lookup after startup {_steady(pairs, lookup):.0f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Memory of per-tenant containers sharing piece definitions of one registry,
+compared to a separate registry (with own definitions) per tenant.
+
+Run with `python -m benchmarks.bench_containers`.
+"""
+
+import tracemalloc
+from typing import Annotated
+
+from pieceful.enums import Scope
+from pieceful.piece_data import piece_data_factory
+from pieceful.registry import Registry
+
+PIECES = 50
+
+
+class Settings:
+    pass
+
+
+def _definitions() -> list[tuple[str, type]]:
+    definitions = [("settings", Settings)]
+    for i in range(PIECES - 1):
+
+        def __init__(self, settings: Annotated[Settings, "settings"]) -> None:
+            self.settings = settings
+
+        definitions.append((f"service_{i}", type(f"Service{i}", (), {"__init__": __init__})))
+    return definitions
+
+
+def _populate(registry: Registry, definitions: list[tuple[str, type]]) -> None:
+    for name, type_ in definitions:
+        registry.add(name, piece_data_factory(type_, Scope.UNIVERSAL, type_))
+
+
+def _warm_up(container, definitions: list[tuple[str, type]]) -> None:
+    for name, type_ in definitions:
+        container.get_object(name, type_)
+
+
+def _measure(create, count: int) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tenants = [create() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tenants
+    return size // count
+
+
+def main() -> None:
+    definitions = _definitions()
+    catalog = Registry()
+    _populate(catalog, definitions)
+
+    def empty_container():
+        return catalog.container()
+
+    def warm_container():
+        container = catalog.container()
+        _warm_up(container, definitions)
+        return container
+
+    def warm_registry():
+        registry = Registry()
+        _populate(registry, definitions)
+        _warm_up(registry, definitions)
+        return registry
+
+    print(f"pieces per tenant: {PIECES}")
+    for count in (1_000, 10_000):
+        print(f"{count} tenants, bytes per tenant:")
+        print(f"  empty container:          {_measure(empty_container, count)}")
+        print(f"  warmed-up container:      {_measure(warm_container, count)}")
+        if count <= 1_000:  # parsing definitions per tenant is slow
+            print(f"  warmed-up registry:       {_measure(warm_registry, count)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Discovering pieces of a type to pick few of them: `get_pieces_by_supertype` creates every matching piece,
+`describe_pieces_by_supertype` returns descriptors and only picked pieces are created by their providers.
+
+Run with `python -m benchmarks.bench_describe`.
+"""
+
+import time
+import tracemalloc
+
+from pieceful import describe_pieces_by_supertype, get_pieces_by_supertype, register_piece
+from pieceful.registry import registry
+
+PLUGINS = 200
+SIZE = 256 * 1024
+PICKED = "plugin_7"
+
+
+class Plugin:
+    def __init__(self) -> None:
+        self.state = bytearray(SIZE)
+        time.sleep(0.001)  # e.g. loading configuration or model
+
+
+def _register() -> None:
+    for i in range(PLUGINS):
+        register_piece(type(f"Plugin{i}", (Plugin,), {}), f"plugin_{i}")
+
+
+def _instances() -> Plugin:
+    plugins = {type(plugin).__name__: plugin for plugin in get_pieces_by_supertype(Plugin)}
+    return plugins["Plugin7"]
+
+
+def _descriptors() -> Plugin:
+    descriptors = {d.name: d for d in describe_pieces_by_supertype(Plugin)}
+    return descriptors[PICKED].provider()
+
+
+def main() -> None:
+    print(f"plugins: {PLUGINS} x {SIZE / 1024:.0f} KiB, picking one of them")
+    for case, pick in {"get_pieces_by_supertype": _instances, "describe_pieces_by_supertype": _descriptors}.items():
+        registry.clear()
+        _register()
+        tracemalloc.start()
+        start = time.perf_counter()
+        plugin = pick()
+        elapsed = time.perf_counter() - start
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert isinstance(plugin, Plugin)
+        print(f"{case:>28}: {elapsed * 1e3:8.2f} ms, held {held / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
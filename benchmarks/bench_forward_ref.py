@@ -0,0 +1,89 @@
+"""Startup with string annotations referencing a lazily imported heavy module vs. evaluated annotations.
+
+Pieces annotate their dependency as `heavy.Heavy`, where `heavy` is imported with `importlib.util.LazyLoader`
+(its body sleeps to simulate expensive import). Evaluated annotations load the module while pieces are
+defined, string annotations (`from __future__ import annotations`) defer it to the first resolution.
+
+Run with `python -m benchmarks.bench_forward_ref`.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+
+from pieceful import provide, register_piece
+from pieceful.registry import registry
+
+N = 1_000
+IMPORT_SECONDS = 0.3
+
+HEAVY = f"import time\ntime.sleep({IMPORT_SECONDS})\n\nclass Heavy:\n    pass\n"
+
+# `heavy` is bound in globals of the module, `import heavy` statement would load it (import reads `__spec__`)
+APP = "{future}\nfrom typing import Annotated\nfrom pieceful import Piece\n" + "".join(
+    f"""
+
+@Piece("service_{i}")
+class Service{i}:
+    def __init__(self, dependency: Annotated[heavy.Heavy, "heavy"]) -> None:
+        self.dependency = dependency
+"""
+    for i in range(N)
+)
+
+
+def _lazy_import(name: str, path: str) -> None:
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+
+def _is_loaded(name: str) -> bool:
+    # LazyLoader swaps module class to plain ModuleType once the module is executed
+    return type(sys.modules[name]) is types.ModuleType
+
+
+def _startup(root: str, future: str) -> tuple[float, bool, float]:
+    registry.clear()
+    _lazy_import("heavy", os.path.join(root, "heavy.py"))
+
+    start = time.perf_counter()
+    namespace = {"__name__": f"bench_app_{bool(future)}", "heavy": sys.modules["heavy"]}
+    exec(compile(APP.format(future=future), "app.py", "exec"), namespace)
+    registration = time.perf_counter() - start
+    loaded = _is_loaded("heavy")
+
+    start = time.perf_counter()
+    register_piece(sys.modules["heavy"].Heavy, "heavy")
+    provide(object, "service_0")
+    first_resolution = time.perf_counter() - start
+
+    del sys.modules["heavy"]
+    return registration, loaded, first_resolution
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, "heavy.py"), "w") as file:
+            file.write(HEAVY)
+        cases = {
+            "evaluated annotations": _startup(root, ""),
+            "string annotations": _startup(root, "from __future__ import annotations"),
+        }
+
+    print(f"pieces: {N}, import of heavy module: {IMPORT_SECONDS * 1e3:.0f} ms")
+    for case, (registration, loaded, first) in cases.items():
+        print(
+            f"{case:>22}: definition + registration {registration * 1e3:7.1f} ms (heavy loaded: {loaded}), "
+            f"first resolution {first * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Overhead of `@inject` compared to a direct call with explicitly passed pieces.
+
+Run with `python -m benchmarks.bench_inject`.
+"""
+
+import timeit
+from typing import Annotated
+
+from pieceful import Piece, Scope, inject, provide
+
+CALLS = 500_000
+
+
+class Machine:
+    pass
+
+
+@Piece("engine")
+class Engine(Machine):
+    pass
+
+
+@Piece("wheel", scope=Scope.ORIGINAL)
+class Wheel:
+    pass
+
+
+def handler(request: int, engine: Annotated[Engine, "engine"]) -> int:
+    return request
+
+
+def handler_supertype(request: int, engine: Annotated[Machine, "engine"]) -> int:
+    return request
+
+
+def handler_original(request: int, wheel: Annotated[Wheel, "wheel"]) -> int:
+    return request
+
+
+def main() -> None:
+    injected = inject(handler)
+    injected_supertype = inject(handler_supertype)
+    injected_original = inject(handler_original)
+    engine = provide(Engine, "engine")
+
+    cases = {
+        "direct call": lambda: handler(1, engine),
+        "direct call + provide": lambda: handler(1, provide(Engine, "engine")),
+        "@inject (UNIVERSAL)": lambda: injected(1),
+        "direct call + provide (supertype)": lambda: handler_supertype(1, provide(Machine, "engine")),
+        "@inject (supertype)": lambda: injected_supertype(1),
+        "direct call + provide (ORIGINAL)": lambda: handler_original(1, provide(Wheel, "wheel")),
+        "@inject (ORIGINAL)": lambda: injected_original(1),
+    }
+    for case, fn in cases.items():
+        ns = min(timeit.repeat(fn, number=CALLS, repeat=5)) / CALLS * 1e9
+        print(f"{case:>34}: {ns:.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
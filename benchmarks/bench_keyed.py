@@ -0,0 +1,70 @@
+"""Per-shard instances: one named piece per shard vs. one keyed piece with bounded LRU cache.
+
+Reports registry size, memory held after touching every shard and latency of cached lookups.
+
+Run with `python -m benchmarks.bench_keyed`.
+"""
+
+import timeit
+import tracemalloc
+from typing import Annotated
+
+from pieceful import Key, Keyed, PieceFactory, provide, register_piece_factory
+from pieceful.registry import registry
+
+SHARDS = 2_000
+MAX_SIZE = 100
+LOOKUPS = 100_000
+
+
+class Connection:
+    def __init__(self, shard: str) -> None:
+        self.shard = shard
+        self.buffer = bytearray(8 * 1024)
+
+
+def _named() -> None:
+    for i in range(SHARDS):
+
+        def connection(shard: str = f"shard-{i}") -> Connection:
+            return Connection(shard)
+
+        register_piece_factory(connection, f"connection-{i}")
+    for i in range(SHARDS):
+        provide(Connection, f"connection-{i}")
+
+
+def _keyed() -> None:
+    @PieceFactory("connection", keyed=Keyed(max_size=MAX_SIZE))
+    def connection(shard: Annotated[str, Key]) -> Connection:
+        return Connection(shard)
+
+    for i in range(SHARDS):
+        provide(Connection, "connection", key=f"shard-{i}")
+
+
+def _measure(setup, lookup) -> tuple[int, float, float]:
+    registry.clear()
+    tracemalloc.start()
+    setup()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_lookup = min(timeit.repeat(lookup, number=LOOKUPS, repeat=5)) / LOOKUPS * 1e9
+    return len(registry.registry), held / 2**20, per_lookup
+
+
+def main() -> None:
+    hot = f"shard-{SHARDS - 1}"
+    cases = {
+        "named piece per shard": (_named, lambda: provide(Connection, f"connection-{SHARDS - 1}")),
+        f"keyed, max_size={MAX_SIZE}": (_keyed, lambda: provide(Connection, "connection", key=hot)),
+    }
+    print(f"shards: {SHARDS}")
+    for case, (setup, lookup) in cases.items():
+        names, held, per_lookup = _measure(setup, lookup)
+        print(f"{case:>22}: registry names {names}, held {held:.1f} MiB, cached lookup {per_lookup:.0f} ns")
+    print(registry.keyed_stats(Connection, "connection"))
+
+
+if __name__ == "__main__":
+    main()
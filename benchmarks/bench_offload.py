@@ -0,0 +1,74 @@
+"""Event loop lag while async handlers resolve pieces with blocking constructors:
+`provide` (constructors run in event loop) vs. `aprovide` of pieces registered with `offload=True`.
+
+Lag is how late the loop wakes up a task sleeping for `TICK` seconds.
+
+Run with `python -m benchmarks.bench_offload`.
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pieceful import aprovide, provide, register_piece
+from pieceful.registry import registry
+
+PIECES = 20
+HANDLERS = 50
+BLOCKING = 0.02
+TICK = 0.001
+
+
+def _slow_type(i: int, offload: bool) -> type:
+    def __init__(self) -> None:
+        time.sleep(BLOCKING)  # e.g. reading files, DNS lookup, TLS setup
+
+    cls = type(f"Slow{i}", (), {"__init__": __init__})
+    register_piece(cls, f"{'offloaded' if offload else 'inline'}_{i}", offload=offload)
+    return cls
+
+
+async def _monitor(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def _run(handler) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor(lags, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(HANDLERS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return elapsed, lags
+
+
+def main() -> None:
+    inline = [_slow_type(i, False) for i in range(PIECES)]
+    offloaded = [_slow_type(i, True) for i in range(PIECES)]
+
+    async def provide_handler(i: int) -> None:
+        provide(inline[i % PIECES], f"inline_{i % PIECES}")
+        await asyncio.sleep(0)
+
+    async def aprovide_handler(i: int) -> None:
+        await aprovide(offloaded[i % PIECES], f"offloaded_{i % PIECES}")
+
+    registry.set_executor(ThreadPoolExecutor(PIECES))
+    print(f"pieces: {PIECES} (constructor blocks {BLOCKING * 1e3:.0f} ms), concurrent handlers: {HANDLERS}")
+    for case, handler in (("provide", provide_handler), ("aprovide offload", aprovide_handler)):
+        elapsed, lags = asyncio.run(_run(handler))
+        print(
+            f"{case:>16}: total {elapsed * 1e3:.0f} ms, loop lag max {max(lags) * 1e3:.1f} ms, "
+            f"p50 {statistics.median(lags) * 1e3:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Fetching the same `UNIVERSAL` pieces repeatedly: `provide` by name and type vs. `registry.get` of bound keys.
+
+Run with `python -m benchmarks.bench_piece_key`.
+"""
+
+import timeit
+
+from pieceful import provide, register_piece
+from pieceful.registry import registry
+
+N = 1_000
+LOOKUPS = 100_000
+
+
+class Base:
+    pass
+
+
+def main() -> None:
+    types = [type(f"Piece{i}", (Base,), {}) for i in range(N)]
+    keys = [register_piece(t) for t in types]
+    hot = types[:: N // 10]
+    hot_keys = [registry.key(Base, t.__name__) for t in hot]
+    for key in hot_keys:
+        registry.get(key)
+
+    cases = {
+        "provide(T, name)": lambda: [provide(t, t.__name__) for t in hot],
+        "provide(Base, name)": lambda: [provide(Base, t.__name__) for t in hot],
+        "registry.get(key)": lambda: [registry.get(key) for key in hot_keys],
+    }
+    repeats = LOOKUPS // len(hot)
+    print(f"pieces: {len(keys)}, hot pieces: {len(hot)}")
+    for case, fn in cases.items():
+        per_lookup = min(timeit.repeat(fn, number=repeats, repeat=5)) / LOOKUPS * 1e9
+        print(f"{case:>20}: {per_lookup:.0f} ns per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Start-up time and memory of one deployment role: all pieces registered vs. pieces activated by profile.
+
+Each of the roles has its own EAGER pieces (holding a buffer) with a few dependencies.
+
+Run with `python -m benchmarks.bench_profiles`.
+"""
+
+import time
+import tracemalloc
+from typing import Annotated
+
+from pieceful import InitStrategy, register_piece
+from pieceful.registry import registry
+
+ROLES = ("api", "worker", "cron")
+PIECES = 1_000
+
+
+class Settings:
+    pass
+
+
+def _classes(role: str) -> list[type]:
+    def __init__(
+        self,
+        settings: Annotated[Settings, "settings"],
+        retries: Annotated[int, lambda: 3],
+        timeout: float = 1.0,
+    ) -> None:
+        self.buffer = bytearray(4_096)
+
+    return [type(f"{role.title()}Service{i}", (), {"__init__": __init__}) for i in range(PIECES)]
+
+
+def _start(classes: dict[str, list[type]], profiled: bool) -> tuple[float, float]:
+    registry.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    register_piece(Settings, "settings")
+    for role, role_classes in classes.items():
+        for cls in role_classes:
+            register_piece(cls, cls.__name__, InitStrategy.EAGER, profiles=role if profiled else None)
+    if profiled:
+        registry.activate("api")
+
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, memory
+
+
+def main() -> None:
+    classes = {role: _classes(role) for role in ROLES}
+    everything = _start(classes, profiled=False)
+    api = _start(classes, profiled=True)
+
+    print(f"roles: {len(ROLES)}, pieces per role: {PIECES}")
+    for case, (elapsed, memory) in {"all pieces": everything, "profile api": api}.items():
+        print(f"{case:>12}: start-up {elapsed * 1e3:7.1f} ms, memory {memory / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Creating many `ORIGINAL` instances: `provide` in a loop vs. `Provider` vs. `Provider.many`.
+
+Run with `python -m benchmarks.bench_provider`.
+"""
+
+import timeit
+from typing import Annotated
+
+from pieceful import Piece, Scope, provide
+from pieceful.registry import registry
+
+N = 10_000
+
+
+class Settings:
+    pass
+
+
+class Base:
+    pass
+
+
+@Piece("settings")
+class AppSettings(Settings):
+    pass
+
+
+@Piece("request", scope=Scope.ORIGINAL)
+class Request(Base):
+    def __init__(self, settings: Annotated[Settings, "settings"], retries: int = 3) -> None:
+        self.settings = settings
+        self.retries = retries
+
+
+def main() -> None:
+    provider = registry.provider(Base, "request")
+    cases = {
+        "provide() in loop": lambda: [provide(Base, "request") for _ in range(N)],
+        "provider() in loop": lambda: [provider() for _ in range(N)],
+        "provider.many()": lambda: provider.many(N),
+    }
+    for case, fn in cases.items():
+        ns = min(timeit.repeat(fn, number=10, repeat=3)) / (10 * N) * 1e9
+        print(f"{case:>20}: {ns:.0f} ns/instance")
+
+
+if __name__ == "__main__":
+    main()
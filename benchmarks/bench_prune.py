@@ -0,0 +1,69 @@
+"""Start-up time and memory of a service using a small part of registered graph: without and with `prune`.
+
+Pieces form chains of dependencies, every piece is EAGER and holds a buffer; the service uses one chain.
+
+Run with `python -m benchmarks.bench_prune`.
+"""
+
+import time
+import tracemalloc
+from typing import Annotated
+
+from pieceful import InitStrategy, register_piece
+from pieceful.registry import registry
+
+CHAINS = 50
+LENGTH = 100
+
+
+def _constructor(dependency: str | None):
+    if dependency is None:
+
+        def __init__(self) -> None:
+            self.buffer = bytearray(4_096)
+
+    else:
+
+        def __init__(self, previous: Annotated[object, dependency]) -> None:  # type: ignore[valid-type]
+            self.buffer = bytearray(4_096)
+
+    return __init__
+
+
+def _classes() -> list[list[type]]:
+    return [
+        [
+            type(f"Piece{c}_{i}", (), {"__init__": _constructor(f"piece_{c}_{i - 1}" if i else None)})
+            for i in range(LENGTH)
+        ]
+        for c in range(CHAINS)
+    ]
+
+
+def _start(chains: list[list[type]], prune: bool) -> tuple[float, float]:
+    registry.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with registry.batch():
+        for c, chain in enumerate(chains):
+            for i, cls in enumerate(chain):
+                register_piece(cls, f"piece_{c}_{i}", InitStrategy.EAGER)
+        if prune:
+            registry.prune([f"piece_0_{LENGTH - 1}"])
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, memory
+
+
+def main() -> None:
+    chains = _classes()
+    results = {"whole graph": _start(chains, prune=False), "pruned": _start(chains, prune=True)}
+
+    print(f"pieces: {CHAINS * LENGTH}, reachable from root: {LENGTH}")
+    for case, (elapsed, memory) in results.items():
+        print(f"{case:>12}: start-up {elapsed * 1e3:7.1f} ms, memory {memory / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Registration time by number of pieces (storage is extended in place, so it grows linearly),
+memory per piece and lookup latency.
+
+Run with `python -m benchmarks.bench_storage`.
+"""
+
+import time
+import timeit
+import tracemalloc
+
+from pieceful.enums import Scope
+from pieceful.piece_data import piece_data_factory
+from pieceful.registry import Registry
+
+SIZES = (1_000, 5_000, 10_000)
+LOOKUPS = 200_000
+
+
+class Base:
+    def __init__(self) -> None:
+        pass
+
+
+def _types(n: int) -> list[type]:
+    return [type(f"Piece{i}", (Base,), {}) for i in range(n)]
+
+
+def _populate(registry: Registry, types: list[type]) -> None:
+    for t in types:
+        registry.add(t.__name__, piece_data_factory(t, Scope.UNIVERSAL, t))
+
+
+def _measure_lookups(registry: Registry, types: list[type]) -> dict[str, float]:
+    name, type_ = types[len(types) // 2].__name__, types[len(types) // 2]
+    cases = {
+        "exact": lambda: registry._get_piece_data(name, type_),
+        "supertype": lambda: registry._get_piece_data(name, Base),
+        "miss": lambda: registry._get_piece_data("missing", Base),
+    }
+    return {case: min(timeit.repeat(fn, number=LOOKUPS, repeat=5)) / LOOKUPS * 1e9 for case, fn in cases.items()}
+
+
+def main() -> None:
+    for n in SIZES:
+        types = _types(n)
+        start = time.perf_counter()
+        _populate(Registry(), types)
+        elapsed = time.perf_counter() - start
+        registry = Registry()
+        tracemalloc.start()
+        _populate(registry, types)
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{n:>6} pieces: registration {elapsed * 1e3:7.1f} ms ({elapsed / n * 1e6:.1f} us/piece)")
+    print(f"memory per piece: {held / n:.0f} B (traced while registering)")
+
+    for i in range(10_000):
+        registry[f"optional_{i}"]  # probing unknown names must not grow storage
+    assert len(registry.registry) == n
+    for case, ns in _measure_lookups(registry, types).items():
+        print(f"{case:>10} lookup: {ns:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Throughput scaling of `provide` from 1 to 64 threads for `UNIVERSAL` pieces, `ORIGINAL` pieces
+and `UNIVERSAL` pieces looked up by supertype.
+
+Run with `python -m benchmarks.bench_threads` on both GIL and free-threaded (3.13t+) interpreters,
+e.g. `python3.13t -X gil=0 -m benchmarks.bench_threads`. Speedup is relative to one thread,
+with the GIL it stays around 1, without it it should grow up to the number of cores.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Annotated, Any, Callable
+
+from pieceful import Piece, Scope, provide
+
+CALLS_PER_THREAD = 20_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class Machine:
+    pass
+
+
+@Piece("engine")
+class Engine(Machine):
+    pass
+
+
+@Piece("request", scope=Scope.ORIGINAL)
+class Request:
+    def __init__(self, engine: Annotated[Engine, "engine"]) -> None:
+        self.engine = engine
+
+
+CASES: dict[str, Callable[[], Any]] = {
+    "UNIVERSAL": lambda: provide(Engine, "engine"),
+    "ORIGINAL": lambda: provide(Request, "request"),
+    "supertype": lambda: provide(Machine, "engine"),
+}
+
+
+def _worker(barrier: threading.Barrier, call: Callable[[], Any]) -> None:
+    barrier.wait()
+    for _ in range(CALLS_PER_THREAD):
+        call()
+
+
+def _throughput(threads: int, call: Callable[[], Any]) -> float:
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=_worker, args=(barrier, call)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return CALLS_PER_THREAD * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, cpus {os.cpu_count()}")
+    print(f"{'threads':>7}" + "".join(f"{case:>26}" for case in CASES))
+    base: dict[str, float] = {}
+    for threads in THREAD_COUNTS:
+        row = f"{threads:>7}"
+        for case, call in CASES.items():
+            ops = _throughput(threads, call)
+            base.setdefault(case, ops)
+            row += f"{ops:>15,.0f}/s (x{ops / base[case]:5.2f})"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Memory held by large, rarely used pieces in a long-running worker: `UNIVERSAL` vs. `idle` + `registry.trim()`
+vs. `WEAK` scope, and the cost of creating a dropped piece again.
+
+Run with `python -m benchmarks.bench_trim`.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from pieceful import Scope, provide, register_piece
+from pieceful.registry import registry
+
+MODELS = 10
+SIZE = 8 * 2**20
+IDLE = 0.05
+
+
+class Model:
+    def __init__(self) -> None:
+        self.weights = bytearray(SIZE)
+
+
+def _register(**options) -> list[str]:
+    names = [f"model_{i}" for i in range(MODELS)]
+    for name in names:
+        register_piece(type(name, (Model,), {}), name, **options)
+    return names
+
+
+def _handle_requests(names: list[str]) -> None:
+    """Every model is needed by some request, nothing holds it afterwards."""
+    for name in names:
+        assert len(provide(Model, name).weights) == SIZE
+
+
+def main() -> None:
+    cases = {
+        "UNIVERSAL": {},
+        f"idle={IDLE}s + trim()": {"idle": IDLE},
+        "WEAK": {"scope": Scope.WEAK},
+    }
+    print(f"models: {MODELS} x {SIZE / 2**20:.0f} MiB")
+    for case, options in cases.items():
+        registry.clear()
+        gc.collect()
+        tracemalloc.start()
+        names = _register(**options)
+        _handle_requests(names)
+        time.sleep(IDLE)
+        dropped = registry.trim()
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        provide(Model, names[0])
+        again = time.perf_counter() - start
+        print(f"{case:>20}: held {held / 2**20:.1f} MiB, trimmed {dropped}, next request {again * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from .enums import InitStrategy, Scope
+from .enums import FactoryCache, InitStrategy, Scope
 from .exceptions import (
     AmbiguousPieceException,
     PieceException,
@@ -9,13 +9,24 @@ from .exceptions import (
 from .facade import (
     Piece,
     PieceFactory,
+    aprovide,
+    describe_pieces_by_name,
+    describe_pieces_by_supertype,
     get_piece,
     get_pieces_by_name,
     get_pieces_by_supertype,
+    inject,
     provide,
+    provide_by_type,
+    register_many,
     register_piece,
     register_piece_factory,
 )
+from .keyed import Keyed, KeyedStats
+from .parameters import TTL, AllOf, Key
+from .provider import Provider
+from .registry import PieceDescriptor
+from .storage import PieceKey
 
 __all__ = [
     "Piece",
@@ -23,8 +34,12 @@ __all__ = [
     "get_piece",
     "register_piece",
     "register_piece_factory",
+    "register_many",
     "get_pieces_by_name",
     "get_pieces_by_supertype",
+    "describe_pieces_by_name",
+    "describe_pieces_by_supertype",
+    "PieceDescriptor",
     "PieceException",
     "PieceNotFound",
     "UnresolvableParameter",
@@ -33,4 +48,15 @@ __all__ = [
     "InitStrategy",
     "Scope",
     "provide",
+    "aprovide",
+    "provide_by_type",
+    "inject",
+    "Provider",
+    "PieceKey",
+    "AllOf",
+    "Key",
+    "Keyed",
+    "KeyedStats",
+    "FactoryCache",
+    "TTL",
 ]
@@ -0,0 +1,519 @@
+"""Import-free extraction of pieces and their dependencies from source code.
+
+Modules are parsed with `ast`, never imported. Pieces are recognized in `@Piece`, `@PieceFactory`,
+`register_piece`, `register_piece_factory` and `register_many` usages, constructor parameters are
+interpreted by the same rules as `parameter_parser` uses at runtime. Types are matched by their
+simple names and class bases found in analyzed sources (or `object`/`Any`).
+"""
+
+import ast
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Iterator, Sequence
+
+PARALLEL_THRESHOLD = 64
+_ANY_TYPES = frozenset({"object", "Any"})
+_DECORATORS = frozenset({"Piece", "PieceFactory"})
+_REGISTRATIONS = {"register_piece": "piece_name", "register_piece_factory": "name"}
+
+
+@dataclass(slots=True)
+class StaticDependency:
+    parameter: str
+    piece_name: str | None  # None for `AllOf` collections
+    type: str
+    all_of: bool = False
+
+
+@dataclass(slots=True)
+class StaticPiece:
+    name: str
+    type: str
+    file: str
+    line: int
+    scope: str = "UNIVERSAL"
+    init_strategy: str = "LAZY"
+    dependencies: list[StaticDependency] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Definition:
+    kind: str  # "class" or "factory"
+    type: str
+    line: int
+    bases: tuple[str, ...] = ()
+    dependencies: list[StaticDependency] | None = None  # None when class inherits `__init__`
+
+
+@dataclass(slots=True)
+class _Registration:
+    reference: str
+    name: str | None
+    scope: str
+    init_strategy: str
+    line: int
+
+
+@dataclass(slots=True)
+class ModuleAnalysis:
+    file: str
+    definitions: dict[str, _Definition] = field(default_factory=dict)
+    registrations: list[_Registration] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StaticGraph:
+    pieces: list[StaticPiece]
+    missing: list[tuple[StaticPiece, StaticDependency]]
+    ambiguous: list[tuple[StaticPiece, StaticDependency, list[StaticPiece]]]
+    duplicates: list[tuple[StaticPiece, StaticPiece]]
+    cycles: list[list[StaticPiece]]
+    errors: list[str]
+    edges: dict[int, list[int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        def ref(piece: StaticPiece) -> dict[str, Any]:
+            return {"name": piece.name, "type": piece.type, "file": piece.file, "line": piece.line}
+
+        return {
+            "pieces": [asdict(piece) for piece in self.pieces],
+            "edges": [
+                {"from": ref(self.pieces[source]), "to": ref(self.pieces[target])}
+                for source, targets in self.edges.items()
+                for target in targets
+            ],
+            "missing": [{"piece": ref(piece), **asdict(dependency)} for piece, dependency in self.missing],
+            "ambiguous": [
+                {"piece": ref(piece), **asdict(dependency), "candidates": [ref(c) for c in candidates]}
+                for piece, dependency, candidates in self.ambiguous
+            ],
+            "duplicates": [[ref(first), ref(second)] for first, second in self.duplicates],
+            "cycles": [[ref(piece) for piece in cycle] for cycle in self.cycles],
+            "errors": self.errors,
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_table(self) -> str:
+        lines = [f"pieces: {len(self.pieces)}"]
+        for piece in self.pieces:
+            dependencies = ", ".join(
+                f"{d.parameter}->{'AllOf ' + d.type if d.all_of else d.piece_name}" for d in piece.dependencies
+            )
+            lines.append(f"  {piece.name}: {piece.type} [{piece.scope}, {piece.init_strategy}] {dependencies or '-'}")
+        for piece, dependency in self.missing:
+            lines.append(f"missing: {_where(piece)} `{dependency.parameter}` -> {dependency.piece_name}: {dependency.type}")
+        for piece, dependency, candidates in self.ambiguous:
+            names = ", ".join(candidate.type for candidate in candidates)
+            lines.append(f"ambiguous: {_where(piece)} `{dependency.parameter}` -> {dependency.piece_name}: {names}")
+        for first, second in self.duplicates:
+            lines.append(f"duplicate: {_where(second)} registers {second.type} as {first.name} again ({_where(first)})")
+        for cycle in self.cycles:
+            lines.append("cycle: " + " -> ".join(piece.name for piece in cycle + cycle[:1]))
+        lines.extend(f"error: {error}" for error in self.errors)
+        return "\n".join(lines) + "\n"
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.ambiguous or self.duplicates or self.cycles)
+
+
+def _where(piece: StaticPiece) -> str:
+    return f"{piece.file}:{piece.line}"
+
+
+def _simple_name(node: ast.AST | None) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):
+        return _simple_name(node.value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return _simple_name(_parse_string_annotation(node.value))
+    return None
+
+
+def _parse_string_annotation(annotation: str) -> ast.AST | None:
+    try:
+        return ast.parse(annotation, mode="eval").body
+    except SyntaxError:
+        return None
+
+
+def _subscript_args(node: ast.Subscript) -> list[ast.AST]:
+    return list(node.slice.elts) if isinstance(node.slice, ast.Tuple) else [node.slice]
+
+
+def _type_name(node: ast.AST) -> str:
+    """Simple name of type, `Provider[T]` is unwrapped as in `default_piece_name`."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        node = _parse_string_annotation(node.value) or node
+    if isinstance(node, ast.Subscript) and _simple_name(node.value) == "Provider":
+        return _type_name(_subscript_args(node)[0])
+    return _simple_name(node) or ast.unparse(node)
+
+
+def _collection_item(node: ast.AST) -> ast.AST | None:
+    if not isinstance(node, ast.Subscript):
+        return None
+    origin, args = _simple_name(node.value), _subscript_args(node)
+    if origin in ("list", "List") and len(args) == 1:
+        return args[0]
+    if origin in ("tuple", "Tuple") and len(args) == 2 and isinstance(args[1], ast.Constant) and args[1].value is ...:
+        return args[0]
+    if origin in ("dict", "Dict") and len(args) == 2 and _simple_name(args[0]) == "str":
+        return args[1]
+    return None
+
+
+def _parse_parameter(arg: ast.arg, errors: list[str], where: str) -> StaticDependency | None:
+    annotation = arg.annotation
+    if annotation is None:
+        errors.append(f"{where}: parameter `{arg.arg}` must be annotated")
+        return None
+    if isinstance(annotation, ast.Constant) and isinstance(annotation.value, str):
+        annotation = _parse_string_annotation(annotation.value) or annotation
+
+    if isinstance(annotation, ast.Subscript) and _simple_name(annotation.value) == "Annotated":
+        piece_type, *metadata = _subscript_args(annotation)
+        if not metadata:
+            errors.append(f"{where}: piece metadata not specified in Annotated[] of `{arg.arg}`")
+            return None
+        marker = metadata[0]
+        if isinstance(marker, ast.Constant) and isinstance(marker.value, str):
+            return StaticDependency(arg.arg, marker.value, _type_name(piece_type))
+        if _simple_name(marker) == "AllOf":
+            item = _collection_item(piece_type)
+            if item is None:
+                errors.append(f"{where}: AllOf requires `list[T]`, `tuple[T, ...]` or `dict[str, T]` for `{arg.arg}`")
+                return None
+            return StaticDependency(arg.arg, None, _type_name(item), all_of=True)
+        return None  # default factory
+
+    piece_type = _type_name(annotation)
+    return StaticDependency(arg.arg, piece_type, piece_type)
+
+
+def _parse_signature(
+    function: ast.FunctionDef | ast.AsyncFunctionDef, skip_first: bool, errors: list[str], where: str
+) -> list[StaticDependency]:
+    args = function.args
+    positional = args.posonlyargs + args.args
+    with_defaults = set(map(id, positional[len(positional) - len(args.defaults) :]))
+    with_defaults.update(id(arg) for arg, default in zip(args.kwonlyargs, args.kw_defaults) if default is not None)
+
+    dependencies = []
+    for arg in (positional[1:] if skip_first else positional) + args.kwonlyargs:
+        if id(arg) in with_defaults:
+            continue
+        if (dependency := _parse_parameter(arg, errors, where)) is not None:
+            dependencies.append(dependency)
+    return dependencies
+
+
+def _enum_member(node: ast.AST | None, default: str) -> str:
+    if node is None:
+        return default
+    return _simple_name(node) or "?"
+
+
+def _piece_name(node: ast.AST | None, default: str, errors: list[str], where: str) -> str:
+    if node is None or (isinstance(node, ast.Constant) and node.value is None):
+        return default
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    errors.append(f"{where}: piece name is not a string literal")
+    return "?"
+
+
+def _call_arguments(call: ast.Call, names: Sequence[str]) -> list[ast.AST | None]:
+    values: list[ast.AST | None] = [None] * len(names)
+    for i, arg in enumerate(call.args[: len(names)]):
+        values[i] = arg
+    for keyword in call.keywords:
+        if keyword.arg in names:
+            values[names.index(keyword.arg)] = keyword.value
+    return values
+
+
+def _definition(node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef, errors: list[str], file: str) -> _Definition:
+    where = f"{file}:{node.lineno}"
+    if isinstance(node, ast.ClassDef):
+        init = next(
+            (n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)) and n.name == "__init__"),
+            None,
+        )
+        bases = tuple(name for base in node.bases if (name := _simple_name(base)) is not None)
+        dependencies = None if init is None else _parse_signature(init, True, errors, where)
+        return _Definition("class", node.name, node.lineno, bases, dependencies)
+
+    if node.returns is None or (isinstance(node.returns, ast.Constant) and node.returns.value is None):
+        errors.append(f"{where}: function `{node.name}` must have return type specified and cannot be None")
+    piece_type = "?" if node.returns is None else _type_name(node.returns)
+    return _Definition("factory", piece_type, node.lineno, (), _parse_signature(node, False, errors, where))
+
+
+def analyze_source(source: str, file: str = "<string>") -> ModuleAnalysis:
+    """Extracts pieces, class definitions and registration calls from source of one module."""
+    analysis = ModuleAnalysis(file)
+    try:
+        tree = ast.parse(source, file)
+    except SyntaxError as e:
+        analysis.errors.append(f"{file}:{e.lineno}: {e.msg}")
+        return analysis
+
+    functions: dict[str, ast.FunctionDef | ast.AsyncFunctionDef] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = [
+                d for d in node.decorator_list if isinstance(d, ast.Call) and _simple_name(d.func) in _DECORATORS
+            ]
+            if not isinstance(node, ast.ClassDef) and not decorators:
+                functions.setdefault(node.name, node)  # becomes a definition only when registered
+                continue
+            analysis.definitions[node.name] = _definition(node, analysis.errors, file)
+            for decorator in decorators:
+                name, init_strategy, scope = _call_arguments(decorator, ("name", "init_strategy", "scope"))
+                analysis.registrations.append(
+                    _Registration(
+                        node.name,
+                        _piece_name(name, node.name, analysis.errors, f"{file}:{node.lineno}"),
+                        _enum_member(scope, "UNIVERSAL"),
+                        _enum_member(init_strategy, "LAZY"),
+                        node.lineno,
+                    )
+                )
+        elif isinstance(node, ast.Call):
+            function = _simple_name(node.func)
+            if function in _REGISTRATIONS:
+                reference, name, init_strategy, scope = _call_arguments(
+                    node, ("cls", _REGISTRATIONS[function], "creation_type", "scope")
+                )
+                _register(analysis, reference, name, init_strategy, scope, node.lineno)
+            elif function == "register_many" and node.args and isinstance(node.args[0], (ast.List, ast.Tuple, ast.Set)):
+                for item in node.args[0].elts:
+                    parts = list(item.elts) if isinstance(item, ast.Tuple) else [item]
+                    reference, name, init_strategy, scope = (parts + [None] * 4)[:4]
+                    _register(analysis, reference, name, init_strategy, scope, node.lineno)
+
+    for registration in analysis.registrations:
+        reference = registration.reference
+        if reference not in analysis.definitions and reference in functions:
+            analysis.definitions[reference] = _definition(functions[reference], analysis.errors, file)
+    return analysis
+
+
+def _register(
+    analysis: ModuleAnalysis,
+    reference: ast.AST | None,
+    name: ast.AST | None,
+    init_strategy: ast.AST | None,
+    scope: ast.AST | None,
+    line: int,
+) -> None:
+    where = f"{analysis.file}:{line}"
+    if (reference_name := _simple_name(reference)) is None:
+        analysis.errors.append(f"{where}: registered piece is not referenced by name")
+        return
+    analysis.registrations.append(
+        _Registration(
+            reference_name,
+            None if name is None else _piece_name(name, reference_name, analysis.errors, where),
+            _enum_member(scope, "UNIVERSAL"),
+            _enum_member(init_strategy, "LAZY"),
+            line,
+        )
+    )
+
+
+def analyze_file(path: str) -> ModuleAnalysis:
+    with open(path, "rb") as file:
+        source = file.read()
+    try:
+        return analyze_source(source.decode("utf-8"), path)
+    except UnicodeDecodeError as e:
+        return ModuleAnalysis(path, errors=[f"{path}: {e}"])
+
+
+def iter_python_files(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+                yield from (os.path.join(root, f) for f in sorted(files) if f.endswith(".py"))
+        else:
+            yield path
+
+
+def analyze_files(files: Sequence[str], processes: int | None = None) -> list[ModuleAnalysis]:
+    """Analyzes files, in `processes` worker processes (by default one per CPU) when there are many of them."""
+    workers = processes if processes is not None else os.cpu_count() or 1
+    if workers <= 1 or len(files) < PARALLEL_THRESHOLD:
+        return [analyze_file(path) for path in files]
+
+    chunksize = max(1, len(files) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze_file, files, chunksize=chunksize))
+
+
+def _resolve_dependencies(
+    definition: _Definition, definitions: dict[str, list[_Definition]]
+) -> list[StaticDependency]:
+    seen: set[str] = set()
+    while definition.dependencies is None:
+        base = next((b for b in definition.bases if b in definitions and b not in seen), None)
+        if base is None:
+            return []
+        seen.add(base)
+        definition = definitions[base][0]
+    return definition.dependencies
+
+
+def build_graph(modules: Iterable[ModuleAnalysis]) -> StaticGraph:
+    """Links pieces of analyzed modules and finds missing and ambiguous references, duplicates and cycles."""
+    modules = list(modules)
+    definitions: dict[str, list[_Definition]] = {}
+    for module in modules:
+        for key, definition in module.definitions.items():
+            definitions.setdefault(key, []).append(definition)
+
+    errors = [error for module in modules for error in module.errors]
+    pieces: list[StaticPiece] = []
+    for module in modules:
+        for registration in module.registrations:
+            definition = module.definitions.get(registration.reference) or next(
+                iter(definitions.get(registration.reference, ())), None
+            )
+            if definition is None:
+                errors.append(f"{module.file}:{registration.line}: definition of `{registration.reference}` not found")
+                continue
+            pieces.append(
+                StaticPiece(
+                    registration.name or registration.reference,
+                    definition.type,
+                    module.file,
+                    registration.line,
+                    registration.scope,
+                    registration.init_strategy,
+                    list(_resolve_dependencies(definition, definitions)),
+                )
+            )
+
+    bases: dict[str, set[str]] = {}
+    for key, defs in definitions.items():
+        for definition in defs:
+            if definition.kind == "class":
+                bases.setdefault(key, set()).update(definition.bases)
+
+    def ancestors(type_name: str) -> set[str]:
+        found, stack = {type_name}, [type_name]
+        while stack:
+            for base in bases.get(stack.pop(), ()):
+                if base not in found:
+                    found.add(base)
+                    stack.append(base)
+        return found
+
+    lineage = {piece.type: ancestors(piece.type) for piece in pieces}
+
+    def matches(piece: StaticPiece, wanted: str) -> bool:
+        return wanted in _ANY_TYPES or wanted in lineage[piece.type]
+
+    by_name: dict[str, list[int]] = {}
+    duplicates: list[tuple[StaticPiece, StaticPiece]] = []
+    for index, piece in enumerate(pieces):
+        same_name = by_name.setdefault(piece.name, [])
+        duplicate = next((pieces[i] for i in same_name if pieces[i].type == piece.type), None)
+        if duplicate is not None:
+            duplicates.append((duplicate, piece))
+        same_name.append(index)
+
+    edges: dict[int, list[int]] = {}
+    missing: list[tuple[StaticPiece, StaticDependency]] = []
+    ambiguous: list[tuple[StaticPiece, StaticDependency, list[StaticPiece]]] = []
+    for index, piece in enumerate(pieces):
+        targets = edges.setdefault(index, [])
+        for dependency in piece.dependencies:
+            if dependency.all_of:
+                targets.extend(i for i, candidate in enumerate(pieces) if matches(candidate, dependency.type))
+                continue
+            candidates = [i for i in by_name.get(dependency.piece_name or "", ()) if matches(pieces[i], dependency.type)]
+            exact = [i for i in candidates if pieces[i].type == dependency.type]
+            if not candidates:
+                missing.append((piece, dependency))
+            elif len(exact) == 1 or len(candidates) == 1:
+                targets.append(exact[0] if exact else candidates[0])
+            else:
+                ambiguous.append((piece, dependency, [pieces[i] for i in candidates]))
+                targets.extend(candidates)
+
+    cycles = [[pieces[i] for i in component] for component in _cycles(len(pieces), edges)]
+    return StaticGraph(pieces, missing, ambiguous, duplicates, cycles, errors, edges)
+
+
+def _cycles(size: int, edges: dict[int, list[int]]) -> list[list[int]]:
+    """Strongly connected components with a cycle (iterative Tarjan's algorithm)."""
+    index_of: dict[int, int] = {}
+    low: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(size):
+        if root in index_of:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, child = work.pop()
+            if child == 0:
+                index_of[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            targets = edges.get(node, [])
+            if child < len(targets):
+                work.append((node, child + 1))
+                target = targets[child]
+                if target not in index_of:
+                    work.append((target, 0))
+                elif target in on_stack:
+                    low[node] = min(low[node], index_of[target])
+                continue
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in targets:
+                    components.append(component[::-1])
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return components
+
+
+def analyze(paths: Iterable[str], processes: int | None = None) -> StaticGraph:
+    """Statically analyzes python files (directories are searched recursively) and builds graph of pieces.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        python files or directories
+    processes : int | None, optional
+        number of worker processes, by default one per CPU (files are analyzed in-process when there are few)
+
+    Returns
+    -------
+    StaticGraph
+        pieces, dependency edges and found problems
+    """
+    return build_graph(analyze_files(list(iter_python_files(paths)), processes))
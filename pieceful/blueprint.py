@@ -0,0 +1,154 @@
+"""Picklable description of registered pieces, to rebuild registry in other processes without importing
+modules that register pieces. Constructors are referenced by import paths and imported only when
+their piece is needed for the first time.
+"""
+
+import importlib
+import pickle
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .enums import InitStrategy, Scope
+from .exceptions import PieceIncorrectUseException
+from .parameters import CollectionParameter, DefaultParameter, ForwardPieceParameter, Parameter, PieceParameter
+from .keyed import Keyed
+from .piece_data import IdlePieceData, KeyedPieceData, PieceData, piece_data_factory
+
+# parameter layouts, types are stored as import paths:
+# ("piece", name, piece_name, type_path), ("forward", name, piece_name, expression, module),
+# ("collection", name, collection_type, item_type_path), ("default", name, value)
+ParameterLayout = tuple[tuple[Any, ...], ...]
+
+_COLLECTIONS = {"list": list, "tuple": tuple, "dict": dict}
+
+
+def import_path(obj: Any) -> str | None:
+    """`module:qualname` of class or function importable by `resolve_path`, otherwise None."""
+    module, qualname = getattr(obj, "__module__", None), getattr(obj, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        return None
+    return f"{module}:{qualname}"
+
+
+def resolve_path(path: str) -> Any:
+    module, _, qualname = path.partition(":")
+    obj: Any = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def _picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _layout(parameters: Iterable[Parameter]) -> ParameterLayout | None:
+    """Layout of parsed parameters, None when some of them (e.g. default factories) cannot be described."""
+    layout: list[tuple[Any, ...]] = []
+    for param in parameters:
+        if isinstance(param, ForwardPieceParameter):
+            module = param.namespace.get("__name__")
+            if module is None:
+                return None
+            layout.append(("forward", param.name, param.piece_name, param.expression, module))
+        elif isinstance(param, PieceParameter):
+            if (path := import_path(param.type)) is None or not isinstance(param.type, type):
+                return None
+            layout.append(("piece", param.name, param.piece_name, path))
+        elif isinstance(param, CollectionParameter):
+            if (path := import_path(param.item_type)) is None or not isinstance(param.item_type, type):
+                return None
+            layout.append(("collection", param.name, param.collection_type.__name__, path))
+        elif isinstance(param, DefaultParameter) and _picklable(param.value):
+            layout.append(("default", param.name, param.value))
+        else:
+            return None
+    return tuple(layout)
+
+
+def _parameters(layout: ParameterLayout) -> tuple[Parameter, ...]:
+    parameters: list[Parameter] = []
+    for kind, name, *rest in layout:
+        if kind == "forward":
+            parameters.append(ForwardPieceParameter(name, rest[0], rest[1], vars(importlib.import_module(rest[2]))))
+        elif kind == "piece":
+            parameters.append(PieceParameter(name, rest[0], resolve_path(rest[1])))
+        elif kind == "collection":
+            parameters.append(CollectionParameter(name, _COLLECTIONS[rest[0]], resolve_path(rest[1])))
+        else:
+            parameters.append(DefaultParameter(name, rest[0]))
+    return tuple(parameters)
+
+
+@dataclass(frozen=True, slots=True)
+class PieceBlueprint:
+    name: str
+    type_path: str
+    constructor_path: str
+    scope: Scope
+    init_strategy: InitStrategy
+    parameters: ParameterLayout | None  # None when parameters are parsed from constructor again
+    offload: bool = False
+    keyed: tuple[str, Keyed] | None = None  # key parameter and caching policy of keyed piece
+    idle: float | None = None
+
+    @classmethod
+    def of(cls, name: str, piece_data: PieceData[Any]) -> "PieceBlueprint":
+        type_path, constructor_path = import_path(piece_data.type), import_path(piece_data._constructor)
+        if type_path is None or constructor_path is None:
+            raise PieceIncorrectUseException(
+                f"Piece `{name}` of type {piece_data.type} cannot be exported, its type and constructor must be "
+                "importable (defined at module level)."
+            )
+        return cls(
+            name,
+            type_path,
+            constructor_path,
+            piece_data.scope,
+            piece_data.init_strategy,
+            _layout(piece_data.parameters),
+            piece_data.offload,
+            (
+                (piece_data.key_parameter, piece_data.instances.policy)
+                if isinstance(piece_data, KeyedPieceData)
+                else None
+            ),
+            piece_data.idle if isinstance(piece_data, IdlePieceData) else None,
+        )
+
+    def build(self) -> PieceData[Any]:
+        """Imports constructor (and type) of the piece and creates its definition."""
+        constructor = resolve_path(self.constructor_path)
+        piece_type = constructor if self.type_path == self.constructor_path else resolve_path(self.type_path)
+        parameters = None if self.parameters is None else _parameters(self.parameters)
+        if self.keyed is not None:
+            key_parameter, policy = self.keyed
+            return KeyedPieceData(
+                piece_type, constructor, policy, parameters, self.offload, None if parameters is None else key_parameter
+            )
+        return piece_data_factory(
+            piece_type, self.scope, constructor, self.init_strategy, parameters, self.offload, idle=self.idle
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Blueprint:
+    """Picklable definitions of pieces, see `Registry.blueprint` and `Registry.from_blueprint`."""
+
+    pieces: tuple[PieceBlueprint, ...]
+
+    def keys(self) -> frozenset[tuple[str, str]]:
+        return frozenset((piece.name, piece.type_path) for piece in self.pieces)
+
+
+def load_blueprint(blueprint: Blueprint) -> None:
+    """Loads `blueprint` into the global registry, usable as initializer of process pool workers:
+    `ProcessPoolExecutor(initializer=load_blueprint, initargs=(registry.blueprint(),))`.
+    """
+    from .registry import registry
+
+    registry.load_blueprint(blueprint)
@@ -0,0 +1,128 @@
+import threading
+from typing import Any, Hashable, Iterable, Type, TypeVar
+
+from .enums import Scope
+from .exceptions import PieceIncorrectUseException
+from .keyed import KeyedInstances
+from .piece_data import IdlePieceData, KeyedPieceData, PieceData, piece_data_factory
+from .registry import Registry, collect, resolve_name, resolve_parameters, resolve_provider
+
+_T = TypeVar("_T")
+
+
+class Container:
+    """Lightweight view of a registry with its own instances of `UNIVERSAL` pieces.
+
+    Piece definitions (types, constructors, parsed parameters) are shared with the registry (catalog),
+    so a container costs little more than its instances. Use `Registry.container` to create one.
+
+    Instances of `WEAK` and `idle` pieces are held the same way as by the registry (`Registry.trim` trims
+    containers too), instances depending on a piece replaced in the registry are dropped.
+    """
+
+    __slots__ = ("catalog", "_instances", "_locks", "_keyed", "_evictable", "__weakref__")
+
+    def __init__(self, catalog: Registry) -> None:
+        self.catalog = catalog
+        self._instances: dict[PieceData[Any], Any] = {}
+        self._locks: dict[PieceData[Any], threading.RLock] = {}
+        self._keyed: dict[KeyedPieceData[Any], KeyedInstances] = {}
+        # evictable pieces of the catalog and pieces of the same scope holding their instances in the container
+        self._evictable: dict[PieceData[Any], PieceData[Any]] = {}
+
+    _memory = None  # constructions of containers are not accounted, see `Provider`
+
+    @property
+    def _version(self) -> int:
+        return self.catalog._version
+
+    def _get_piece_data(self, piece_name: str, piece_type: Type[_T]) -> PieceData[_T] | None:
+        return self.catalog._get_piece_data(piece_name, piece_type)
+
+    def get_object(self, piece_name: str | None, piece_type: Type[_T]) -> _T:
+        piece_name = resolve_name(piece_name, piece_type)
+        piece_data = self.catalog._get_piece_data(piece_name, piece_type)
+
+        if piece_data is None:
+            return resolve_provider(self, piece_name, piece_type)
+
+        return self._get(piece_data)
+
+    def _get(self, piece_data: PieceData[_T]) -> _T:
+        if (instance := self._instances.get(piece_data)) is not None:
+            return instance
+        if piece_data.scope is Scope.ORIGINAL:
+            return self._create(piece_data)
+        if isinstance(piece_data, KeyedPieceData):
+            raise PieceIncorrectUseException(f"Piece {piece_data.type} is keyed, it must be requested with a key.")
+        if piece_data.evictable:
+            return self._get_evictable(piece_data)
+
+        # lock of the piece in this container, held instance is created once as in `Registry._get`
+        if (lock := self._locks.get(piece_data)) is None:
+            lock = self._locks.setdefault(piece_data, threading.RLock())
+        with lock:
+            if (instance := self._instances.get(piece_data)) is not None:
+                return instance
+            instance = self._instances[piece_data] = self._create(piece_data)
+            return instance
+
+    def _create(self, piece_data: PieceData[_T]) -> _T:
+        return piece_data.create(resolve_parameters(piece_data.parameters, self.get_object, self.get_collection))
+
+    def _get_evictable(self, piece_data: PieceData[_T]) -> _T:
+        if (holder := self._evictable.get(piece_data)) is None:
+            idle = piece_data.idle if isinstance(piece_data, IdlePieceData) else None
+            holder = piece_data_factory(
+                piece_data.type, piece_data.scope, piece_data._constructor, parameters=piece_data.parameters, idle=idle
+            )
+            holder = self._evictable.setdefault(piece_data, holder)
+
+        if (instance := holder.get_instance()) is not None:
+            return instance
+        with holder.lock:  # type: ignore[union-attr]
+            if (instance := holder.get_instance()) is not None:
+                return instance
+            return holder.initialize(resolve_parameters(piece_data.parameters, self.get_object, self.get_collection))
+
+    def get_keyed(self, piece_name: str | None, piece_type: Type[_T], key: Hashable) -> _T:
+        """Returns instance of keyed piece for `key` held by the container, see `Registry.get_keyed`."""
+        piece_data = self.catalog._keyed(piece_name, piece_type)
+        if (instances := self._keyed.get(piece_data)) is None:
+            instances = self._keyed.setdefault(piece_data, KeyedInstances(piece_data.instances.policy))
+
+        def create() -> _T:
+            params = resolve_parameters(piece_data.parameters, self.get_object, self.get_collection)
+            params[piece_data.key_parameter] = key
+            return piece_data.create(params)
+
+        return instances.get(key, create)
+
+    def get_collection(self, collection_type: Type[Any], item_type: Type[_T]) -> Any:
+        return collect(collection_type, self.catalog._find_all(item_type), self._get)
+
+    def provide(self, piece_type: Type[_T], piece_name: str | None = None, key: Hashable | None = None) -> _T:
+        if key is not None:
+            return self.get_keyed(piece_name, piece_type, key)
+        return self.get_object(piece_name, piece_type)
+
+    def trim(self, now: float, force: bool = False) -> int:
+        """Drops instances of `idle` pieces not accessed for `idle` seconds, see `Registry.trim`."""
+        return sum(
+            holder.trim(now, force) for holder in tuple(self._evictable.values()) if isinstance(holder, IdlePieceData)
+        )
+
+    def discard(self, pieces: Iterable[PieceData[Any]]) -> None:
+        """Drops instances of `pieces`, e.g. of pieces depending on a piece replaced in the registry."""
+        for piece_data in pieces:
+            self._instances.pop(piece_data, None)
+            self._evictable.pop(piece_data, None)
+            if (instances := self._keyed.pop(piece_data, None)) is not None:  # type: ignore[call-overload]
+                instances.evict()
+
+    def clear(self) -> None:
+        """Drops all instances held by the container (instances of keyed pieces are evicted)."""
+        self._instances.clear()
+        self._evictable.clear()
+        for instances in tuple(self._keyed.values()):
+            instances.evict()
@@ -9,3 +9,10 @@ class InitStrategy(Enum):
 class Scope(Enum):
     ORIGINAL = auto()
     UNIVERSAL = auto()
+    WEAK = auto()
+
+
+class FactoryCache(Enum):
+    CALL = auto()
+    PROCESS = auto()
+    RESOLUTION = auto()
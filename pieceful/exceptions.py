@@ -35,3 +35,9 @@ class _NeedCalculation(RuntimeError):
     def __init__(self, piece_name: str, piece_type: Type[Any]) -> None:
         self.piece_name = piece_name
         self.piece_type = piece_type
+
+
+class _NeedCollection(RuntimeError):
+    def __init__(self, collection_type: Type[Any], item_type: Type[Any]) -> None:
+        self.collection_type = collection_type
+        self.item_type = item_type
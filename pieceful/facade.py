@@ -1,11 +1,15 @@
 import re
-from inspect import _empty, signature
-from typing import Any, Callable, Iterator, ParamSpec, Type, TypeVar
+from inspect import _empty
+from typing import Any, Callable, Hashable, Iterable, Iterator, ParamSpec, Type, TypeVar
 
 from .enums import InitStrategy, Scope
 from .exceptions import PieceIncorrectUseException
-from .piece_data import piece_data_factory
-from .registry import registry
+from .injector import inject as _inject
+from .keyed import Keyed
+from .parameter_parser import get_return_type
+from .piece_data import PieceStub, piece_data_factory
+from .registry import PieceDescriptor, registry
+from .storage import PieceKey
 
 _T = TypeVar("_T")
 P = ParamSpec("P")
@@ -19,25 +23,96 @@ def _track_piece(
     constructor: Callable[..., _T],
     creation_type: InitStrategy = LAZY,
     scope: Scope = Scope.UNIVERSAL,
+    profiles: str | Iterable[str] | None = None,
+    condition: Callable[[], bool] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
 ) -> None:
     if (scope, creation_type) == (Scope.ORIGINAL, InitStrategy.EAGER):
         raise PieceIncorrectUseException("ORIGINAL scope with EAGER creation strategy is illegal")
+    if keyed is not None and (scope, creation_type) != (Scope.UNIVERSAL, InitStrategy.LAZY):
+        raise PieceIncorrectUseException("Keyed piece must be of UNIVERSAL scope with LAZY creation strategy")
+    if idle is not None and (scope is not Scope.UNIVERSAL or keyed is not None or idle <= 0):
+        raise PieceIncorrectUseException("Idle time must be positive and only for UNIVERSAL (not keyed) piece")
     if piece_type is Any:
         raise PieceIncorrectUseException("Piece type cannot be Any, please specify concrete type.")
     if not piece_name:
         raise PieceIncorrectUseException("Piece name cannot be empty string.")
 
-    registry.add(piece_name, piece_data_factory(piece_type, scope, constructor))
+    if profiles is not None or condition is not None:
+        if isinstance(profiles, str):
+            profiles = (profiles,)
+        active_in = frozenset(profiles) if profiles is not None else None
+        registry.add_conditional(
+            PieceStub(
+                piece_name, piece_type, constructor, scope, creation_type, active_in, condition, offload, keyed, idle
+            )
+        )
+    else:
+        piece_data = piece_data_factory(piece_type, scope, constructor, creation_type, None, offload, keyed, idle)
+        registry.add(piece_name, piece_data)
+
 
-    if creation_type == InitStrategy.EAGER:
-        registry.get_object(piece_name, piece_type)
+def _factory_type(factory: Callable[..., _T]) -> Type[_T]:
+    piece_type = get_return_type(factory)
+    if piece_type is _empty or piece_type is None:
+        raise PieceIncorrectUseException(
+            f"Function `{factory.__name__}` must have return type specified and cannot be None"
+        )
+    return piece_type
 
 
-def provide(piece_type: Type[_T], piece_name: str | None = None) -> _T:
-    """This function is used to retrieve a piece from registry."""
+def provide(piece_type: Type[_T], piece_name: str | None = None, key: Hashable | None = None) -> _T:
+    """This function is used to retrieve a piece from registry, `key` selects instance of keyed piece."""
+    if key is not None:
+        return registry.get_keyed(piece_name, piece_type, key)
     return registry.get_object(piece_name, piece_type)
 
 
+async def aprovide(piece_type: Type[_T], piece_name: str | None = None) -> _T:
+    """This function is used to retrieve a piece from registry in asyncio code.\\
+    Constructors of pieces registered with `offload=True` run in executor (`Registry.set_executor`),
+    so they do not block the event loop, and concurrent calls wait for one construction of the piece.
+
+    Parameters
+    ----------
+    piece_type : Type[T]
+        type of the piece
+    piece_name : str | None, optional
+        name of the piece, by default name of the type
+
+    Returns
+    -------
+    T
+        desired instance
+    """
+    return await registry.aget_object(piece_name, piece_type)
+
+
+def provide_by_type(piece_type: Type[_T]) -> _T:
+    """This function returns the only registered piece of given type (or its subtype), whatever its name is.
+
+    Parameters
+    ----------
+    piece_type : Type[T]
+        type of the piece, e.g. abstract base class with one registered implementation
+
+    Returns
+    -------
+    T
+        desired instance
+
+    Raises
+    ------
+    PieceNotFound
+        no piece is of the type
+    AmbiguousPieceException
+        more pieces are of the type
+    """
+    return registry.get_by_type(piece_type)
+
+
 def get_piece(piece_name: str, piece_type: Type[_T]) -> _T:
     """This function returns registered piece by name and type.
 
@@ -86,12 +161,49 @@ def get_pieces_by_name(name_pattern: str | re.Pattern[str]) -> Iterator[Any]:
     return registry.get_all_objects_by_name_matching(re.compile(name_pattern))
 
 
+def describe_pieces_by_supertype(super_type: Type[Any]) -> list[PieceDescriptor]:
+    """This function describes registered pieces that are subtypes of given type without creating them.
+
+    Parameters
+    ----------
+    super_type : Type[Any]
+
+    Returns
+    -------
+    list[PieceDescriptor]
+        name, type, scope, init strategy, dependency names and whether the instance exists for each piece,
+        `descriptor.provider()` creates (or returns) the instance
+    """
+    return registry.describe_by_supertype(super_type)
+
+
+def describe_pieces_by_name(name_pattern: str | re.Pattern[str]) -> list[PieceDescriptor]:
+    """This function describes registered pieces that match given name pattern without creating them.
+
+    Parameters
+    ----------
+    name_pattern : str | re.Pattern[str]
+        regular expression pattern to match name
+
+    Returns
+    -------
+    list[PieceDescriptor]
+        descriptors of matching pieces, see `describe_pieces_by_supertype`
+    """
+    return registry.describe_by_name_matching(re.compile(name_pattern))
+
+
 def register_piece(
     cls: Type[_T],
     piece_name: str | None = None,
     creation_type: InitStrategy = InitStrategy.LAZY,
     scope: Scope = Scope.UNIVERSAL,
-) -> None:
+    profiles: str | Iterable[str] | None = None,
+    condition: Callable[[], bool] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
+) -> PieceKey[_T]:
     """This function registers class as a dependency.
     __init__ method's parameters must be annotated references to registered pieces.
 
@@ -106,15 +218,30 @@ def register_piece(
     scope : Scope, optional
         scope of the piece, by default Scope.UNIVERSAL\\
         `ORIGINAL` - piece is created only once and is shared among all usages\\
-        `UNIVERSAL` - piece is created for each usage separately
+        `UNIVERSAL` - piece is created for each usage separately\\
+        `WEAK` - instance is held weakly and created again after it was garbage collected
+    profiles : str | Iterable[str] | None, optional
+        profiles in which the piece is registered, `"!name"` matches when profile `name` is not active,
+        by default None (registered regardless of profiles), see `Registry.activate`
+    condition : Callable[[], bool] | None, optional
+        predicate evaluated once on activation, the piece is registered only when it holds, by default None
+    offload : bool, optional
+        constructor is blocking (I/O), `aprovide` runs it in executor instead of event loop, by default False
+    keyed : Keyed | None, optional
+        caching policy of piece created per key (`provide(T, name, key=...)`), the key is passed to parameter
+        annotated with `Key`, by default None
+    idle : float | None, optional
+        seconds without access after which `Registry.trim` drops the instance of `UNIVERSAL` piece
+        (created again when requested), by default None (held until the registry is cleared)
+
+    Returns
+    -------
+    PieceKey[T]
+        handle of the piece for `Registry.get`
     """
-    _track_piece(
-        cls,
-        piece_name if piece_name is not None else cls.__name__,
-        cls,
-        creation_type,
-        scope,
-    )
+    piece_name = piece_name if piece_name is not None else cls.__name__
+    _track_piece(cls, piece_name, cls, creation_type, scope, profiles, condition, offload, keyed, idle)
+    return registry._key(piece_name, cls)
 
 
 def register_piece_factory(
@@ -122,7 +249,12 @@ def register_piece_factory(
     name: str | None = None,
     creation_type: InitStrategy = LAZY,
     scope: Scope = Scope.UNIVERSAL,
-) -> None:
+    profiles: str | Iterable[str] | None = None,
+    condition: Callable[[], bool] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
+) -> PieceKey[_T]:
     """This function registers a factory function to create dependency.\\
     Factory function's parameters must be annotated references to registered pieces.\\
     Factory function must declare return type.\\
@@ -141,28 +273,63 @@ def register_piece_factory(
     scope : Scope, optional
         scope of the piece, by default Scope.UNIVERSAL\\
         `ORIGINAL` - piece is created only once and is shared among all usages\\
-        `UNIVERSAL` - piece is created for each usage separately
+        `UNIVERSAL` - piece is created for each usage separately\\
+        `WEAK` - instance is held weakly and created again after it was garbage collected
+    profiles : str | Iterable[str] | None, optional
+        profiles in which the piece is registered, `"!name"` matches when profile `name` is not active,
+        by default None (registered regardless of profiles), see `Registry.activate`
+    condition : Callable[[], bool] | None, optional
+        predicate evaluated once on activation, the piece is registered only when it holds, by default None
+    offload : bool, optional
+        constructor is blocking (I/O), `aprovide` runs it in executor instead of event loop, by default False
+    keyed : Keyed | None, optional
+        caching policy of piece created per key (`provide(T, name, key=...)`), the key is passed to parameter
+        annotated with `Key`, by default None
+    idle : float | None, optional
+        seconds without access after which `Registry.trim` drops the instance of `UNIVERSAL` piece
+        (created again when requested), by default None (held until the registry is cleared)
+
+    Returns
+    -------
+    PieceKey[T]
+        handle of the piece for `Registry.get`
     """
-    piece_type = signature(factory).return_annotation
+    piece_type = _factory_type(factory)
+    name = name if name is not None else factory.__name__
+    _track_piece(piece_type, name, factory, creation_type, scope, profiles, condition, offload, keyed, idle)
+    return registry._key(name, piece_type)
 
-    if piece_type is _empty or piece_type is None:
-        raise PieceIncorrectUseException(
-            f"Function `{factory.__name__}` must have return type specified and cannot be None"
-        )
 
-    _track_piece(
-        piece_type,
-        name if name is not None else factory.__name__,
-        factory,
-        creation_type,
-        scope,
-    )
+def register_many(definitions: Iterable[Callable[..., Any] | tuple[Any, ...]]) -> None:
+    """This function registers many classes and factory functions at once.\\
+    Each definition is a class or factory function, or a tuple of\\
+    `(class_or_factory, name, creation_type, scope, profiles, condition, offload, keyed, idle)`\\
+    where trailing items may be omitted.\\
+    Pieces are validated and published together - if any piece is ambiguous, none is registered.\\
+    `EAGER` pieces are created after all pieces are registered, so they can depend on each other in any order.
+
+    Parameters
+    ----------
+    definitions : Iterable[Callable[..., Any] | tuple[Any, ...]]
+        classes and factory functions to be registered
+    """
+    with registry.batch():
+        for definition in definitions:
+            constructor, *options = definition if isinstance(definition, tuple) else (definition,)
+            name = options.pop(0) if options else None
+            piece_type = constructor if isinstance(constructor, type) else _factory_type(constructor)
+            _track_piece(piece_type, name if name is not None else constructor.__name__, constructor, *options)
 
 
 def Piece(
     name: str | None = None,
     init_strategy: InitStrategy = LAZY,
     scope: Scope = Scope.UNIVERSAL,
+    profiles: str | Iterable[str] | None = None,
+    condition: Callable[[], bool] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
 ):
     """This decorator registers class as a dependency.
     __init__ method's parameters must be annotated references to registered pieces.
@@ -178,11 +345,26 @@ def Piece(
     scope : Scope, optional
         scope of the piece, by default Scope.UNIVERSAL\\
         `ORIGINAL` - piece is created only once and is shared among all usages\\
-        `UNIVERSAL` - piece is created for each usage separately
+        `UNIVERSAL` - piece is created for each usage separately\\
+        `WEAK` - instance is held weakly and created again after it was garbage collected
+    profiles : str | Iterable[str] | None, optional
+        profiles in which the piece is registered, `"!name"` matches when profile `name` is not active,
+        by default None (registered regardless of profiles), see `Registry.activate`
+    condition : Callable[[], bool] | None, optional
+        predicate evaluated once on activation, the piece is registered only when it holds, by default None
+    offload : bool, optional
+        constructor is blocking (I/O), `aprovide` runs it in executor instead of event loop, by default False
+    keyed : Keyed | None, optional
+        caching policy of piece created per key (`provide(T, name, key=...)`), the key is passed to parameter
+        annotated with `Key`, by default None
+    idle : float | None, optional
+        seconds without access after which `Registry.trim` drops the instance of `UNIVERSAL` piece
+        (created again when requested), by default None (held until the registry is cleared)
     """
 
     def inner(cls: Type[_T]) -> Type[_T]:
-        register_piece(cls, name, init_strategy, scope)
+        piece_name = name if name is not None else cls.__name__
+        _track_piece(cls, piece_name, cls, init_strategy, scope, profiles, condition, offload, keyed, idle)
         return cls
 
     return inner
@@ -192,6 +374,11 @@ def PieceFactory(
     name: str | None = None,
     init_strategy: InitStrategy = InitStrategy.LAZY,
     scope: Scope = Scope.UNIVERSAL,
+    profiles: str | Iterable[str] | None = None,
+    condition: Callable[[], bool] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
 ):
     """This decorator registers a factory function to create dependency.\\
     Factory function's parameters must be annotated references to registered pieces.\\
@@ -208,11 +395,44 @@ def PieceFactory(
     scope : Scope, optional
         scope of the piece, by default Scope.UNIVERSAL\\
         `ORIGINAL` - piece is created only once and is shared among all usages\\
-        `UNIVERSAL` - piece is created for each usage separately
+        `UNIVERSAL` - piece is created for each usage separately\\
+        `WEAK` - instance is held weakly and created again after it was garbage collected
+    profiles : str | Iterable[str] | None, optional
+        profiles in which the piece is registered, `"!name"` matches when profile `name` is not active,
+        by default None (registered regardless of profiles), see `Registry.activate`
+    condition : Callable[[], bool] | None, optional
+        predicate evaluated once on activation, the piece is registered only when it holds, by default None
+    offload : bool, optional
+        constructor is blocking (I/O), `aprovide` runs it in executor instead of event loop, by default False
+    keyed : Keyed | None, optional
+        caching policy of piece created per key (`provide(T, name, key=...)`), the key is passed to parameter
+        annotated with `Key`, by default None
+    idle : float | None, optional
+        seconds without access after which `Registry.trim` drops the instance of `UNIVERSAL` piece
+        (created again when requested), by default None (held until the registry is cleared)
     """
 
     def inner(factory: Callable[P, _T]) -> Callable[P, _T]:
-        register_piece_factory(factory, name, init_strategy, scope)
+        piece_type, piece_name = _factory_type(factory), name if name is not None else factory.__name__
+        _track_piece(piece_type, piece_name, factory, init_strategy, scope, profiles, condition, offload, keyed, idle)
         return factory
 
     return inner
+
+
+def inject(fn: Callable[P, _T]) -> Callable[P, _T]:
+    """This decorator injects registered pieces into function parameters that caller did not supply.\\
+    Parameters are parsed once (same rules as piece constructor parameters),\\
+    pieces of `UNIVERSAL` scope are cached until registry changes. Works with sync and async functions.
+
+    Parameters
+    ----------
+    fn : Callable[P, T]
+        function to be decorated
+
+    Returns
+    -------
+    Callable[P, T]
+        wrapped function
+    """
+    return _inject(fn, registry)
@@ -0,0 +1,127 @@
+import inspect
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+from .enums import Scope
+from .exceptions import UnresolvableParameter
+from .parameter_parser import parse_parameter
+from .parameters import CollectionParameter, Parameter, PieceParameter
+from .piece_data import PieceData
+from .registry import Registry, resolve_provider
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_INJECTABLE_KINDS = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+_NO_POSITION = 1 << 62
+
+
+class _Binding:
+    """Precompiled resolution of one function parameter."""
+
+    __slots__ = ("name", "position", "parameter", "_cache")
+
+    def __init__(self, name: str, position: int, parameter: Parameter) -> None:
+        self.name = name
+        self.position = position
+        self.parameter = parameter
+        self._cache: tuple[int, PieceData[Any] | None, Any] | None = None
+
+    def resolve(self, registry: Registry) -> Any:
+        if (cache := self._cache) is not None and cache[0] == registry._version:
+            return cache[2] if cache[2] is not None else registry._get(cache[1])
+
+        parameter = self.parameter
+        if isinstance(parameter, CollectionParameter):
+            return registry.get_collection(parameter.collection_type, parameter.item_type)
+        if not isinstance(parameter, PieceParameter):
+            return parameter.get()
+
+        version = registry._version
+        piece_data = registry._get_piece_data(parameter.piece_name, parameter.type)
+        if piece_data is None:
+            provider = resolve_provider(registry, parameter.piece_name, parameter.type)
+            self._cache = (version, None, provider)
+            return provider
+
+        instance = registry._get(piece_data)
+        held = piece_data.scope is Scope.UNIVERSAL and not piece_data.evictable
+        self._cache = (version, piece_data, instance if held else None)
+        return instance
+
+    def held(self, version: int) -> bool:
+        """Whether the parameter resolved (in `version` of registry) to held instance or provider."""
+        return (cache := self._cache) is not None and cache[0] == version and cache[2] is not None
+
+
+class _Injection:
+    """Bindings of an injected function.
+
+    Once the parameters not supplied by a call resolve to held instances (`UNIVERSAL` pieces or providers),
+    they are passed without any resolution to calls with the same number of positional arguments
+    (and no keyword ones), until registry drops them on its next change.
+    """
+
+    __slots__ = ("registry", "bindings", "resolved", "unheld")
+
+    def __init__(self, registry: Registry, bindings: tuple[_Binding, ...]) -> None:
+        self.registry = registry
+        self.bindings = bindings
+        self.resolved: tuple[int, dict[str, Any]] | None = None  # number of positional arguments, resolved ones
+        self.unheld = -1  # version of registry in which some parameter did not resolve to held instance
+
+    def resolve(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        registry, positional = self.registry, len(args)
+        version, complete = registry._version, not kwargs
+        for binding in self.bindings:
+            if binding.position >= positional and binding.name not in kwargs:
+                kwargs[binding.name] = binding.resolve(registry)
+        if complete and self.unheld != version:
+            self._hold(positional, kwargs, version)
+        return kwargs
+
+    def _hold(self, positional: int, resolved: dict[str, Any], version: int) -> None:
+        if not all(binding.held(version) for binding in self.bindings if binding.position >= positional):
+            self.unheld = version
+            return
+        self.resolved = (positional, dict(resolved))
+        self.registry._injected.append(self)
+        if self.registry._version != version:  # changed meanwhile, possibly before `_injected` was reset
+            self.resolved = None
+
+
+def _compile(fn: Callable[..., Any]) -> tuple[_Binding, ...]:
+    bindings: list[_Binding] = []
+    namespace = getattr(inspect.unwrap(fn), "__globals__", {})
+    for position, parameter in enumerate(inspect.signature(fn).parameters.values()):
+        if parameter.kind not in _INJECTABLE_KINDS or parameter.default is not inspect.Parameter.empty:
+            continue
+        try:
+            parsed = parse_parameter(parameter, namespace)
+        except UnresolvableParameter:
+            continue  # not a piece reference, must be supplied by caller
+        if parameter.kind is inspect.Parameter.KEYWORD_ONLY:
+            position = _NO_POSITION
+        bindings.append(_Binding(parameter.name, position, parsed))
+    return tuple(bindings)
+
+
+def inject(fn: _F, registry: Registry) -> _F:
+    injection = _Injection(registry, _compile(fn))
+
+    if inspect.iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if (resolved := injection.resolved) is not None and resolved[0] == len(args) and not kwargs:
+                return await fn(*args, **resolved[1])
+            return await fn(*args, **injection.resolve(args, kwargs))
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if (resolved := injection.resolved) is not None and resolved[0] == len(args) and not kwargs:
+            return fn(*args, **resolved[1])
+        return fn(*args, **injection.resolve(args, kwargs))
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,249 @@
+"""Registry inspection behind `python -m pieceful`: registered pieces, dependency graph and startup timings."""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator, Sequence, get_args, get_origin
+
+from . import facade
+from .analyzer import analyze
+from .exceptions import PieceException
+from .parameters import CollectionParameter, ForwardPieceParameter, PieceParameter
+from .piece_data import PieceData
+from .provider import Provider
+from .registry import Registry, registry
+from .tracing import BEGIN, END, Tracer
+
+
+@dataclass(slots=True)
+class Edge:
+    parameter: str
+    piece_name: str | None
+    type: str
+    resolved: bool
+
+
+@dataclass(slots=True)
+class PieceInfo:
+    name: str
+    type: str
+    scope: str
+    init_strategy: str
+    dependencies: list[Edge] = field(default_factory=list)
+    warmup_ms: float | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class Report:
+    pieces: list[PieceInfo]
+    import_ms: float = 0.0
+    registration_ms: float = 0.0
+    eager_ms: float = 0.0
+    warmup_ms: float | None = None
+
+    @property
+    def unresolved(self) -> list[tuple[str, Edge]]:
+        return [(piece.name, edge) for piece in self.pieces for edge in piece.dependencies if not edge.resolved]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timings_ms": {
+                "import": self.import_ms,
+                "registration": self.registration_ms,
+                "eager": self.eager_ms,
+                "warmup": self.warmup_ms,
+            },
+            "pieces": [asdict(piece) for piece in self.pieces],
+            "unresolved": [{"piece": name, **asdict(edge)} for name, edge in self.unresolved],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_table(self) -> str:
+        rows = [("NAME", "TYPE", "SCOPE", "INIT", "DEPENDENCIES", "WARMUP ms")]
+        for piece in self.pieces:
+            dependencies = ", ".join(
+                f"{edge.parameter}->{edge.piece_name or edge.type}{'' if edge.resolved else ' (!)'}"
+                for edge in piece.dependencies
+            )
+            warmup = piece.error or ("" if piece.warmup_ms is None else f"{piece.warmup_ms:.3f}")
+            rows.append((piece.name, piece.type, piece.scope, piece.init_strategy, dependencies or "-", warmup))
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+        lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1] for row in rows]
+        lines.append("")
+        lines.append(f"pieces: {len(self.pieces)}, unresolved dependencies: {len(self.unresolved)}")
+        lines.append(
+            f"import: {self.import_ms:.3f} ms, registration: {self.registration_ms:.3f} ms, "
+            f"eager construction: {self.eager_ms:.3f} ms"
+            + ("" if self.warmup_ms is None else f", warm-up: {self.warmup_ms:.3f} ms")
+        )
+        return "\n".join(lines).rstrip() + "\n"
+
+
+def _type_name(type_: Any) -> str:
+    if isinstance(type_, type):
+        return f"{type_.__module__}.{type_.__qualname__}"
+    return repr(type_)
+
+
+def _dependencies(registry: Registry, piece_data: PieceData[Any]) -> list[Edge]:
+    edges: list[Edge] = []
+    for param in piece_data.parameters:
+        if isinstance(param, ForwardPieceParameter) and not param.evaluated:
+            try:
+                param.type
+            except PieceException:  # string annotation not resolvable in module of the constructor
+                edges.append(Edge(param.name, param.piece_name, param.expression, False))
+                continue
+        if isinstance(param, PieceParameter):
+            piece_type = param.type
+            if get_origin(piece_type) is Provider:
+                piece_type = get_args(piece_type)[0]
+            resolved = registry._get_piece_data(param.piece_name, piece_type) is not None
+            edges.append(Edge(param.name, param.piece_name, _type_name(param.type), resolved))
+        elif isinstance(param, CollectionParameter):
+            edges.extend(
+                Edge(param.name, name, _type_name(param.item_type), True)
+                for name, _ in registry._find_all(param.item_type)
+            )
+    return edges
+
+
+def inspect_registry(registry: Registry = registry) -> Report:
+    """Describes pieces registered in `registry` and their dependencies."""
+    pieces = [
+        PieceInfo(name, _type_name(pd.type), pd.scope.name, pd.init_strategy.name, _dependencies(registry, pd))
+        for name, table in tuple(registry.registry.items())
+        for pd in table.entries
+    ]
+    return Report(pieces)
+
+
+@contextmanager
+def _registration_timer(registry: Registry, intervals: list[tuple[int, int]]) -> Iterator[None]:
+    """Records intervals spent registering pieces (parsing, validation, publishing and EAGER construction),
+    also at the end of `Registry.batch`.
+    """
+    track_piece, add_all = facade._track_piece, registry._add_all
+    depth = 0
+
+    def timed(register: Callable[..., Any]) -> Callable[..., Any]:
+        def timed_register(*args, **kwargs):
+            nonlocal depth
+            depth += 1
+            start = time.perf_counter_ns()
+            try:
+                return register(*args, **kwargs)
+            finally:
+                depth -= 1
+                if depth == 0:
+                    intervals.append((start, time.perf_counter_ns()))
+
+        return timed_register
+
+    facade._track_piece = timed(track_piece)
+    registry._add_all = timed(add_all)  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        facade._track_piece = track_piece
+        del registry._add_all
+
+
+def _construction_ns(tracer: Tracer, intervals: list[tuple[int, int]]) -> int:
+    """Time spent in outermost piece constructions recorded by `tracer` that started within `intervals`."""
+    starts = [start for start, _ in intervals]
+    total, depth, start = 0, 0, 0
+    for event in tracer.events():
+        if event.phase == BEGIN:
+            if depth == 0:
+                start = event.timestamp_ns
+            depth += 1
+        elif event.phase == END:
+            depth -= 1
+            if depth == 0 and (i := bisect_right(starts, start) - 1) >= 0 and start < intervals[i][1]:
+                total += event.timestamp_ns - start
+    return total
+
+
+def load(modules: Sequence[str], registry: Registry = registry) -> Report:
+    """Imports `modules` and describes the registry with import, registration and EAGER construction times.
+
+    Registration time excludes EAGER construction, import time excludes both. Pieces created by module code
+    (e.g. `provide` at module level) count to import time.
+    """
+    intervals: list[tuple[int, int]] = []
+    previous_tracer = registry.tracer
+    tracer = registry.enable_tracing()
+    start = time.perf_counter_ns()
+    try:
+        with _registration_timer(registry, intervals):
+            for module in modules:
+                importlib.import_module(module)
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        registry._tracer = previous_tracer
+
+    registration = sum(end - begin for begin, end in intervals)
+    eager = _construction_ns(tracer, intervals)
+    report = inspect_registry(registry)
+    report.import_ms = (elapsed - registration) / 1e6
+    report.registration_ms = (registration - eager) / 1e6
+    report.eager_ms = eager / 1e6
+    return report
+
+
+def warm_up(report: Report, registry: Registry = registry) -> Report:
+    """Creates every piece of the report (in registration order) and records time spent on each one.
+
+    Time of a piece includes creation of its dependencies that were not created before.
+    """
+    entries = [(name, pd) for name, table in tuple(registry.registry.items()) for pd in table.entries]
+    start = time.perf_counter_ns()
+    for piece, (name, piece_data) in zip(report.pieces, entries):
+        piece_start = time.perf_counter_ns()
+        try:
+            registry.get_object(name, piece_data.type)
+        except Exception as e:
+            piece.error = f"{type(e).__name__}: {e}"
+        else:
+            piece.warmup_ms = (time.perf_counter_ns() - piece_start) / 1e6
+    report.warmup_ms = (time.perf_counter_ns() - start) / 1e6
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pieceful",
+        description="Imports modules registering pieces and reports the registry and startup timings.",
+    )
+    parser.add_argument("modules", nargs="+", help="modules to import, e.g. `app.pieces` (paths with --static)")
+    parser.add_argument(
+        "--static", action="store_true", help="parse python files and directories with `ast` instead of importing"
+    )
+    parser.add_argument("--processes", type=int, default=None, help="worker processes of --static analysis")
+    parser.add_argument("--format", choices=("table", "json"), default="table", help="output format")
+    parser.add_argument("--warmup", action="store_true", help="create every piece and report time of each one")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 when a dependency is unresolved")
+    args = parser.parse_args(argv)
+
+    if args.static:
+        graph = analyze(args.modules, args.processes)
+        sys.stdout.write(graph.to_json() + "\n" if args.format == "json" else graph.to_table())
+        return 1 if args.strict and not graph.ok else 0
+
+    sys.path.insert(0, "")
+    report = load(args.modules)
+    if args.warmup:
+        warm_up(report)
+
+    sys.stdout.write(report.to_json() + "\n" if args.format == "json" else report.to_table())
+    return 1 if args.strict and report.unresolved else 0
@@ -0,0 +1,133 @@
+"""Instances of keyed pieces (e.g. connection per shard or tenant) cached per key with LRU and TTL eviction."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+
+@dataclass(frozen=True, slots=True)
+class Keyed:
+    """Caching policy of keyed piece: `@PieceFactory("db", keyed=Keyed(max_size=16, ttl=300, on_evict=close))`.
+
+    At most `max_size` instances are held (least recently used is evicted first), instances older than `ttl`
+    seconds are created again. `on_evict(key, instance)` is called for every evicted instance.
+    """
+
+    max_size: int | None = None
+    ttl: float | None = None
+    on_evict: Callable[[Any, Any], None] | None = None
+
+    def __post_init__(self):
+        if self.max_size is not None and self.max_size < 1:
+            raise ValueError("max_size must be positive")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+
+@dataclass(frozen=True, slots=True)
+class KeyedStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class KeyedInstances:
+    """Instances of one keyed piece, concurrent requests of the same missing key wait for one construction."""
+
+    __slots__ = ("policy", "_entries", "_inflight", "_lock", "hits", "misses", "evictions")
+
+    def __init__(self, policy: Keyed) -> None:
+        self.policy = policy
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._inflight: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expires(self) -> float:
+        return time.monotonic() + self.policy.ttl if self.policy.ttl is not None else 0.0
+
+    def _expired(self, entry: tuple[Any, float]) -> bool:
+        return self.policy.ttl is not None and time.monotonic() >= entry[1]
+
+    def get(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                if self.policy.ttl is None or time.monotonic() < entry[1]:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+                self.evictions += 1
+                evicted = [(key, entry[0])]
+            else:
+                evicted = []
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            self._notify(evicted)
+            return future.result()
+
+        try:
+            instance = create()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            self._notify(evicted)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._entries[key] = (instance, self._expires())
+            evicted.extend(self._shrink())
+        future.set_result(instance)
+        self._notify(evicted)
+        return instance
+
+    def _shrink(self) -> list[tuple[Hashable, Any]]:
+        # caller holds self._lock, drops expired instances from the least recently used end and exceeding ones
+        evicted: list[tuple[Hashable, Any]] = []
+        entries, max_size = self._entries, self.policy.max_size
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if not self._expired(entry) and (max_size is None or len(entries) <= max_size):
+                break
+            del entries[key]
+            evicted.append((key, entry[0]))
+        self.evictions += len(evicted)
+        return evicted
+
+    def _notify(self, evicted: list[tuple[Hashable, Any]]) -> None:
+        if (on_evict := self.policy.on_evict) is not None:
+            for key, instance in evicted:
+                on_evict(key, instance)
+
+    def evict(self, key: Hashable | None = None) -> None:
+        """Evicts instance of `key`, or all instances when `key` is None."""
+        with self._lock:
+            if key is None:
+                evicted = [(cached, entry[0]) for cached, entry in self._entries.items()]
+                self._entries.clear()
+            elif (entry := self._entries.pop(key, None)) is not None:
+                evicted = [(key, entry[0])]
+            else:
+                evicted = []
+            self.evictions += len(evicted)
+        self._notify(evicted)
+
+    def stats(self) -> KeyedStats:
+        with self._lock:
+            return KeyedStats(len(self._entries), self.hits, self.misses, self.evictions)
@@ -0,0 +1,150 @@
+import gc
+import json
+import sys
+import threading
+import tracemalloc
+import weakref
+from dataclasses import asdict, dataclass
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Iterable, Mapping, TypeVar
+
+from .enums import Scope
+from .piece_data import PieceData
+
+_T = TypeVar("_T")
+
+_SHARED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def deep_sizeof(obj: Any, exclude: Iterable[int] = ()) -> int:
+    """Estimates size of object together with all objects reachable from it.
+
+    Classes, modules and functions are not counted, objects whose id is in `exclude` are not counted
+    nor traversed.
+    """
+    seen = set(exclude)
+    seen.discard(id(obj))
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        stack.extend(gc.get_referents(current))
+    return size
+
+
+@dataclass(frozen=True, slots=True)
+class PieceMemory:
+    name: str
+    type: str
+    scope: str
+    constructions: int
+    allocated_bytes: int
+    retained_bytes: int
+    live_instances: int
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryReport:
+    pieces: tuple[PieceMemory, ...]
+    allocated_bytes: int
+    retained_bytes: int
+    live_instances: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class _PieceStats:
+    __slots__ = ("constructions", "allocated_bytes", "instances")
+
+    def __init__(self) -> None:
+        self.constructions = 0
+        self.allocated_bytes = 0
+        self.instances: weakref.WeakSet[Any] = weakref.WeakSet()
+
+    def copy(self) -> "_PieceStats":
+        stats = _PieceStats()
+        stats.constructions = self.constructions
+        stats.allocated_bytes = self.allocated_bytes
+        stats.instances = weakref.WeakSet(self.instances)
+        return stats
+
+
+class MemoryAccounting:
+    """Attributes memory allocated by constructors (traced by `tracemalloc`) to pieces.
+
+    Allocations of other threads running at the same time are attributed as well, numbers are estimates.
+    Counters are updated under a lock, `snapshot` reads them consistently while pieces are being created.
+    """
+
+    def __init__(self) -> None:
+        self._stop_tracing = not tracemalloc.is_tracing()
+        if self._stop_tracing:
+            tracemalloc.start()
+        self._lock = threading.Lock()
+        self.stats: dict[PieceData[Any], _PieceStats] = {}
+
+    def initialize(self, piece_data: PieceData[_T], parameters: dict[str, Any]) -> _T:
+        before = tracemalloc.get_traced_memory()[0]
+        instance = piece_data.initialize(parameters)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+
+        with self._lock:
+            if (stats := self.stats.get(piece_data)) is None:
+                stats = self.stats[piece_data] = _PieceStats()
+            stats.constructions += 1
+            stats.allocated_bytes += allocated
+            if piece_data.scope is Scope.ORIGINAL:
+                try:
+                    stats.instances.add(instance)
+                except TypeError:
+                    pass  # instance does not support weak references
+        return instance
+
+    def snapshot(self) -> dict[PieceData[Any], _PieceStats]:
+        """Copy of current stats."""
+        with self._lock:
+            return {piece_data: stats.copy() for piece_data, stats in self.stats.items()}
+
+    def stop(self) -> None:
+        if self._stop_tracing:
+            tracemalloc.stop()
+
+
+def _live_instances(piece_data: PieceData[Any], stats: _PieceStats | None) -> list[Any]:
+    if piece_data.scope is Scope.ORIGINAL:
+        return list(stats.instances) if stats is not None else []
+    return [] if (instance := piece_data.peek_instance()) is None else [instance]
+
+
+def memory_report(
+    pieces: Iterable[tuple[str, PieceData[Any]]], stats: Mapping[PieceData[Any], _PieceStats]
+) -> MemoryReport:
+    live = [(name, pd, stats.get(pd), _live_instances(pd, stats.get(pd))) for name, pd in pieces]
+    piece_instances = {id(instance) for *_, instances in live for instance in instances}
+
+    entries = tuple(
+        PieceMemory(
+            name=name,
+            type=getattr(pd.type, "__qualname__", repr(pd.type)),
+            scope=pd.scope.name,
+            constructions=piece_stats.constructions if piece_stats else 0,
+            allocated_bytes=piece_stats.allocated_bytes if piece_stats else 0,
+            retained_bytes=sum(deep_sizeof(instance, piece_instances) for instance in instances),
+            live_instances=len(instances),
+        )
+        for name, pd, piece_stats, instances in live
+    )
+    return MemoryReport(
+        pieces=entries,
+        allocated_bytes=sum(e.allocated_bytes for e in entries),
+        retained_bytes=sum(e.retained_bytes for e in entries),
+        live_instances=sum(e.live_instances for e in entries),
+    )
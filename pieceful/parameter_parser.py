@@ -1,17 +1,31 @@
+import ast
 import inspect
-from typing import Annotated, Any, Callable, ForwardRef, Iterable
+import sys
+from functools import lru_cache
+from typing import Annotated, Any, Callable, ForwardRef, get_args, get_origin
 
+from .enums import FactoryCache
 from .exceptions import (
     PieceException,
     PieceIncorrectUseException,
     UnresolvableParameter,
 )
 from .parameters import (
+    AllOf,
+    CollectionParameter,
     DefaultFactoryParameter,
     DefaultParameter,
+    ForwardPieceParameter,
+    Key,
+    KeyParameter,
     Parameter,
     PieceParameter,
+    ResolutionFactoryParameter,
+    SharedFactoryParameter,
+    TTL,
 )
+from .provider import Provider, default_piece_name
+from .typing_utils import evaluate_annotation
 
 ANNOTATION_TYPE = type(Annotated[str, "example"])
 
@@ -22,12 +36,102 @@ def _create_piece_parameter(name: str, piece_type: Any, piece_name: str) -> Piec
     return PieceParameter(name, piece_name, piece_type)
 
 
-def _create_default_factory_parameter(name: str, factory: Callable[[], Any]):
-    return DefaultFactoryParameter(name, factory)
+def _create_default_factory_parameter(
+    name: str, factory: Callable[[], Any], cache: FactoryCache | TTL = FactoryCache.CALL
+) -> DefaultFactoryParameter:
+    if isinstance(cache, TTL):
+        return SharedFactoryParameter(name, factory, cache.seconds)
+    if cache is FactoryCache.CALL:
+        return DefaultFactoryParameter(name, factory)
+    if cache is FactoryCache.PROCESS:
+        return SharedFactoryParameter(name, factory)
+    if cache is FactoryCache.RESOLUTION:
+        return ResolutionFactoryParameter(name, factory)
+
+    raise PieceIncorrectUseException(f"Factory caching policy must be `FactoryCache` or `TTL`, got {cache!r}")
+
+
+def _create_collection_parameter(name: str, collection: Any) -> CollectionParameter:
+    collection_type, args = get_origin(collection), get_args(collection)
+
+    if collection_type is list and len(args) == 1:
+        return CollectionParameter(name, list, args[0])
+    if collection_type is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return CollectionParameter(name, tuple, args[0])
+    if collection_type is dict and len(args) == 2 and args[0] is str:
+        return CollectionParameter(name, dict, args[1])
+
+    raise PieceIncorrectUseException(
+        f"AllOf requires `list[T]`, `tuple[T, ...]` or `dict[str, T]` annotation, got {collection}"
+    )
+
+
+def _evaluate(expression: str, namespace: dict[str, Any], target: str) -> Any:
+    try:
+        return evaluate_annotation(expression, namespace)
+    except Exception as e:
+        raise UnresolvableParameter(f"Cannot evaluate annotation `{expression}` of {target}: {e!r}") from e
 
 
 def _evaluate_forward_ref(fr: ForwardRef, globals_dict: dict[str, Any]) -> Any:
-    raise PieceException("ForwardRef is not supported")
+    return _evaluate(fr.__forward_arg__, globals_dict, "ForwardRef")
+
+
+def _annotation_name(node: ast.AST) -> str | None:
+    """Default piece name of not evaluated annotation, same as `default_piece_name` of evaluated one."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):
+        if _annotation_name(node.value) == "Provider":
+            return _annotation_name(node.slice)
+        return _annotation_name(node.value)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _forward_reference(expression: str) -> tuple[str, str] | None:
+    """Piece name and type expression of string annotation referencing a piece, None for other annotations."""
+    try:
+        node = ast.parse(expression, mode="eval").body
+    except SyntaxError as e:
+        raise PieceIncorrectUseException(f"Invalid annotation `{expression}`") from e
+
+    if isinstance(node, ast.Subscript) and _annotation_name(node.value) == "Annotated":
+        elements = node.slice.elts if isinstance(node.slice, ast.Tuple) else ()
+        if len(elements) > 1 and isinstance(elements[1], ast.Constant) and isinstance(elements[1].value, str):
+            return elements[1].value, ast.unparse(elements[0])
+    elif (piece_name := _annotation_name(node)) is not None:
+        return piece_name, expression
+    return None
+
+
+def _parse_string_annotation(param_name: str, expression: str, namespace: dict[str, Any]) -> Parameter:
+    """Piece references are parsed without evaluation (type is evaluated on first resolution),
+    other annotations (default factories, `AllOf`) are evaluated immediately.
+    """
+    if (reference := _forward_reference(expression)) is not None:
+        return _create_forward_piece_parameter(param_name, *reference, namespace)
+    return _parse_annotation(param_name, _evaluate(expression, namespace, f"parameter `{param_name}`"))
+
+
+def _create_forward_piece_parameter(
+    name: str, piece_name: str, expression: str, namespace: dict[str, Any]
+) -> ForwardPieceParameter:
+    if not piece_name.strip():
+        raise PieceException("piece_name must not be blank")
+    return ForwardPieceParameter(name, piece_name, expression, namespace)
+
+
+def _namespace(fn: Callable[..., Any]) -> dict[str, Any]:
+    """Globals of module where annotations of `fn` (`__init__` of class) were written."""
+    target = inspect.unwrap(fn.__init__ if isinstance(fn, type) else fn)
+    namespace = getattr(target, "__globals__", None)
+    if namespace is None:
+        module = sys.modules.get(getattr(fn, "__module__", None) or "")
+        namespace = vars(module) if module is not None else {}
+    return namespace
 
 
 def _count_non_default_parameters(fn) -> int:
@@ -43,37 +147,55 @@ def _count_non_default_parameters(fn) -> int:
     return sum(1 for _ in filtered)
 
 
-def _parse_annotated_parameter(param_name: str, annotation) -> Parameter:
+def _parse_annotated_parameter(param_name: str, annotation, namespace: dict[str, Any] | None = None) -> Parameter:
     metadata = annotation.__metadata__
     if len(metadata) < 1:
         raise PieceIncorrectUseException("piece metadata not specified in Annotated[]")
 
     piece_type = annotation.__origin__
 
+    name_or_factory = metadata[0]
     if isinstance(piece_type, ForwardRef):
-        try:
-            gd = metadata[1]
-            assert isinstance(gd, dict), "expected globals to be instance of dict"
-        except IndexError:
+        # globals given explicitly (`Annotated["T", "name", globals()]`), otherwise module of the constructor
+        gd = metadata[1] if len(metadata) > 1 and isinstance(metadata[1], dict) else namespace
+        if gd is None:
             raise PieceException("globals not provided to evaluate ForwardRef")
-        except AssertionError as e:
-            raise PieceException(e.args[0])
 
+        if isinstance(name_or_factory, str):
+            return _create_forward_piece_parameter(param_name, name_or_factory, piece_type.__forward_arg__, gd)
         piece_type = _evaluate_forward_ref(piece_type, gd)
 
-    name_or_factory = metadata[0]
     if isinstance(name_or_factory, str):
         return _create_piece_parameter(param_name, piece_type, name_or_factory)
 
+    if name_or_factory is AllOf:
+        return _create_collection_parameter(param_name, piece_type)
+
+    if name_or_factory is Key:
+        return KeyParameter(param_name)
+
     if callable(name_or_factory):
         if _count_non_default_parameters(name_or_factory) != 0:
             raise PieceIncorrectUseException("Factory function must not have non-default parameters.")
-        return _create_default_factory_parameter(param_name, name_or_factory)
+        # other metadata (e.g. documentation of the parameter) is ignored as before caching policies existed
+        cache = next((item for item in metadata[1:] if isinstance(item, (FactoryCache, TTL))), FactoryCache.CALL)
+        return _create_default_factory_parameter(param_name, name_or_factory, cache)
 
     raise PieceIncorrectUseException("invalid use")
 
 
-def parse_parameter(parameter: inspect.Parameter) -> Parameter:
+def _parse_annotation(param_name: str, annotation: Any, namespace: dict[str, Any] | None = None) -> Parameter:
+    if type(annotation) is ANNOTATION_TYPE:
+        return _parse_annotated_parameter(param_name, annotation, namespace)
+    named = get_args(annotation)[0] if get_origin(annotation) is Provider else annotation
+    if not hasattr(named, "__name__"):  # e.g. `int | None`, piece name cannot be derived from the type
+        raise UnresolvableParameter(
+            f"Parameter `{param_name}` annotated with {annotation!r} must name the piece with `Annotated`"
+        )
+    return _create_piece_parameter(param_name, annotation, default_piece_name(annotation))
+
+
+def parse_parameter(parameter: inspect.Parameter, namespace: dict[str, Any] | None = None) -> Parameter:
     annotation = parameter.annotation
 
     if parameter.default is not inspect.Parameter.empty:
@@ -82,15 +204,34 @@ def parse_parameter(parameter: inspect.Parameter) -> Parameter:
     if annotation is inspect.Parameter.empty:
         raise UnresolvableParameter(f"Parameter `{parameter.name}` must be annotated")
 
-    return (
-        _parse_annotated_parameter(parameter.name, annotation)
-        if type(annotation) is ANNOTATION_TYPE
-        else _create_piece_parameter(parameter.name, annotation, annotation.__name__)
+    if isinstance(annotation, str):
+        return _parse_string_annotation(parameter.name, annotation, namespace if namespace is not None else {})
+
+    return _parse_annotation(parameter.name, annotation, namespace)
+
+
+def _needs_namespace(annotation: Any) -> bool:
+    """Whether `annotation` is (or is annotated with) a string evaluated in module of the constructor."""
+    return isinstance(annotation, str) or (
+        type(annotation) is ANNOTATION_TYPE and isinstance(annotation.__origin__, ForwardRef)
     )
 
 
-def get_parameters(fn: Callable[..., Any]) -> Iterable[Parameter]:
-    return tuple(map(parse_parameter, inspect.signature(fn).parameters.values()))
+def get_parameters(fn: Callable[..., Any]) -> tuple[Parameter, ...]:
+    parameters = inspect.signature(fn).parameters.values()
+    if not any(_needs_namespace(parameter.annotation) for parameter in parameters):
+        return tuple(map(parse_parameter, parameters))
+
+    namespace = _namespace(fn)
+    return tuple(parse_parameter(parameter, namespace) for parameter in parameters)
+
+
+def get_return_type(fn: Callable[..., Any]) -> Any:
+    """Return annotation of `fn`, string annotation is evaluated in module of `fn`."""
+    annotation = inspect.signature(fn).return_annotation
+    if isinstance(annotation, str):
+        annotation = _evaluate(annotation, _namespace(fn), f"return value of `{fn.__name__}`")
+    return annotation
 
 
-__all__ = ["get_parameters"]
+__all__ = ["get_parameters", "get_return_type"]
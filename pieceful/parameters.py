@@ -1,8 +1,80 @@
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Callable, Type
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Callable, ForwardRef, Type
 
-from .exceptions import _NeedCalculation
+from .exceptions import PieceException, PieceIncorrectUseException, _NeedCalculation, _NeedCollection
+from .typing_utils import evaluate_annotation
+
+_resolution: ContextVar[dict[Callable[[], Any], Any] | None] = ContextVar("pieceful_resolution", default=None)
+
+
+class AllOf:
+    """Marker of parameter requiring all pieces of a type: `Annotated[list[T], AllOf]`.\
+    Supported collections are `list[T]`, `tuple[T, ...]` and `dict[str, T]` (keyed by piece name).
+    """
+
+
+class Key:
+    """Marker of parameter receiving the key of keyed piece: `Annotated[str, Key]`, see `Keyed`."""
+
+
+@dataclass(frozen=True, slots=True)
+class TTL:
+    """Caching policy of default factory: `Annotated[T, factory, TTL(seconds)]`.\
+    Factory result is shared for `seconds` and evaluated again after it expires.
+    """
+
+    seconds: float
+
+    def __post_init__(self):
+        if self.seconds <= 0:
+            raise ValueError("TTL seconds must be positive")
+
+
+class _SingleFlight:
+    """Value of factory shared by all callers, evaluated by one caller at a time."""
+
+    __slots__ = ("ttl", "_lock", "_entry")
+
+    def __init__(self, ttl: float | None) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry: tuple[Any, float] | None = None
+
+    def get(self, factory: Callable[[], Any]) -> Any:
+        if (entry := self._entry) is not None and (self.ttl is None or time.monotonic() < entry[1]):
+            return entry[0]
+
+        with self._lock:
+            if (entry := self._entry) is not None and (self.ttl is None or time.monotonic() < entry[1]):
+                return entry[0]
+            value = factory()
+            self._entry = (value, time.monotonic() + self.ttl if self.ttl is not None else 0.0)
+            return value
+
+
+_shared: dict[tuple[Callable[[], Any], float | None], _SingleFlight] = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_value(factory: Callable[[], Any], ttl: float | None) -> _SingleFlight:
+    with _shared_lock:
+        if (shared := _shared.get((factory, ttl))) is None:
+            shared = _shared[(factory, ttl)] = _SingleFlight(ttl)
+        return shared
+
+
+def begin_resolution() -> Token | None:
+    """Starts resolution sharing `FactoryCache.RESOLUTION` factory results unless one is already running."""
+    return _resolution.set({}) if _resolution.get() is None else None
+
+
+def end_resolution(token: Token | None) -> None:
+    if token is not None:
+        _resolution.reset(token)
 
 
 @dataclass(frozen=True)
@@ -36,6 +108,45 @@ class PieceParameter(Parameter):
         raise _NeedCalculation(self.piece_name, self.type)
 
 
+class ForwardPieceParameter(PieceParameter):
+    """`PieceParameter` of string annotation, its type is evaluated in `namespace` on first access (and cached)."""
+
+    __slots__ = ("expression", "namespace")
+
+    def __init__(self, name: str, piece_name: str, expression: str, namespace: dict[str, Any]) -> None:
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "piece_name", piece_name)
+        object.__setattr__(self, "expression", expression)
+        object.__setattr__(self, "namespace", namespace)
+
+    def __getattr__(self, attribute: str) -> Any:
+        # called only while `type` slot is not filled yet
+        if attribute != "type":
+            raise AttributeError(attribute)
+        try:
+            piece_type = evaluate_annotation(self.expression, self.namespace)
+            while isinstance(piece_type, ForwardRef):
+                piece_type = evaluate_annotation(piece_type.__forward_arg__, self.namespace)
+        except Exception as e:
+            raise PieceException(
+                f"Cannot evaluate annotation `{self.expression}` of parameter `{self.name}`: {e!r}"
+            ) from e
+        object.__setattr__(self, "type", piece_type)
+        return piece_type
+
+    @property
+    def evaluated(self) -> bool:
+        """Whether `type` was evaluated already, checking it does not evaluate the annotation."""
+        try:
+            object.__getattribute__(self, "type")
+        except AttributeError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"ForwardPieceParameter(name={self.name!r}, piece_name={self.piece_name!r}, type={self.expression!r})"
+
+
 @dataclass(frozen=True, slots=True)
 class DefaultParameter(Parameter):
     value: Any
@@ -50,3 +161,46 @@ class DefaultFactoryParameter(Parameter):
 
     def get(self):
         return self.factory()
+
+
+@dataclass(frozen=True, slots=True)
+class SharedFactoryParameter(DefaultFactoryParameter):
+    """Default factory evaluated once per process (`ttl` is None) or once per `ttl` seconds."""
+
+    ttl: float | None = None
+    shared: _SingleFlight = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "shared", _shared_value(self.factory, self.ttl))
+
+    def get(self):
+        return self.shared.get(self.factory)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolutionFactoryParameter(DefaultFactoryParameter):
+    """Default factory evaluated once per resolution, i.e. shared by all pieces created by one request of piece."""
+
+    def get(self):
+        if (values := _resolution.get()) is None:
+            return self.factory()
+        if self.factory not in values:
+            values[self.factory] = self.factory()
+        return values[self.factory]
+
+
+@dataclass(frozen=True, slots=True)
+class CollectionParameter(Parameter):
+    collection_type: Type[Any]
+    item_type: Type[Any]
+
+    def get(self) -> Any:
+        raise _NeedCollection(self.collection_type, self.item_type)
+
+
+@dataclass(frozen=True, slots=True)
+class KeyParameter(Parameter):
+    """Parameter receiving the key of keyed piece, it is not resolved from registry."""
+
+    def get(self) -> Any:
+        raise PieceIncorrectUseException(f"Parameter `{self.name}` receives key, piece must be registered as keyed.")
@@ -1,22 +1,40 @@
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Generic, Iterable, Type, TypeVar
+from typing import Any, Callable, Generic, Type, TypeVar
 
-from .enums import Scope
+from .enums import InitStrategy, Scope
+from .exceptions import PieceIncorrectUseException
+from .keyed import Keyed, KeyedInstances
 from .parameter_parser import get_parameters
-from .parameters import Parameter
+from .parameters import KeyParameter, Parameter
 
 _T = TypeVar("_T")
 Constructor = Callable[..., _T]
 
 
 class PieceData(ABC, Generic[_T]):
-    __slots__ = ("type", "_constructor", "parameters", "_instance")
+    __slots__ = ("type", "_constructor", "parameters", "_instance", "init_strategy", "offload", "lock")
+    scope: Scope
+    evictable = False  # held instance may be dropped (and created again), so it must not be cached elsewhere
 
-    def __init__(self, type: Type[_T], constructor: Constructor[_T]) -> None:
+    def __init__(
+        self,
+        type: Type[_T],
+        constructor: Constructor[_T],
+        init_strategy: InitStrategy = InitStrategy.LAZY,
+        parameters: tuple[Parameter, ...] | None = None,
+        offload: bool = False,
+    ) -> None:
         self.type: Type[_T] = type
         self._constructor = constructor
-        self.parameters: Iterable[Parameter] = get_parameters(constructor)
+        self.init_strategy = init_strategy
+        self.offload = offload  # constructor runs in executor when resolved by `Registry.aget_object`
+        self.parameters: tuple[Parameter, ...] = get_parameters(constructor) if parameters is None else parameters
         self._instance: _T | None = None
+        # serializes creation of held instance (checked again under the lock), not needed for ORIGINAL pieces
+        self.lock: threading.RLock | None = None if self.scope is Scope.ORIGINAL else threading.RLock()
 
     @abstractmethod
     def get_instance(self) -> _T | None:
@@ -28,6 +46,28 @@ class PieceData(ABC, Generic[_T]):
             instance if it exists, otherwise None
         """
 
+    def peek_instance(self) -> _T | None:
+        """Instance if it exists, unlike `get_instance` it does not count as access of the piece."""
+        return self.get_instance()
+
+    def has_instance(self) -> bool:
+        """Whether the instance is held, see `peek_instance`."""
+        return self.peek_instance() is not None
+
+    def create(self, parameters: dict[str, Any]) -> _T:
+        """Creates new instance with help of self._constructor, the instance is not held."""
+        return self._constructor(**parameters)
+
+    def set_instance(self, instance: _T | None) -> None:
+        """Replaces (or with None drops) the held instance of the piece.
+
+        Parameters
+        ----------
+        instance : _T | None
+            instance to be held
+        """
+        self._instance = instance
+
     @abstractmethod
     def initialize(self, parameters: dict[str, Any]) -> _T:
         """Initializes instance from specified PieceData with help of self._constructor.
@@ -45,27 +85,205 @@ class PieceData(ABC, Generic[_T]):
 
 
 class OriginalPieceData(PieceData[_T]):
+    __slots__ = ()
+    scope = Scope.ORIGINAL
+
     def get_instance(self) -> _T | None:
         return None
 
     def initialize(self, parameters) -> _T:
-        return self._constructor(**parameters)
+        return self.create(parameters)
 
 
 class UniversalPieceData(PieceData[_T]):
+    __slots__ = ()
+    scope = Scope.UNIVERSAL
+
     def get_instance(self) -> _T | None:
         return self._instance
 
     def initialize(self, parameters) -> _T:
-        self._instance = self._constructor(**parameters)
+        self._instance = self.create(parameters)
         return self._instance
 
 
+class WeakPieceData(PieceData[_T]):
+    """Piece holding its instance weakly, the instance is created again after it was garbage collected."""
+
+    __slots__ = ()
+    scope = Scope.WEAK
+    evictable = True
+
+    def get_instance(self) -> _T | None:
+        return None if (ref := self._instance) is None else ref()
+
+    def set_instance(self, instance: _T | None) -> None:
+        self._instance = None if instance is None else weakref.ref(instance)
+
+    def initialize(self, parameters) -> _T:
+        instance = self.create(parameters)
+        try:
+            self.set_instance(instance)
+        except TypeError:
+            raise PieceIncorrectUseException(
+                f"Instance of WEAK piece {self.type} must support weak references (define `__weakref__` slot)."
+            ) from None
+        return instance
+
+
+class IdlePieceData(UniversalPieceData[_T]):
+    """`UNIVERSAL` piece whose instance is dropped by `Registry.trim` when not accessed for `idle` seconds."""
+
+    __slots__ = ("idle", "_accessed")
+    evictable = True
+
+    def __init__(
+        self,
+        type: Type[_T],
+        constructor: Constructor[_T],
+        idle: float,
+        init_strategy: InitStrategy = InitStrategy.LAZY,
+        parameters: tuple[Parameter, ...] | None = None,
+        offload: bool = False,
+    ) -> None:
+        super().__init__(type, constructor, init_strategy, parameters, offload)
+        self.idle = idle
+        self._accessed = 0.0
+
+    def get_instance(self) -> _T | None:
+        if (instance := self._instance) is not None:
+            self._accessed = time.monotonic()
+        return instance
+
+    def peek_instance(self) -> _T | None:
+        return self._instance
+
+    def initialize(self, parameters) -> _T:
+        instance = super().initialize(parameters)
+        self._accessed = time.monotonic()
+        return instance
+
+    def trim(self, now: float, force: bool = False) -> bool:
+        """Drops the instance when it was not accessed for `idle` seconds (or when `force`)."""
+        if self._instance is None or (not force and now - self._accessed < self.idle):
+            return False
+        self._instance = None
+        return True
+
+
+class KeyedPieceData(UniversalPieceData[_T]):
+    """Piece created (and held) per key, see `Keyed`. Key is passed to the parameter annotated with `Key`."""
+
+    __slots__ = ("key_parameter", "instances")
+
+    def __init__(
+        self,
+        type: Type[_T],
+        constructor: Constructor[_T],
+        keyed: Keyed,
+        parameters: tuple[Parameter, ...] | None = None,
+        offload: bool = False,
+        key_parameter: str | None = None,
+    ) -> None:
+        super().__init__(type, constructor, InitStrategy.LAZY, parameters, offload)
+        if key_parameter is None:
+            keys = [param.name for param in self.parameters if isinstance(param, KeyParameter)]
+            if len(keys) != 1:
+                raise PieceIncorrectUseException(
+                    f"Keyed piece {type} must have exactly one parameter annotated with `Key`, found {len(keys)}."
+                )
+            key_parameter = keys[0]
+            self.parameters = tuple(param for param in self.parameters if not isinstance(param, KeyParameter))
+        self.key_parameter = key_parameter
+        self.instances = KeyedInstances(keyed)
+        self.lock = None  # instances are created (once per key) by `instances`
+
+    def get_instance(self) -> _T | None:
+        return None
+
+    def set_instance(self, instance: _T | None) -> None:
+        if instance is None:
+            self.instances.evict()  # e.g. instances were built from a dependency that was replaced
+
+    def initialize(self, parameters) -> _T:
+        raise PieceIncorrectUseException(f"Piece {self.type} is keyed, it must be requested with a key.")
+
+
 piece_data_mapping = {
     Scope.UNIVERSAL: UniversalPieceData,
     Scope.ORIGINAL: OriginalPieceData,
+    Scope.WEAK: WeakPieceData,
 }
 
 
-def piece_data_factory(type_: Type[_T], scope: Scope, constructor: Constructor) -> PieceData[_T]:
-    return piece_data_mapping[scope][_T](type_, constructor)
+def piece_data_factory(
+    type_: Type[_T],
+    scope: Scope,
+    constructor: Constructor,
+    init_strategy: InitStrategy = InitStrategy.LAZY,
+    parameters: tuple[Parameter, ...] | None = None,
+    offload: bool = False,
+    keyed: Keyed | None = None,
+    idle: float | None = None,
+) -> PieceData[_T]:
+    if keyed is not None:
+        return KeyedPieceData(type_, constructor, keyed, parameters, offload)
+    if idle is not None:
+        return IdlePieceData(type_, constructor, idle, init_strategy, parameters, offload)
+    return piece_data_mapping[scope][_T](type_, constructor, init_strategy, parameters, offload)
+
+
+class PieceStub(Generic[_T]):
+    """Definition of a piece registered only in some profiles or under a condition.
+
+    Constructor's parameters are not parsed until the piece is activated, inactive pieces are kept as stubs.
+    Profile prefixed with `!` is matched when it is not active.
+    """
+
+    __slots__ = ("name", "type", "constructor", "scope", "init_strategy", "profiles", "condition", "offload", "keyed", "idle")
+
+    def __init__(
+        self,
+        name: str,
+        type: Type[_T],
+        constructor: Constructor[_T],
+        scope: Scope,
+        init_strategy: InitStrategy,
+        profiles: frozenset[str] | None = None,
+        condition: Callable[[], bool] | None = None,
+        offload: bool = False,
+        keyed: Keyed | None = None,
+        idle: float | None = None,
+    ) -> None:
+        self.name = name
+        self.type = type
+        self.constructor = constructor
+        self.scope = scope
+        self.init_strategy = init_strategy
+        self.profiles = profiles
+        self.condition = condition
+        self.offload = offload
+        self.keyed = keyed
+        self.idle = idle
+
+    def is_active(self, profiles: frozenset[str]) -> bool:
+        """Checks profiles and evaluates the condition (only when profiles match)."""
+        if self.profiles is not None and not any(
+            profile[1:] not in profiles if profile.startswith("!") else profile in profiles for profile in self.profiles
+        ):
+            return False
+        return self.condition is None or bool(self.condition())
+
+    def build(self) -> PieceData[_T]:
+        return piece_data_factory(
+            self.type,
+            self.scope,
+            self.constructor,
+            self.init_strategy,
+            offload=self.offload,
+            keyed=self.keyed,
+            idle=self.idle,
+        )
+
+    def __repr__(self) -> str:
+        return f"PieceStub({self.name!r}, {self.type!r}, profiles={self.profiles!r})"
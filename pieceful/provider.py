@@ -0,0 +1,119 @@
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Generic, Type, TypeVar, get_args, get_origin
+
+from .enums import Scope
+from .exceptions import PieceNotFound
+from .parameters import CollectionParameter, DefaultParameter, PieceParameter, begin_resolution, end_resolution
+
+if TYPE_CHECKING:
+    from .container import Container
+    from .piece_data import PieceData
+    from .registry import Registry
+
+_T = TypeVar("_T")
+
+
+def default_piece_name(piece_type: Any) -> str:
+    """Name of piece used when not specified: name of the type (of the provided type for `Provider[T]`)."""
+    if piece_type.__class__ is not type and get_origin(piece_type) is Provider:
+        piece_type = get_args(piece_type)[0]
+    return piece_type.__name__
+
+
+class _Plan:
+    __slots__ = ("version", "piece_data", "constants", "calls")
+
+    def __init__(
+        self,
+        version: int,
+        piece_data: "PieceData[Any]",
+        constants: dict[str, Any],
+        calls: tuple[tuple[str, Callable[[], Any]], ...],
+    ) -> None:
+        self.version = version
+        self.piece_data = piece_data
+        self.constants = constants
+        self.calls = calls
+
+
+class Provider(Generic[_T]):
+    """Callable creating instances of a piece.
+
+    Resolution of the piece and its parameters is compiled once (and again after registry changes):
+    `UNIVERSAL` dependencies are resolved at that time and reused, `ORIGINAL` dependencies are created
+    by their own providers. Calling provider of `UNIVERSAL` piece returns its single instance.
+
+    Inject it with `Annotated[Provider[T], "name"]` or create it with `Registry.provider`. Provider injected
+    into piece of a container creates instances from the container.
+    """
+
+    __slots__ = ("registry", "piece_type", "piece_name", "_plan")
+
+    def __init__(self, registry: "Registry | Container", piece_type: Type[_T], piece_name: str | None = None) -> None:
+        self.registry = registry
+        self.piece_type = piece_type
+        self.piece_name = piece_name if piece_name is not None else default_piece_name(piece_type)
+        self._plan: _Plan | None = None
+
+        if registry._get_piece_data(self.piece_name, piece_type) is None:
+            raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+
+    def _compile(self) -> _Plan:
+        registry = self.registry
+        version = registry._version
+        piece_data = registry._get_piece_data(self.piece_name, self.piece_type)
+        if piece_data is None:
+            raise PieceNotFound(f"Piece {self.piece_type} not found in registry.")
+
+        constants: dict[str, Any] = {}
+        calls: list[tuple[str, Callable[[], Any]]] = []
+        for param in piece_data.parameters:
+            if isinstance(param, DefaultParameter):
+                constants[param.name] = param.value
+            elif isinstance(param, PieceParameter):
+                dependency = registry._get_piece_data(param.piece_name, param.type)
+                if dependency is not None and (dependency.scope is Scope.ORIGINAL or dependency.evictable):
+                    calls.append((param.name, Provider(registry, param.type, param.piece_name)))
+                else:
+                    constants[param.name] = registry.get_object(param.piece_name, param.type)
+            elif isinstance(param, CollectionParameter):
+                calls.append((param.name, partial(registry.get_collection, param.collection_type, param.item_type)))
+            else:
+                calls.append((param.name, param.get))
+
+        return _Plan(version, piece_data, constants, tuple(calls))
+
+    def _current_plan(self) -> _Plan:
+        plan = self._plan
+        if plan is None or plan.version != self.registry._version:
+            plan = self._plan = self._compile()
+        return plan
+
+    def _create(self, plan: _Plan) -> _T:
+        params = plan.constants.copy()
+        token = begin_resolution()
+        try:
+            for name, call in plan.calls:
+                params[name] = call()
+        finally:
+            end_resolution(token)
+
+        if self.registry._memory is not None:
+            return self.registry._memory.initialize(plan.piece_data, params)
+        return plan.piece_data.create(params)
+
+    def __call__(self) -> _T:
+        plan = self._current_plan()
+        if plan.piece_data.scope is not Scope.ORIGINAL:
+            return self.registry._get(plan.piece_data)
+        return self._create(plan)
+
+    def many(self, n: int) -> list[_T]:
+        """Creates `n` instances (for `UNIVERSAL` piece `n` times the same instance)."""
+        plan = self._current_plan()
+        if plan.piece_data.scope is not Scope.ORIGINAL:
+            return [self.registry._get(plan.piece_data)] * n
+        return [self._create(plan) for _ in range(n)]
+
+    def __repr__(self) -> str:
+        return f"Provider({self.piece_name!r}, {self.piece_type!r})"
@@ -0,0 +1,33 @@
+"""Pytest fixtures isolating tests from each other without clearing the registry.
+
+Enabled automatically when pieceful is installed, otherwise add `pytest_plugins = ["pieceful.pytest_plugin"]`
+to `conftest.py`.
+"""
+
+from contextlib import ExitStack
+from typing import Any, Callable, Iterator, Type
+
+import pytest
+
+from .registry import Registry, registry
+
+
+@pytest.fixture
+def pieceful_registry() -> Iterator[Registry]:
+    """Registry that is restored to its previous state when test finishes."""
+    snapshot = registry.snapshot()
+    try:
+        yield registry
+    finally:
+        registry.restore(snapshot)
+
+
+@pytest.fixture
+def piece_override(pieceful_registry: Registry) -> Iterator[Callable[[str, Type[Any], Any], None]]:
+    """Function overriding a piece (see `Registry.override`) until test finishes."""
+    with ExitStack() as stack:
+
+        def override(piece_name: str, piece_type: Type[Any], instance_or_factory: Any) -> None:
+            stack.enter_context(pieceful_registry.override(piece_name, piece_type, instance_or_factory))
+
+        yield override
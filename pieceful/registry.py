@@ -1,82 +1,1166 @@
-from collections import defaultdict
+import asyncio
+import inspect
+import os
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from re import Pattern
-from typing import Any, Iterator, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, Type, TypeVar, get_args, get_origin
 
 from .exceptions import (
     AmbiguousPieceException,
+    PieceIncorrectUseException,
     PieceNotFound,
     _NeedCalculation,
+    _NeedCollection,
 )
-from .piece_data import PieceData
+from .blueprint import Blueprint, PieceBlueprint, import_path, resolve_path
+from .enums import InitStrategy, Scope
+from .memory import MemoryAccounting, MemoryReport, memory_report
+from .parameters import (
+    CollectionParameter,
+    ForwardPieceParameter,
+    Parameter,
+    PieceParameter,
+    begin_resolution,
+    end_resolution,
+)
+from .keyed import Keyed, KeyedStats
+from .piece_data import IdlePieceData, KeyedPieceData, PieceData, PieceStub, piece_data_factory
+from .provider import Provider, default_piece_name
+from .storage import EMPTY_TABLE, PieceKey, PieceTable, Storage, TypeIndex, index_types, type_index
+from .tracing import BEGIN, END, Tracer
 from .typing_utils import is_subclass
 
-Storage = dict[str, dict[Type[Any], PieceData[Any]]]
+if TYPE_CHECKING:
+    from .container import Container
+    from .injector import _Injection
 
 _T = TypeVar("_T")
 
 
+def _environment_profiles() -> frozenset[str] | None:
+    profiles = os.environ.get("PIECEFUL_PROFILES")
+    if profiles is None:
+        return None
+    return frozenset(profile.strip() for profile in profiles.split(",") if profile.strip())
+
+
 def resolve_name(name: str | None, piece_type: Type[_T]) -> str:
-    return name if name is not None else piece_type.__name__
+    return name if name is not None else default_piece_name(piece_type)
+
+
+def resolve_provider(owner: "Registry | Container", piece_name: str, piece_type: Type[Any]) -> Provider[Any]:
+    """Resolves piece that is not registered: `Provider[T]` is resolved as provider of piece `T` (of the name)
+    creating instances from `owner` (registry or container), other types raise `PieceNotFound`.
+    """
+    if get_origin(piece_type) is Provider:
+        return Provider(owner, get_args(piece_type)[0], piece_name)
+    raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+
+
+def resolve_parameters(
+    parameters: Iterable[Parameter],
+    get_object: Callable[[str, Type[Any]], Any],
+    get_collection: Callable[[Type[Any], Type[Any]], Any],
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    token = begin_resolution()
+    try:
+        for param in parameters:
+            try:
+                param_val = param.get()
+            except _NeedCalculation as e:
+                param_val = get_object(e.piece_name, e.piece_type)
+            except _NeedCollection as e:
+                param_val = get_collection(e.collection_type, e.item_type)
+            params[param.name] = param_val
+    finally:
+        end_resolution(token)
+    return params
+
+
+def _wait_for(lock: threading.RLock) -> None:
+    with lock:
+        pass
+
+
+def find_all(storage: Storage, item_type: Type[Any]) -> tuple[tuple[str, PieceData[Any]], ...]:
+    return tuple(
+        (name, pd)
+        for name, pieces in tuple(storage.items())
+        for pd in pieces.entries
+        if is_subclass(pd.type, item_type)
+    )
+
+
+def reachable(storage: Storage, roots: Iterable[str | tuple[str, Type[Any]]]) -> set[PieceData[Any]]:
+    """Pieces reachable from `roots` (names or names with types) over dependencies of their parameters.
+
+    Dependency on a string annotation (not evaluated yet) reaches all pieces of the name.
+    """
+    stack: list[PieceData[Any]] = []
+    for root in roots:
+        name, piece_type = (root, None) if isinstance(root, str) else root
+        table = storage.get(name, EMPTY_TABLE)
+        pieces = table.entries if piece_type is None else tuple(filter(None, (table.lookup(piece_type),)))
+        if not pieces:
+            raise PieceNotFound(f"Root piece `{name}` not found in registry.")
+        stack.extend(pieces)
+
+    found: set[PieceData[Any]] = set()
+    while stack:
+        piece_data = stack.pop()
+        if piece_data in found:
+            continue
+        found.add(piece_data)
+        for param in piece_data.parameters:
+            if isinstance(param, ForwardPieceParameter):
+                stack.extend(storage.get(param.piece_name, EMPTY_TABLE).entries)
+            elif isinstance(param, PieceParameter):
+                piece_type = param.type
+                if get_origin(piece_type) is Provider:
+                    piece_type = get_args(piece_type)[0]
+                if (dependency := storage.get(param.piece_name, EMPTY_TABLE).lookup(piece_type)) is not None:
+                    stack.append(dependency)
+            elif isinstance(param, CollectionParameter):
+                stack.extend(pd for _, pd in find_all(storage, param.item_type))
+    return found
+
+
+def collect(
+    collection_type: Type[Any], matches: Iterable[tuple[str, PieceData[Any]]], get: Callable[[PieceData[Any]], Any]
+) -> Any:
+    """Creates collection (`list`, `tuple` or `dict` keyed by piece name) of instances of matching pieces."""
+    if collection_type is dict:
+        items: dict[str, Any] = {}
+        for name, pd in matches:
+            if name not in items:
+                items[name] = get(pd)
+        return items
+    return collection_type(get(pd) for _, pd in matches)
+
+
+@dataclass(frozen=True, slots=True)
+class RegistrySnapshot:
+    storage: Storage
+    frozen: bool
+    instances: tuple[tuple[PieceData[Any], Any], ...]  # held instance (weak reference of WEAK piece) or None
+    pending: dict[str, tuple[PieceBlueprint, ...]]
+    blueprinted: frozenset[tuple[str, str]]
+    profiles: frozenset[str] | None
+    deferred: tuple[PieceStub[Any], ...]
+    inactive: tuple[PieceStub[Any], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class PieceDescriptor:
+    """Description of registered piece, obtained without creating it. `provider` creates (or returns) the instance."""
+
+    name: str
+    type: Type[Any]
+    scope: Scope
+    init_strategy: InitStrategy
+    dependencies: tuple[str, ...]  # names of pieces required by parameters
+    instantiated: bool
+    provider: Provider[Any] = field(repr=False, compare=False)
+
+
+def _override_piece_data(original: PieceData[_T], instance_or_factory: Any) -> PieceData[_T]:
+    """Replacement of `original` keeping its scope, init strategy, offloading and keyed or idle policy."""
+    if isinstance(instance_or_factory, type) or inspect.isroutine(instance_or_factory):
+        return piece_data_factory(
+            original.type,
+            original.scope,
+            instance_or_factory,
+            original.init_strategy,
+            None,
+            original.offload,
+            original.instances.policy if isinstance(original, KeyedPieceData) else None,
+            original.idle if isinstance(original, IdlePieceData) else None,
+        )
+
+    if isinstance(original, KeyedPieceData):  # the instance for every key, not evicted to the callback
+        return KeyedPieceData(original.type, lambda **_: instance_or_factory, Keyed(), (), False, original.key_parameter)
+    piece_data = piece_data_factory(original.type, Scope.UNIVERSAL, lambda: instance_or_factory)
+    piece_data.set_instance(instance_or_factory)
+    return piece_data
 
 
 class Registry:
+    """Registry of pieces.
+
+    Pieces registered under a name are kept in immutable `PieceTable` in storage (`registry` attribute).
+    Writers (registrations, overrides, ...) put new tables into storage under a lock, readers look tables up
+    without any locking and take a snapshot of storage items when iterating it.
+    """
+
     def __init__(self):
-        self.registry: Storage = defaultdict(dict)
+        self.registry: dict[str, PieceTable] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._dependency_graph: dict[str, list[tuple[str, PieceData[Any], PieceParameter]]] = {}
+        self._frozen = False
+        self._version = 0
+        self._matches: dict[Any, tuple[int, tuple[tuple[str, PieceData[Any]], ...]]] = {}
+        self._types: TypeIndex | None = None  # built on first `implementation`, then extended by registrations
+        self._keys: "weakref.WeakValueDictionary[tuple[str, Any], PieceKey[Any]]" = weakref.WeakValueDictionary()
+        self._bound: tuple[int, dict[int, PieceData[Any] | None]] = (-1, {})  # slot -> piece, of one version
+        self._executor: Executor | None = None
+        self._inflight: dict[PieceData[Any], Future[Any]] = {}
+        self._memory: MemoryAccounting | None = None
+        self._tracer: Tracer | None = None
+        self._pending: dict[str, tuple[PieceBlueprint, ...]] = {}
+        self._blueprinted: frozenset[tuple[str, str]] = frozenset()
+        self._materializing = threading.RLock()
+        self._profiles: frozenset[str] | None = _environment_profiles()
+        self._deferred: list[PieceStub[Any]] = []
+        self._inactive: list[PieceStub[Any]] = []
+        self._containers: "weakref.WeakSet[Container]" = weakref.WeakSet()
+        self._injected: list[_Injection] = []  # injected functions passing resolved pieces, see `_changed`
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def version(self) -> int:
+        """Number incremented whenever registered pieces change, used to invalidate cached resolutions."""
+        return self._version
+
+    def _publish(self, storage: dict[str, PieceTable], types: TypeIndex | None = None) -> None:
+        # caller holds self._lock, type index is built again on its next use unless `types` of storage is given
+        self.registry = storage
+        self._types = types
+        self._bound = (-1, {})  # bound keys would keep removed pieces reachable until their next use
+        self._changed()
+
+    def _invalidate(self) -> None:
+        """Invalidates resolutions cached outside of registry, after held instances were changed."""
+        with self._lock:
+            self._changed()
+
+    def _changed(self) -> None:
+        # caller holds self._lock, resolutions compare version, injected functions are told to resolve again
+        self._version += 1
+        injected, self._injected = self._injected, []
+        for injection in injected:
+            injection.resolved = None
 
     def add(self, piece_name: str, piece_data: PieceData[Any]):
-        piece_dict = self.registry[piece_name]
+        if self._blueprinted and (piece_name, import_path(piece_data.type)) in self._blueprinted:
+            return  # defined by loaded blueprint (module was imported to build a piece)
+        if (batch := getattr(self._local, "batch", None)) is not None:
+            batch.append((piece_name, piece_data))
+            return
+        self._add_all(((piece_name, piece_data),))
+
+    def add_conditional(self, stub: PieceStub[Any]) -> None:
+        """Registers piece active only in some profiles or under a condition, see `activate`.
+
+        Until profiles are activated, the piece is kept as a stub. Afterwards its condition is evaluated
+        once and the piece is registered (or kept as inactive stub, without parsing its constructor).
+        """
+        with self._lock:
+            if self._profiles is None:
+                self._deferred.append(stub)
+                return
+            profiles = self._profiles
+
+        if stub.is_active(profiles):
+            self.add(stub.name, stub.build())
+        else:
+            with self._lock:
+                self._inactive.append(stub)
+
+    def activate(self, *profiles: str) -> None:
+        """Activates profiles and registers conditional pieces (registered earlier) that are active in them.
+
+        Profiles are activated also by environment variable `PIECEFUL_PROFILES` (comma-separated names)
+        when registry is created. Conditional pieces registered before activation are not available.
+
+        Raises
+        ------
+        PieceIncorrectUseException
+            when profiles are already active
+        """
+        with self._lock:
+            if self._profiles is not None:
+                raise PieceIncorrectUseException(f"Profiles are already activated: {sorted(self._profiles)}.")
+            self._profiles = active = frozenset(profiles)
+            deferred, self._deferred = self._deferred, []
+
+        activated: list[tuple[str, PieceData[Any]]] = []
+        inactive: list[PieceStub[Any]] = []
+        for stub in deferred:
+            if stub.is_active(active):
+                activated.append((stub.name, stub.build()))
+            else:
+                inactive.append(stub)
+        with self._lock:
+            self._inactive.extend(inactive)
+        if (batch := getattr(self._local, "batch", None)) is not None:
+            batch.extend(activated)  # validated and published (EAGER ones created) at the end of the batch
+            return
+        self._add_all(activated)
 
-        if piece_data.type in piece_dict:
-            raise AmbiguousPieceException(
-                f"Piece {piece_data.type} is already registered as a subclass of {piece_data.type}."
+    def prune(self, roots: Iterable[str | tuple[str, Type[Any]]]) -> list[PieceStub[Any]]:
+        """Removes pieces not reachable from `roots` over dependencies declared in parameters, releasing
+        their instances. Used inside `batch` it removes also pieces registered in the batch, so unreachable
+        `EAGER` pieces are not created.
+
+        Pieces requested only dynamically (e.g. by `provide` in a default factory) are not reachable,
+        list them among roots.
+
+        Parameters
+        ----------
+        roots : Iterable[str | tuple[str, Type[Any]]]
+            names of root pieces (all pieces of the name) or tuples of name and type
+
+        Returns
+        -------
+        list[PieceStub[Any]]
+            removed pieces
+
+        Raises
+        ------
+        PieceNotFound
+            when some root is not registered
+        """
+        self._materialize_all()
+        batch = getattr(self._local, "batch", None) or []
+        with self._lock:
+            if self._frozen:
+                raise PieceIncorrectUseException("Cannot prune pieces, registry is frozen.")
+
+            combined: dict[str, PieceTable] = dict(self.registry)
+            grouped: dict[str, list[PieceData[Any]]] = {}
+            for name, pd in batch:
+                grouped.setdefault(name, list(combined.get(name, EMPTY_TABLE).entries)).append(pd)
+            combined.update((name, PieceTable(pieces)) for name, pieces in grouped.items())
+
+            found = reachable(combined, roots)
+            unreachable = [(name, pd) for name, table in combined.items() for pd in table.entries if pd not in found]
+            if not unreachable:
+                return []
+
+            storage: dict[str, PieceTable] = {}
+            for name, table in self.registry.items():
+                kept = [pd for pd in table.entries if pd in found]
+                if len(kept) == len(table.entries):
+                    storage[name] = table
+                elif kept:
+                    storage[name] = PieceTable(kept)
+                for pd in table.entries:
+                    if pd not in found:
+                        self._untrack_dependencies(pd)
+            batch[:] = [(name, pd) for name, pd in batch if pd in found]
+            self._publish(storage)
+            # cached matches would keep removed pieces (and their instances) reachable
+            self._matches = {}
+
+        for _, pd in unreachable:
+            pd.set_instance(None)
+        self._discard_in_containers(pd for _, pd in unreachable)
+        return [
+            PieceStub(
+                name,
+                pd.type,
+                pd._constructor,
+                pd.scope,
+                pd.init_strategy,
+                offload=pd.offload,
+                keyed=pd.instances.policy if isinstance(pd, KeyedPieceData) else None,
+                idle=pd.idle if isinstance(pd, IdlePieceData) else None,
             )
+            for name, pd in unreachable
+        ]
 
-        piece_dict[piece_data.type] = piece_data
+    @property
+    def profiles(self) -> frozenset[str] | None:
+        """Active profiles, None when not activated yet."""
+        return self._profiles
 
-    def _get_piece_data(self, piece_name: str, piece_type: Type[_T]) -> PieceData[_T] | None:
-        if (pd := self.registry[piece_name].get(piece_type)) is not None:
-            return pd
+    @property
+    def inactive_pieces(self) -> tuple[PieceStub[Any], ...]:
+        """Conditional pieces that are not active (or not evaluated yet, before activation)."""
+        return (*self._inactive, *self._deferred)
 
-        for type_, pd in self.registry[piece_name].items():
-            if is_subclass(type_, piece_type):
-                return pd
-        return None
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collects pieces registered (by current thread) inside the block and adds them at once at its end.
+
+        Duplicates are validated in one pass, storage is built once and `EAGER` pieces are created
+        after all pieces of the batch are registered. Nothing is registered if any piece is ambiguous
+        or the block raises.
+        """
+        if getattr(self._local, "batch", None) is not None:
+            yield  # nested batch is part of the outer one
+            return
+
+        self._local.batch = entries = []
+        try:
+            yield
+        finally:
+            self._local.batch = None
+        self._add_all(entries)
+
+    def _add_all(self, entries: Iterable[tuple[str, PieceData[Any]]]) -> None:
+        entries = tuple(entries)
+        if not entries:
+            return
+        if self._pending:
+            self._materialize(name for name, _ in entries)
+        with self._lock:
+            if self._frozen:
+                names = ", ".join(f"`{name}`" for name, *_ in entries)
+                raise PieceIncorrectUseException(f"Cannot register piece {names}, registry is frozen.")
+            self._put(entries)
+
+        for name, piece_data in entries:
+            if piece_data.init_strategy is InitStrategy.EAGER:
+                self.get_object(name, piece_data.type)
+
+    def _put(self, entries: tuple[tuple[str, PieceData[Any]], ...]) -> None:
+        # caller holds self._lock
+        storage = self.registry  # new tables are put in place, readers never see a table being built
+        added: dict[str, list[PieceData[Any]]] = {}
+        collisions: list[str] = []
+        for name, piece_data in entries:
+            if (pieces := added.get(name)) is None:
+                pieces = added[name] = list(storage.get(name, EMPTY_TABLE).entries)
+            if any(pd.type == piece_data.type for pd in pieces):
+                collisions.append(f"Piece {piece_data.type} is already registered as a subclass of {piece_data.type}.")
+                continue
+            pieces.append(piece_data)
+
+        if collisions:
+            raise AmbiguousPieceException(" ".join(collisions))
+
+        for name, pieces in added.items():
+            storage[sys.intern(name)] = PieceTable(pieces)
+        types = self._types
+        self._publish(storage, types)
+        if types is not None:  # extended in place, only once `implementation` was used
+            for name, piece_data in entries:
+                index_types(types, name, piece_data)
+        for name, piece_data in entries:
+            self._track_dependencies(name, piece_data)
+
+    def _track_dependencies(self, piece_name: str, piece_data: PieceData[Any]) -> None:
+        # caller holds self._lock
+        for param in piece_data.parameters:
+            if isinstance(param, PieceParameter):
+                dependency_name = param.piece_name
+                self._dependency_graph.setdefault(dependency_name, []).append((piece_name, piece_data, param))
+
+    def _untrack_dependencies(self, piece_data: PieceData[Any]) -> None:
+        # caller holds self._lock
+        for param in piece_data.parameters:
+            if isinstance(param, PieceParameter):
+                edges = self._dependency_graph[param.piece_name]
+                edges[:] = [edge for edge in edges if edge[1] is not piece_data]
+
+    def freeze(self) -> None:
+        """Stops accepting registrations until `clear` is called.
+
+        Tables of pieces are immutable (`PieceTable` per name, interned names, precomputed supertypes) frozen
+        or not, freezing only guarantees that no pieces are added anymore.
+        """
+        with self._lock:
+            self._frozen = True
+
+    def _get_piece_data(self, piece_name: str, piece_type: Type[_T]) -> PieceData[_T] | None:
+        pieces = self.registry.get(piece_name)
+        if pieces is None:
+            if piece_name not in self._pending:
+                return None
+            self._materialize((piece_name,))
+            if (pieces := self.registry.get(piece_name)) is None:
+                return None
+        return pieces.lookup(piece_type)
 
     def get_object(self, piece_name: str | None, piece_type: Type[_T]) -> _T:
-        piece_data = self._get_piece_data(resolve_name(piece_name, piece_type), piece_type)
+        piece_name = resolve_name(piece_name, piece_type)
+        piece_data = self._get_piece_data(piece_name, piece_type)
+
+        if piece_data is None:
+            return resolve_provider(self, piece_name, piece_type)
+
+        if self._tracer is not None:
+            return self._traced_get(piece_name, piece_data, self._tracer)
+        return self._get(piece_data)
 
+    def _keyed(self, piece_name: str | None, piece_type: Type[_T]) -> KeyedPieceData[_T]:
+        piece_name = resolve_name(piece_name, piece_type)
+        piece_data = self._get_piece_data(piece_name, piece_type)
         if piece_data is None:
             raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+        if not isinstance(piece_data, KeyedPieceData):
+            raise PieceIncorrectUseException(f"Piece `{piece_name}` of type {piece_data.type} is not keyed.")
+        return piece_data
+
+    def get_keyed(self, piece_name: str | None, piece_type: Type[_T], key: Hashable) -> _T:
+        """Returns instance of keyed piece for `key`, created by its constructor receiving the key
+        (and other parameters resolved from registry) when it is not cached.
+        """
+        piece_data = self._keyed(piece_name, piece_type)
+
+        def create() -> _T:
+            params = resolve_parameters(piece_data.parameters, self.get_object, self.get_collection)
+            params[piece_data.key_parameter] = key
+            return piece_data.create(params)
+
+        return piece_data.instances.get(key, create)
+
+    def evict(self, piece_type: Type[Any], piece_name: str | None = None, key: Hashable | None = None) -> None:
+        """Evicts instance of keyed piece for `key` (all its instances when `key` is None), eviction callback
+        of the piece is called for each of them.
+        """
+        self._keyed(piece_name, piece_type).instances.evict(key)
+
+    def keyed_stats(self, piece_type: Type[Any], piece_name: str | None = None) -> KeyedStats:
+        """Number of held instances, hits, misses and evictions of keyed piece."""
+        return self._keyed(piece_name, piece_type).instances.stats()
+
+    def _key(self, piece_name: str, piece_type: Type[_T]) -> PieceKey[_T]:
+        if (key := self._keys.get((piece_name, piece_type))) is None:
+            with self._lock:
+                if (key := self._keys.get((piece_name, piece_type))) is None:
+                    key = self._keys[(piece_name, piece_type)] = PieceKey(piece_name, piece_type)
+        return key
+
+    def key(self, piece_type: Type[_T], piece_name: str | None = None) -> PieceKey[_T]:
+        """Returns handle of registered piece, resolved by `get` without looking the name and type up.
+
+        The same key is returned for the same name and type while it is referenced. Keys survive registering
+        pieces again (e.g. after `clear`, `restore` or `override`), each is bound to its piece on first use
+        after registered pieces changed.
+
+        Raises
+        ------
+        PieceNotFound
+            when the piece is not registered
+        """
+        piece_name = resolve_name(piece_name, piece_type)
+        if self._get_piece_data(piece_name, piece_type) is None:
+            raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+        return self._key(piece_name, piece_type)
+
+    def get(self, key: PieceKey[_T]) -> _T:
+        """Returns instance of piece of `key`, see `key`."""
+        version, bound = self._bound
+        if version != self._version:
+            version = self._version
+            self._bound = (version, bound := {})
+        try:
+            piece_data = bound[key.slot]
+        except KeyError:
+            piece_data = bound[key.slot] = self._get_piece_data(key.name, key.type)
+        if piece_data is None:
+            raise PieceNotFound(f"Piece {key.type} not found in registry.")
+
+        if self._tracer is not None:
+            return self._traced_get(key.name, piece_data, self._tracer)
+        if (instance := piece_data.get_instance()) is not None:
+            return instance
+        return self._get(piece_data)
+
+    def _traced_get(self, piece_name: str, piece_data: PieceData[_T], tracer: Tracer) -> _T:
+        hit = piece_data.get_instance() is not None
+        tracer.record(BEGIN, piece_name, piece_data, hit)
+        try:
+            return self._get(piece_data)
+        finally:
+            tracer.record(END, piece_name, piece_data, hit)
 
+    def _get(self, piece_data: PieceData[_T]) -> _T:
         if (instance := piece_data.get_instance()) is not None:
             return instance
+        if (lock := piece_data.lock) is None:
+            return self._create(piece_data)
 
+        with lock:
+            # another thread may have created the instance while this one was waiting
+            if (instance := piece_data.get_instance()) is not None:
+                return instance
+            return self._create(piece_data)
+
+    def _create(self, piece_data: PieceData[_T]) -> _T:
+        params = resolve_parameters(piece_data.parameters, self.get_object, self.get_collection)
+        return self._initialize(piece_data, params)
+
+    def set_executor(self, executor: Executor | None) -> None:
+        """Sets executor running constructors of `offload` pieces resolved by `aget_object`,
+        None (default) means the default executor of the running event loop.
+        """
+        self._executor = executor
+
+    async def aget_object(self, piece_name: str | None, piece_type: Type[_T]) -> _T:
+        """Asynchronous `get_object`: constructors of pieces registered with `offload=True` run in executor
+        (see `set_executor`), other pieces are created in the event loop as by `get_object`.
+
+        Concurrent resolutions of the same `UNIVERSAL` piece wait for one construction, also when the piece
+        is being created by `get_object` in another thread.
+        """
+        piece_name = resolve_name(piece_name, piece_type)
+        piece_data = self._get_piece_data(piece_name, piece_type)
+
+        if piece_data is None:
+            return resolve_provider(self, piece_name, piece_type)
+        return await self._aget(piece_data)
+
+    async def _aget(self, piece_data: PieceData[_T]) -> _T:
+        if (instance := piece_data.get_instance()) is not None:
+            return instance
+        if piece_data.scope is Scope.ORIGINAL:
+            return await self._acreate(piece_data)
+
+        with self._lock:
+            if (instance := piece_data.get_instance()) is not None:
+                return instance
+            future = self._inflight.get(piece_data)
+            owner = future is None
+            if owner:
+                future = self._inflight[piece_data] = Future()
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            instance = await self._acreate(piece_data)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(instance)
+            return instance
+        finally:
+            with self._lock:
+                del self._inflight[piece_data]
+
+    async def _acreate(self, piece_data: PieceData[_T]) -> _T:
         params: dict[str, Any] = {}
-        for param in piece_data.parameters:
-            try:
-                param_val = param.get()
-            except _NeedCalculation as e:
-                param_val = self.get_object(e.piece_name, e.piece_type)
-            params[param.name] = param_val
+        token = begin_resolution()
+        try:
+            for param in piece_data.parameters:
+                try:
+                    param_val = param.get()
+                except _NeedCalculation as e:
+                    param_val = await self.aget_object(e.piece_name, e.piece_type)
+                except _NeedCollection as e:
+                    matches = self._find_all(e.item_type)
+                    instances = {pd: await self._aget(pd) for _, pd in matches}
+                    param_val = collect(e.collection_type, matches, instances.__getitem__)
+                params[param.name] = param_val
+        finally:
+            end_resolution(token)
 
+        # held instance is created under the same lock as by `_get`, so sync and async callers create it once
+        loop, lock = asyncio.get_running_loop(), piece_data.lock
+        if piece_data.offload:
+            initialize = self._initialize if lock is None else self._initialize_once
+            return await loop.run_in_executor(self._executor, initialize, piece_data, params)
+        if lock is None:
+            return self._initialize(piece_data, params)
+        while not lock.acquire(blocking=False):
+            await loop.run_in_executor(None, _wait_for, lock)  # other thread creates the piece, wait outside loop
+        try:
+            if (instance := piece_data.get_instance()) is not None:
+                return instance
+            return self._initialize(piece_data, params)
+        finally:
+            lock.release()
+
+    def _initialize(self, piece_data: PieceData[_T], params: dict[str, Any]) -> _T:
+        if self._memory is not None:
+            return self._memory.initialize(piece_data, params)
         return piece_data.initialize(params)
 
+    def _initialize_once(self, piece_data: PieceData[_T], params: dict[str, Any]) -> _T:
+        with piece_data.lock:  # type: ignore[union-attr]
+            if (instance := piece_data.get_instance()) is not None:
+                return instance
+            return self._initialize(piece_data, params)
+
+    def _find_all(self, item_type: Type[Any]) -> tuple[tuple[str, PieceData[Any]], ...]:
+        """Returns pieces (with names) of given type or its subtypes, computed once per registry version."""
+        cached = self._matches.get(item_type)
+        if cached is not None and cached[0] == self._version and not self._pending:
+            return cached[1]
+
+        self._materialize_all()
+        version = self._version
+        matches = find_all(self.registry, item_type)
+        self._matches[item_type] = (version, matches)
+        return matches
+
+    def _type_index(self) -> TypeIndex:
+        if (types := self._types) is None:
+            with self._lock:
+                if (types := self._types) is None:
+                    types = self._types = type_index(self.registry)
+        return types
+
+    def implementation(self, piece_type: Type[_T]) -> tuple[str, PieceData[_T]]:
+        """Returns the only piece (with its name) of given type or its subtype, regardless of its name.
+
+        Registered types and their supertypes are indexed on first use and then as pieces are registered,
+        other types (e.g. protocols) are matched by scanning registered pieces.
+
+        Raises
+        ------
+        PieceNotFound
+            no piece is of the type
+        AmbiguousPieceException
+            more pieces are of the type
+        """
+        if self._pending:
+            self._materialize_all()
+        types = self._type_index()
+        if piece_type in types:
+            found = types[piece_type]
+        else:
+            matches = self._find_all(piece_type)
+            if not matches:
+                raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+            found = matches[0] if len(matches) == 1 else None
+
+        if found is None:
+            names = ", ".join(f"`{name}` ({pd.type})" for name, pd in self._find_all(piece_type))
+            raise AmbiguousPieceException(f"Piece {piece_type} has more implementations: {names}.")
+        return found
+
+    def get_by_type(self, piece_type: Type[_T]) -> _T:
+        """Returns instance of the only piece of given type or its subtype, see `implementation`."""
+        piece_name, piece_data = self.implementation(piece_type)
+        if self._tracer is not None:
+            return self._traced_get(piece_name, piece_data, self._tracer)
+        return self._get(piece_data)
+
+    def get_collection(self, collection_type: Type[Any], item_type: Type[_T]) -> Any:
+        """Returns instances of all pieces of given type in `list`, `tuple` or `dict` (keyed by piece name)."""
+        return collect(collection_type, self._find_all(item_type), self._get)
+
     def get_all_objects_by_supertype(self, super_type: Type[_T]) -> Iterator[_T]:
-        for piece_name, piece_data in self.registry.items():
-            for type_ in piece_data.keys():
-                if is_subclass(type_, super_type):
-                    yield self.get_object(piece_name, type_)
+        for piece_name, piece_data in self._find_all(super_type):
+            yield self.get_object(piece_name, piece_data.type)
 
     def get_all_objects_by_name_matching(self, name_pattern: Pattern) -> Iterator[Any]:
-        for name, data in ((name, data) for name, data in self.registry.items() if name_pattern.search(name)):
+        self._materialize_all()
+        for name, data in ((name, data) for name, data in tuple(self.registry.items()) if name_pattern.search(name)):
             for piece_data in data.values():
                 yield self.get_object(name, piece_data.type)
 
+    def _describe(self, piece_name: str, piece_data: PieceData[Any]) -> PieceDescriptor:
+        dependencies: dict[str, None] = {}
+        for param in piece_data.parameters:
+            if isinstance(param, PieceParameter):
+                dependencies[param.piece_name] = None
+            elif isinstance(param, CollectionParameter):
+                dependencies.update((name, None) for name, _ in self._find_all(param.item_type))
+        return PieceDescriptor(
+            piece_name,
+            piece_data.type,
+            piece_data.scope,
+            piece_data.init_strategy,
+            tuple(dependencies),
+            piece_data.has_instance(),
+            Provider(self, piece_data.type, piece_name),
+        )
+
+    def describe_by_supertype(self, super_type: Type[Any]) -> list[PieceDescriptor]:
+        """Describes pieces of given type or its subtypes (as `get_all_objects_by_supertype` finds them)
+        without creating any of them.
+        """
+        return [self._describe(name, pd) for name, pd in self._find_all(super_type)]
+
+    def describe_by_name_matching(self, name_pattern: Pattern) -> list[PieceDescriptor]:
+        """Describes pieces with name matching `name_pattern` without creating any of them."""
+        self._materialize_all()
+        return [
+            self._describe(name, pd)
+            for name, data in tuple(self.registry.items())
+            if name_pattern.search(name)
+            for pd in data.values()
+        ]
+
+    def _dependents(self, piece_name: str, piece_data: PieceData[Any]) -> list[tuple[str, PieceData[Any]]]:
+        """Returns pieces (with their names) that depend on given piece, directly or transitively."""
+        found: dict[PieceData[Any], str] = {}
+        stack = [(piece_name, piece_data)]
+        while stack:
+            name, pd = stack.pop()
+            for dependent_name, dependent, param in tuple(self._dependency_graph.get(name, ())):
+                if dependent in found or dependent is piece_data:
+                    continue
+                if isinstance(param, ForwardPieceParameter) and not param.evaluated:
+                    depends = True  # not resolved yet, reaches all pieces of the name (as in `reachable`)
+                else:
+                    depends = self._get_piece_data(name, param.type) is pd
+                if depends:
+                    found[dependent] = dependent_name
+                    stack.append((dependent_name, dependent))
+        return [(name, pd) for pd, name in found.items()]
+
+    def _swap(self, piece_name: str, old: PieceData[Any], new: PieceData[Any]) -> None:
+        with self._lock:
+            storage = self.registry
+            storage[piece_name] = PieceTable(new if pd is old else pd for pd in storage[piece_name].entries)
+            self._publish(storage)
+            self._untrack_dependencies(old)
+            self._track_dependencies(piece_name, new)
+
+    @contextmanager
+    def override(self, piece_name: str, piece_type: Type[_T], instance_or_factory: Any) -> Iterator[None]:
+        """Temporarily replaces a registered piece, other pieces stay untouched.
+
+        Classes and functions are used as factories (their parameters are injected), anything else
+        is used as the instance of the piece. Cached instances of pieces that depend on the replaced
+        piece are dropped for the duration of the override and put back afterwards, containers of the registry
+        drop their instances of such pieces.
+
+        Parameters
+        ----------
+        piece_name : str
+            name of the piece
+        piece_type : Type[_T]
+            type (or supertype) of the piece
+        instance_or_factory : Any
+            replacement instance, class or factory function
+        """
+        original = self._get_piece_data(piece_name, piece_type)
+        if original is None:
+            raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+
+        replacement = _override_piece_data(original, instance_or_factory)
+        dependents = [(pd, pd.get_instance()) for _, pd in self._dependents(piece_name, original)]
+
+        self._swap(piece_name, original, replacement)
+        for pd, _ in dependents:
+            pd.set_instance(None)
+        self._discard_in_containers(pd for pd, _ in dependents)
+        self._invalidate()
+        try:
+            yield
+        finally:
+            self._swap(piece_name, replacement, original)
+            for pd, instance in dependents:
+                pd.set_instance(instance)
+            self._discard_in_containers((replacement, *(pd for pd, _ in dependents)))
+            self._invalidate()
+
+    def replace(
+        self, piece_name: str, piece_type: Type[_T], instance_or_factory: Any, background: bool = False
+    ) -> "Future[None] | None":
+        """Replaces a registered piece for good, e.g. to reload configuration.
+
+        Replacement is interpreted the same way as in `override`. Only the replaced piece and pieces that
+        (transitively) depend on it are rebuilt, the rest of the registry stays untouched. New instances
+        (of pieces that were already instantiated) are built before anything is swapped in, so the registry
+        keeps serving old pieces while they are being built. Containers of the registry drop their instances
+        of the replaced piece and pieces depending on it, those are created again when requested.
+
+        Parameters
+        ----------
+        piece_name : str
+            name of the piece
+        piece_type : Type[_T]
+            type (or supertype) of the piece
+        instance_or_factory : Any
+            replacement instance, class or factory function
+        background : bool, optional
+            build new instances in a background thread, by default False
+
+        Returns
+        -------
+        Future[None] | None
+            future completed when replacement is swapped in, if `background` is True
+        """
+        original = self._get_piece_data(piece_name, piece_type)
+        if original is None:
+            raise PieceNotFound(f"Piece {piece_type} not found in registry.")
+
+        replacement = _override_piece_data(original, instance_or_factory)
+
+        if not background:
+            self._replace(piece_name, original, replacement)
+            return None
+
+        future: Future[None] = Future()
+
+        def run() -> None:
+            try:
+                self._replace(piece_name, original, replacement)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+        threading.Thread(target=run, name=f"pieceful-replace-{piece_name}", daemon=True).start()
+        return future
+
+    def _replace(self, piece_name: str, original: PieceData[Any], replacement: PieceData[Any]) -> None:
+        dependents = [pd for _, pd in self._dependents(piece_name, original)]
+        stale = {replacement: None, **dict.fromkeys(dependents)}
+        rebuild = [pd for pd in (original, *dependents) if pd.get_instance() is not None]
+
+        storage = dict(self.registry)
+        storage[piece_name] = PieceTable(replacement if pd is original else pd for pd in storage[piece_name].entries)
+        instances: dict[PieceData[Any], Any] = {}
+
+        def get_object(name: str, type_: Type[Any]) -> Any:
+            pieces = storage.get(name)
+            if pieces is None or (pd := pieces.lookup(type_)) is None:
+                return resolve_provider(self, name, type_)
+            return get(pd)
+
+        def get_collection(collection_type: Type[Any], item_type: Type[Any]) -> Any:
+            return collect(collection_type, find_all(storage, item_type), get)
+
+        def get(pd: PieceData[Any]) -> Any:
+            if pd in instances:
+                return instances[pd]
+            if pd not in stale and (instance := pd.get_instance()) is not None:
+                return instance
+            instance = pd.create(resolve_parameters(pd.parameters, get_object, get_collection))
+            if pd.scope is not Scope.ORIGINAL:
+                instances[pd] = instance
+            return instance
+
+        for pd in rebuild:
+            get(replacement if pd is original else pd)
+
+        if replacement in instances:
+            replacement.set_instance(instances[replacement])
+        self._swap(piece_name, original, replacement)
+        for pd in dependents:
+            pd.set_instance(instances.get(pd))
+        self._discard_in_containers((original, *dependents))
+        self._invalidate()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Captures registered pieces and their instances, not yet loaded blueprint pieces and profiles
+        with conditional pieces, to be brought back with `restore`.
+
+        Instances are captured without counting as access (of idle pieces), instances of `WEAK` pieces
+        are still held only weakly.
+        """
+        with self._lock:
+            storage = dict(self.registry)
+            return RegistrySnapshot(
+                storage,
+                self._frozen,
+                tuple((pd, pd._instance) for pieces in storage.values() for pd in pieces.entries),
+                self._pending,
+                self._blueprinted,
+                self._profiles,
+                tuple(self._deferred),
+                tuple(self._inactive),
+            )
+
+    def restore(self, snapshot: RegistrySnapshot) -> None:
+        """Brings registry back to the state captured by `snapshot`.
+
+        Pieces registered (or loaded from blueprint) after the snapshot are removed, instances of pieces
+        are the same as when the snapshot was taken and profiles are active as they were.
+        """
+        with self._lock:
+            self._frozen = snapshot.frozen
+            for pd, held in snapshot.instances:
+                if held is None:
+                    pd.set_instance(None)  # drops also instances of keyed piece
+                else:
+                    pd._instance = held
+            self._pending = snapshot.pending
+            self._blueprinted = snapshot.blueprinted
+            self._profiles = snapshot.profiles
+            self._deferred = list(snapshot.deferred)
+            self._inactive = list(snapshot.inactive)
+            self._publish(dict(snapshot.storage))
+            self._dependency_graph = {}
+            for name, pieces in snapshot.storage.items():
+                for pd in pieces.entries:
+                    self._track_dependencies(name, pd)
+
+    def blueprint(self) -> Blueprint:
+        """Exports picklable definitions of registered pieces (import paths of their types and constructors,
+        scopes, init strategies and parsed parameters), see `from_blueprint`.
+
+        Raises
+        ------
+        PieceIncorrectUseException
+            when type or constructor of a piece is not importable (e.g. defined in function)
+        """
+        pieces = [PieceBlueprint.of(name, pd) for name, table in tuple(self.registry.items()) for pd in table.entries]
+        pieces.extend(piece for pending in self._pending.values() for piece in pending)
+        return Blueprint(tuple(pieces))
+
+    @classmethod
+    def from_blueprint(cls, blueprint: Blueprint) -> "Registry":
+        """Creates registry with pieces of `blueprint`, see `load_blueprint`."""
+        registry = cls()
+        registry.load_blueprint(blueprint)
+        return registry
+
+    def load_blueprint(self, blueprint: Blueprint) -> None:
+        """Registers pieces of `blueprint` exported (e.g. in other process) by `blueprint`.
+
+        Modules of constructors are imported when a piece of the name is needed for the first time,
+        `EAGER` pieces are created immediately. Registrations of the blueprint pieces done by imported
+        modules (decorators) are ignored. Pieces already registered or loaded (e.g. inherited by a forked
+        worker, or a blueprint loaded twice) are skipped.
+        """
+        with self._lock:
+            if self._frozen:
+                raise PieceIncorrectUseException("Cannot load blueprint, registry is frozen.")
+            known = {(name, import_path(pd.type)) for name, table in self.registry.items() for pd in table.entries}
+            known.update((piece.name, piece.type_path) for pending in self._pending.values() for piece in pending)
+            pending = dict(self._pending)
+            loaded: list[PieceBlueprint] = []
+            for piece in blueprint.pieces:
+                if (piece.name, piece.type_path) in known:
+                    continue
+                known.add((piece.name, piece.type_path))
+                pending[piece.name] = pending.get(piece.name, ()) + (piece,)
+                loaded.append(piece)
+            self._pending = pending
+            self._blueprinted = self._blueprinted | {(piece.name, piece.type_path) for piece in loaded}
+            self._changed()
+
+        eager = [piece for piece in loaded if piece.init_strategy is InitStrategy.EAGER]
+        # lookups materialize only names missing in storage, other types of registered names are built now
+        self._materialize(piece.name for piece in loaded if piece in eager or piece.name in self.registry)
+        for piece in eager:
+            self.get_object(piece.name, resolve_path(piece.type_path))
+
+    def _materialize(self, names: Iterable[str]) -> None:
+        """Builds pending blueprint pieces of `names` (importing their modules) and publishes them,
+        checked for collisions with registered pieces as any registration (also when registry is frozen).
+        """
+        with self._materializing:
+            names = {name for name in names if name in self._pending}
+            if not names:
+                return
+            built = tuple((name, piece.build()) for name in names for piece in self._pending[name])
+
+            with self._lock:
+                self._put(built)
+                self._pending = {name: pieces for name, pieces in self._pending.items() if name not in names}
+
+    def _materialize_all(self) -> None:
+        if self._pending:
+            self._materialize(tuple(self._pending))
+
+    def provider(self, piece_type: Type[_T], piece_name: str | None = None) -> Provider[_T]:
+        """Creates callable creating instances of a piece with precompiled resolution, see `Provider`."""
+        return Provider(self, piece_type, piece_name)
+
+    def container(self) -> "Container":
+        """Creates container sharing definitions of pieces with this registry, but holding its own
+        instances of `UNIVERSAL` pieces. Pieces registered later are visible in the container too.
+        """
+        from .container import Container
+
+        container = Container(self)
+        self._containers.add(container)
+        return container
+
+    def _discard_in_containers(self, pieces: Iterable[PieceData[Any]]) -> None:
+        pieces = tuple(pieces)
+        for container in tuple(self._containers):
+            container.discard(pieces)
+
+    @property
+    def tracer(self) -> Tracer | None:
+        return self._tracer
+
+    def enable_tracing(self, capacity: int = 65_536) -> Tracer:
+        """Starts recording every `get_object` call as begin and end events, see `Tracer`.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            maximum number of kept events, by default 65536
+
+        Returns
+        -------
+        Tracer
+            tracer holding recorded events
+        """
+        if self._tracer is None or self._tracer.capacity != capacity:
+            self._tracer = Tracer(capacity)
+        return self._tracer
+
+    def disable_tracing(self) -> None:
+        self._tracer = None
+
+    def enable_memory_accounting(self) -> None:
+        """Starts attributing memory allocated by constructors to pieces, see `memory_report`.
+
+        Starts `tracemalloc` unless already tracing, which slows down all allocations.
+        """
+        if self._memory is None:
+            self._memory = MemoryAccounting()
+
+    def disable_memory_accounting(self) -> None:
+        if self._memory is not None:
+            self._memory.stop()
+            self._memory = None
+
+    def memory_report(self) -> MemoryReport:
+        """Reports memory of every piece: bytes allocated by its constructions (while memory accounting
+        was enabled), estimated deep size of its live instances and number of live instances.
+        Live `ORIGINAL` instances are tracked (weakly) only while memory accounting is enabled.
+        Reading instances for the report does not count as their access (it does not postpone `trim`).
+        """
+        return memory_report(
+            ((name, pd) for name, pieces in tuple(self.registry.items()) for pd in pieces.values()),
+            self._memory.snapshot() if self._memory is not None else {},
+        )
+
+    def trim(self, force: bool = False) -> int:
+        """Drops instances of pieces registered with `idle` that were not accessed for `idle` seconds,
+        or all of them when `force` is True (e.g. under memory pressure), also in containers of the registry.
+        Dropped pieces are created again when requested. Instances of `WEAK` pieces are dropped by garbage
+        collector when not referenced.
+
+        Returns
+        -------
+        int
+            number of dropped instances
+        """
+        now = time.monotonic()
+        dropped = sum(
+            pd.trim(now, force)
+            for table in tuple(self.registry.values())
+            for pd in table.entries
+            if isinstance(pd, IdlePieceData)
+        )
+        dropped += sum(container.trim(now, force) for container in tuple(self._containers))
+        if dropped:
+            self._invalidate()
+        return dropped
+
     def clear(self):
-        self.registry.clear()
+        with self._lock:
+            self._frozen = False
+            self._publish({})
+            self._dependency_graph = {}
+            self._matches = {}
+            self._pending = {}
+            self._blueprinted = frozenset()
+            self._profiles = _environment_profiles()
+            self._deferred = []
+            self._inactive = []
 
-    def __getitem__(self, item: str) -> dict[Type[Any], PieceData[Any]]:
-        return self.registry[item]
+    def __getitem__(self, item: str) -> PieceTable:
+        if item in self._pending:
+            self._materialize((item,))
+        return self.registry.get(item, EMPTY_TABLE)
 
 
 registry: Registry = Registry()
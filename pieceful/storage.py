@@ -0,0 +1,99 @@
+import itertools
+from typing import Any, Generic, Iterable, Iterator, Mapping, Type, TypeVar
+
+from .piece_data import PieceData
+from .typing_utils import is_subclass
+
+_T = TypeVar("_T")
+
+
+def supertypes(piece_type: Any) -> tuple[Any, ...]:
+    """Proper supertypes (from `__mro__`) of `piece_type` that `is_subclass` agrees with."""
+    return tuple(base for base in getattr(piece_type, "__mro__", ())[1:] if is_subclass(piece_type, base))
+
+
+class PieceTable(Mapping[Type[Any], PieceData[Any]]):
+    """Immutable pieces registered under one name.
+
+    Supertypes (from `__mro__`) of every registered type are precomputed, so lookups by registered type
+    or its supertype do not call `is_subclass`. Other types (protocols, generic aliases, ...)
+    fall back to scanning the entries.
+    """
+
+    __slots__ = ("entries", "_supertypes")
+
+    def __init__(self, entries: Iterable[PieceData[Any]]) -> None:
+        self.entries: tuple[PieceData[Any], ...] = tuple(entries)
+        self._supertypes: tuple[tuple[Any, ...], ...] = tuple(supertypes(pd.type) for pd in self.entries)
+
+    def lookup(self, piece_type: Type[_T]) -> PieceData[_T] | None:
+        entries = self.entries
+        for pd in entries:
+            if pd.type == piece_type:
+                return pd
+
+        supertypes = self._supertypes
+        for i in range(len(entries)):
+            if piece_type in supertypes[i]:
+                return entries[i]
+
+        for pd in entries:
+            if is_subclass(pd.type, piece_type):
+                return pd
+        return None
+
+    def __getitem__(self, key: Type[Any]) -> PieceData[Any]:
+        for pd in self.entries:
+            if pd.type == key:
+                return pd
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Type[Any]]:
+        return (pd.type for pd in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+EMPTY_TABLE = PieceTable(())
+
+Storage = Mapping[str, PieceTable]
+
+
+_SLOTS = itertools.count()
+
+
+class PieceKey(Generic[_T]):
+    """Handle of piece (name and type) resolved by `Registry.get` through its integer slot, see `Registry.key`.
+
+    Keys stay valid when pieces are registered again, registry holds them only weakly.
+    Slots are unique across registries, a key is bound to a piece on its first use in each registry version.
+    """
+
+    __slots__ = ("slot", "name", "type", "__weakref__")
+
+    def __init__(self, name: str, type: Type[_T]) -> None:
+        self.slot = next(_SLOTS)
+        self.name = name
+        self.type = type
+
+    def __repr__(self) -> str:
+        return f"PieceKey({self.name!r}, {self.type!r})"
+
+# type (or supertype) -> its only implementation with name, None when there are more of them
+TypeIndex = dict[Any, tuple[str, PieceData[Any]] | None]
+
+
+def index_types(index: TypeIndex, piece_name: str, piece_data: PieceData[Any]) -> None:
+    """Adds `piece_data` as implementation of its type and supertypes (except `object`) to `index`."""
+    for key in (piece_data.type, *supertypes(piece_data.type)):
+        if key is not object:
+            index[key] = None if key in index else (piece_name, piece_data)
+
+
+def type_index(storage: Storage) -> TypeIndex:
+    index: TypeIndex = {}
+    for name, table in storage.items():
+        for piece_data in table.entries:
+            index_types(index, name, piece_data)
+    return index
@@ -0,0 +1,112 @@
+import itertools
+import json
+import os
+from threading import get_ident
+from time import perf_counter_ns
+from typing import Any, Iterator, NamedTuple
+
+from .piece_data import PieceData
+
+BEGIN = "B"
+END = "E"
+
+
+class TraceEvent(NamedTuple):
+    seq: int
+    phase: str
+    timestamp_ns: int
+    thread_id: int
+    piece_name: str
+    piece_type: Any
+    scope: str
+    singleton_hit: bool
+
+
+def _type_name(type_: Any) -> str:
+    return getattr(type_, "__qualname__", None) or repr(type_)
+
+
+class Tracer:
+    """Records begin and end events of resolutions into a preallocated ring buffer.
+
+    When buffer is full the oldest events are overwritten, so memory stays bounded.
+    """
+
+    __slots__ = ("capacity", "_events", "_counter")
+
+    def __init__(self, capacity: int = 65_536) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._events: list[TraceEvent | None] = [None] * capacity
+        self._counter = itertools.count()
+
+    def record(self, phase: str, piece_name: str, piece_data: PieceData[Any], singleton_hit: bool) -> None:
+        seq = next(self._counter)
+        self._events[seq % self.capacity] = TraceEvent(
+            seq,
+            phase,
+            perf_counter_ns(),
+            get_ident(),
+            piece_name,
+            piece_data.type,
+            piece_data.scope.name,
+            singleton_hit,
+        )
+
+    def events(self) -> list[TraceEvent]:
+        """Returns recorded events, oldest first."""
+        return sorted((e for e in self._events if e is not None), key=lambda e: e.seq)
+
+    def clear(self) -> None:
+        self._events = [None] * self.capacity
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Returns events in Chrome Trace Event format (viewable in Perfetto or chrome://tracing)."""
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ns",
+            "traceEvents": [
+                {
+                    "name": e.piece_name,
+                    "cat": "pieceful",
+                    "ph": e.phase,
+                    "ts": e.timestamp_ns / 1000,
+                    "pid": pid,
+                    "tid": e.thread_id,
+                    "args": {"type": _type_name(e.piece_type), "scope": e.scope, "singleton_hit": e.singleton_hit},
+                }
+                for e in self.events()
+            ],
+        }
+
+    def write_chrome_trace(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def _stacks(self) -> Iterator[tuple[tuple[str, ...], int]]:
+        """Yields stack of resolved pieces and time spent (in ns) in its top piece itself."""
+        stacks: dict[int, list[list[Any]]] = {}
+        for e in self.events():
+            stack = stacks.setdefault(e.thread_id, [])
+            if e.phase == BEGIN:
+                stack.append([f"{e.piece_name}:{_type_name(e.piece_type)}", e.timestamp_ns, 0])
+                continue
+            if not stack:
+                continue  # begin event was overwritten
+            frame, start, children = stack.pop()
+            duration = e.timestamp_ns - start
+            if stack:
+                stack[-1][2] += duration
+            yield (*(f[0] for f in stack), frame), duration - children
+
+    def to_collapsed_stacks(self) -> str:
+        """Returns time spent in pieces in collapsed stack format (input of flamegraph tools), in microseconds."""
+        totals: dict[tuple[str, ...], int] = {}
+        for stack, self_time in self._stacks():
+            totals[stack] = totals.get(stack, 0) + self_time
+        return "".join(f"{';'.join(stack)} {max(ns // 1000, 1)}\n" for stack, ns in totals.items())
+
+    def write_collapsed_stacks(self, path: str | os.PathLike[str]) -> None:
+        with open(path, "w") as f:
+            f.write(self.to_collapsed_stacks())
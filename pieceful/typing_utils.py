@@ -20,6 +20,11 @@ def is_generic(cls: Type[object]) -> bool:
     return False
 
 
+def evaluate_annotation(expression: str, namespace: dict[str, Any]) -> Any:
+    """Evaluates string annotation in (module) namespace, callers keep the result (e.g. `ForwardPieceParameter`)."""
+    return eval(expression, namespace)
+
+
 def _resolve_type_alias(cls):
     while cls.__class__ is TypeAliasType:
         cls = cls.__value__
@@ -43,7 +48,7 @@ def is_subclass(cls, parent) -> bool:
         if get_origin(cls) is Annotated:
             return is_subclass(get_args(cls)[0], parent)
         if cls.__class__ is type and is_generic(parent):
-            return any(is_subclass(base, parent) for base in cls.__orig_bases__)
+            return any(is_subclass(base, parent) for base in getattr(cls, "__orig_bases__", ()))
         try:
             return issubclass(cls, parent)
         except TypeError:
@@ -0,0 +1,78 @@
+from typing import Annotated
+
+import pytest
+
+from pieceful import AllOf, Piece, PieceIncorrectUseException, Scope, inject, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Plugin:
+    pass
+
+
+def _register_plugins():
+    @Piece("first")
+    class First(Plugin):
+        pass
+
+    @Piece("second", scope=Scope.ORIGINAL)
+    class Second(Plugin):
+        pass
+
+    @Piece("other")
+    class Other:
+        pass
+
+    return First, Second
+
+
+def test_inject_all_pieces_as_list_tuple_and_dict():
+    First, Second = _register_plugins()
+
+    @Piece("host")
+    class Host:
+        def __init__(
+            self,
+            plugins: Annotated[list[Plugin], AllOf],
+            plugin_tuple: Annotated[tuple[Plugin, ...], AllOf],
+            by_name: Annotated[dict[str, Plugin], AllOf],
+        ) -> None:
+            self.plugins = plugins
+            self.plugin_tuple = plugin_tuple
+            self.by_name = by_name
+
+    host = provide(Host, "host")
+
+    assert [p.__class__ for p in host.plugins] == [First, Second]
+    assert isinstance(host.plugin_tuple, tuple) and len(host.plugin_tuple) == 2
+    assert set(host.by_name) == {"first", "second"}
+    assert host.plugins[0] is host.by_name["first"] is provide(First, "first")
+    assert host.plugins[1] is not host.by_name["second"]
+
+
+def test_matching_pieces_recomputed_after_registration():
+    _register_plugins()
+
+    @inject
+    def plugins(plugins: Annotated[list[Plugin], AllOf]):
+        return plugins
+
+    assert len(plugins()) == 2
+
+    @Piece("third")
+    class Third(Plugin):
+        pass
+
+    assert len(plugins()) == 3
+    assert len(registry.get_collection(list, Plugin)) == 3
+
+
+def test_unsupported_collection():
+    with pytest.raises(PieceIncorrectUseException):
+
+        @Piece("host")
+        class Host:
+            def __init__(self, plugins: Annotated[set[Plugin], AllOf]) -> None:
+                pass
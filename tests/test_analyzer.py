@@ -0,0 +1,120 @@
+import sys
+
+from pieceful.analyzer import analyze, analyze_files, analyze_source, build_graph
+from pieceful.inspector import inspect_registry
+
+from .setup import refresh_after  # noqa: F401
+
+APP = """
+from typing import Annotated
+from pieceful import AllOf, InitStrategy, Piece, PieceFactory, Provider, Scope, register_piece
+
+
+class Engine:
+    pass
+
+
+@Piece("engine", InitStrategy.EAGER)
+class V8(Engine):
+    pass
+
+
+@Piece("wheel", scope=Scope.ORIGINAL)
+class Wheel:
+    def __init__(self, pressure: Annotated[float, lambda: 2.2], size: int = 17) -> None:
+        pass
+
+
+class Car:
+    def __init__(
+        self,
+        engine: Annotated[Engine, "engine"],
+        wheels: Annotated[Provider[Wheel], "wheel"],
+        engines: Annotated[list[Engine], AllOf],
+    ) -> None:
+        pass
+
+
+class Garage:
+    pass
+
+
+@PieceFactory()
+def garage(car: Annotated[Car, "car"]) -> Garage:
+    pass
+
+
+register_piece(Car, "car")
+"""
+
+
+def test_static_graph_matches_runtime_registry(tmp_path, monkeypatch):
+    (tmp_path / "static_app.py").write_text(APP)
+    graph = analyze([str(tmp_path)])
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    __import__("static_app")
+    sys.modules.pop("static_app")
+    runtime = inspect_registry()
+
+    assert [(p.name, p.type, p.scope, p.init_strategy) for p in graph.pieces] == [
+        (p.name, p.type.rpartition(".")[2], p.scope, p.init_strategy) for p in runtime.pieces
+    ]
+    assert {(p.name, d.parameter) for p in graph.pieces for d in p.dependencies} == {
+        (p.name, d.parameter) for p in runtime.pieces for d in p.dependencies
+    }
+    assert graph.ok and graph.errors == []
+
+
+def test_missing_ambiguous_duplicate_and_cycle():
+    source = """
+from typing import Annotated
+from pieceful import Piece
+
+class Engine: ...
+
+@Piece("engine")
+class V8(Engine): ...
+
+@Piece("engine")
+class V12(Engine): ...
+
+@Piece("engine")
+class V12(Engine): ...
+
+@Piece("a")
+class A:
+    def __init__(self, b: Annotated["B", "b"], engine: Annotated[Engine, "engine"], x: Annotated[int, "x"]): ...
+
+@Piece("b")
+class B:
+    def __init__(self, a: Annotated[A, "a"], unannotated): ...
+"""
+    graph = build_graph([analyze_source(source, "app.py")])
+
+    assert [(p.name, d.parameter) for p, d in graph.missing] == [("a", "x")]
+    assert [(p.name, d.parameter, [c.type for c in cs]) for p, d, cs in graph.ambiguous] == [
+        ("a", "engine", ["V8", "V12", "V12"])
+    ]
+    assert [(first.type, second.type) for first, second in graph.duplicates] == [("V12", "V12")]
+    assert [[p.name for p in cycle] for cycle in graph.cycles] == [["a", "b"]]
+    assert graph.errors == ["app.py:21: parameter `unannotated` must be annotated"]
+    assert not graph.ok
+
+
+def test_pieces_are_linked_across_files_processed_in_parallel(tmp_path):
+    (tmp_path / "engines.py").write_text("class Engine: ...\nclass V8(Engine): ...\n")
+    for i in range(80):
+        (tmp_path / f"car_{i}.py").write_text(
+            "from typing import Annotated\nfrom engines import Engine\n"
+            f"class Car{i}:\n    def __init__(self, engine: Annotated[Engine, 'engine']): ...\n"
+            f"register_piece(Car{i}, 'car_{i}')\n"
+        )
+    (tmp_path / "pieces.py").write_text("from engines import V8\nregister_many([(V8, 'engine')])\n")
+
+    files = sorted(str(path) for path in tmp_path.iterdir())
+    graph = build_graph(analyze_files(files, processes=2))
+
+    assert len(graph.pieces) == 81
+    assert graph.ok and graph.errors == []
+    assert graph.to_dict()["edges"][0]["to"]["type"] == "V8"
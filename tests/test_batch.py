@@ -0,0 +1,104 @@
+import pytest
+
+from pieceful import (
+    AmbiguousPieceException,
+    InitStrategy,
+    Piece,
+    PieceNotFound,
+    Scope,
+    provide,
+    register_many,
+)
+from pieceful.registry import registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_register_many_classes_and_factories():
+    class Engine(AbstractEngine):
+        pass
+
+    class Car:
+        def __init__(self, engine: Engine) -> None:
+            self.engine = engine
+
+    def create_car(engine: Engine) -> Car:
+        return Car(engine)
+
+    register_many([Engine, (create_car, "car", InitStrategy.LAZY, Scope.ORIGINAL)])
+
+    assert provide(Car, "car").engine is provide(Engine)
+    assert provide(Car, "car") is not provide(Car, "car")
+
+
+def test_register_many_publishes_storage_once():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    version = registry.version
+    register_many([A, B])
+
+    assert registry.version == version + 1
+
+
+def test_eager_pieces_are_created_after_whole_batch():
+    created = []
+
+    class Engine:
+        pass
+
+    class Car:
+        def __init__(self, engine: Engine) -> None:
+            created.append(self)
+
+    register_many([(Car, "car", InitStrategy.EAGER), Engine])
+
+    assert len(created) == 1
+
+
+def test_ambiguous_batch_registers_nothing():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    Piece("a")(A)
+    with pytest.raises(AmbiguousPieceException):
+        register_many([(B, "b"), (A, "a"), (B, "b")])
+
+    with pytest.raises(PieceNotFound):
+        provide(B, "b")
+
+
+def test_exception_inside_batch_discards_pending_pieces():
+    class A:
+        pass
+
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            Piece("a")(A)
+            raise RuntimeError
+
+    with pytest.raises(PieceNotFound):
+        provide(A, "a")
+
+
+def test_nested_batches_publish_at_outermost_exit():
+    class A:
+        pass
+
+    class B:
+        pass
+
+    with registry.batch():
+        Piece("a")(A)
+        with registry.batch():
+            Piece("b")(B)
+        assert len(registry["b"]) == 0
+
+    assert isinstance(provide(B, "b"), B)
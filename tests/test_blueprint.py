@@ -0,0 +1,162 @@
+import multiprocessing
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated
+
+import pytest
+
+from pieceful import (
+    AllOf,
+    AmbiguousPieceException,
+    InitStrategy,
+    PieceIncorrectUseException,
+    Scope,
+    provide,
+    provide_by_type,
+    register_piece,
+)
+from pieceful.blueprint import load_blueprint
+from pieceful.registry import Registry, registry
+
+from .models import AbstractEngine, EagerEngine, LazyEngine
+from .setup import refresh_after  # noqa: F401
+
+APP = """
+from typing import Annotated
+from pieceful import Piece
+from tests.models import AbstractEngine
+
+
+@Piece("engine")
+class AppEngine(AbstractEngine):
+    pass
+
+
+@Piece("car")
+class Car:
+    def __init__(self, engine: Annotated[AbstractEngine, "engine"]) -> None:
+        self.engine = engine
+"""
+
+
+class Garage:
+    def __init__(
+        self,
+        engine: Annotated[AbstractEngine, "engine"],
+        engines: Annotated[list[AbstractEngine], AllOf],
+        size: int = 2,
+    ) -> None:
+        self.engine = engine
+        self.engines = engines
+        self.size = size
+
+
+def engine_type_name() -> str:
+    return type(provide(AbstractEngine, "engine")).__name__
+
+
+def registered_engines() -> tuple[int, str]:
+    return len(registry["engine"]), type(provide_by_type(LazyEngine)).__name__
+
+
+def test_blueprint_rebuilds_registry_without_parsing_parameters():
+    register_piece(LazyEngine, "engine")
+    register_piece(EagerEngine, "eager_engine", InitStrategy.EAGER)
+    register_piece(Garage, scope=Scope.ORIGINAL)
+
+    blueprint = pickle.loads(pickle.dumps(registry.blueprint()))
+    rebuilt = Registry.from_blueprint(blueprint)
+
+    assert set(rebuilt._pending) == {"engine", "Garage"}  # EAGER piece is created immediately
+    garage = rebuilt.get_object("Garage", Garage)
+    assert isinstance(garage.engine, LazyEngine) and garage.size == 2
+    assert {type(engine) for engine in garage.engines} == {LazyEngine, EagerEngine}
+    assert rebuilt._get_piece_data("Garage", Garage).parameters == registry._get_piece_data("Garage", Garage).parameters
+
+
+def test_modules_are_imported_when_piece_is_needed(tmp_path, monkeypatch):
+    (tmp_path / "blueprint_app.py").write_text(APP)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    __import__("blueprint_app")
+    blueprint = registry.blueprint()
+
+    registry.clear()
+    del sys.modules["blueprint_app"]
+    load_blueprint(blueprint)
+
+    assert "blueprint_app" not in sys.modules
+    car = registry.get_object("car", object)
+    assert "blueprint_app" in sys.modules  # decorators registering the same pieces again are ignored
+    assert type(car.engine).__name__ == "AppEngine"
+    assert len(registry["engine"]) == 1
+
+
+def test_piece_defined_in_function_cannot_be_exported():
+    class Local:
+        pass
+
+    register_piece(Local)
+
+    with pytest.raises(PieceIncorrectUseException):
+        registry.blueprint()
+
+
+def test_spawned_workers_load_blueprint():
+    register_piece(LazyEngine, "engine")
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, context, initializer=load_blueprint, initargs=(registry.blueprint(),)) as pool:
+        assert list(pool.map(engine_type_name, range(0))) == []
+        assert pool.submit(engine_type_name).result() == "LazyEngine"
+
+
+def test_loading_blueprint_twice_skips_registered_pieces():
+    created = []
+
+    class Counted(EagerEngine):
+        def __init__(self) -> None:
+            created.append(self)
+
+    register_piece(LazyEngine, "engine")
+    register_piece(EagerEngine, "eager_engine", InitStrategy.EAGER)
+    blueprint = registry.blueprint()
+
+    rebuilt = Registry.from_blueprint(blueprint)
+    rebuilt.load_blueprint(blueprint)
+    assert sum(len(pending) for pending in rebuilt._pending.values()) == 1
+    assert len(rebuilt["engine"]) == len(rebuilt["eager_engine"]) == 1
+
+    registry.load_blueprint(blueprint)  # pieces of the blueprint are already registered
+    assert registry._pending == {} and registry._blueprinted == frozenset()
+    assert provide_by_type(LazyEngine) is provide(AbstractEngine, "engine")
+
+
+def test_blueprint_piece_of_registered_name_is_built_immediately():
+    register_piece(LazyEngine, "engine")
+    blueprint = registry.blueprint()
+    registry.clear()
+    register_piece(EagerEngine, "engine")
+
+    registry.load_blueprint(blueprint)
+    assert registry._pending == {}
+    assert type(provide(LazyEngine, "engine")) is LazyEngine
+
+
+def test_materialized_piece_colliding_with_registered_one_is_ambiguous():
+    register_piece(LazyEngine, "engine")
+    rebuilt = Registry.from_blueprint(registry.blueprint())
+    rebuilt._put((("engine", registry._get_piece_data("engine", LazyEngine)),))
+
+    with pytest.raises(AmbiguousPieceException):
+        rebuilt._materialize(("engine",))
+    assert "engine" in rebuilt._pending and len(rebuilt.registry["engine"]) == 1
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork is not available")
+def test_forked_workers_loading_blueprint_do_not_duplicate_pieces():
+    register_piece(LazyEngine, "engine")
+
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(1, context, initializer=load_blueprint, initargs=(registry.blueprint(),)) as pool:
+        assert pool.submit(registered_engines).result() == (1, "LazyEngine")
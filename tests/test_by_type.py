@@ -0,0 +1,132 @@
+from typing import Protocol, runtime_checkable
+
+import pytest
+
+from pieceful import AmbiguousPieceException, Piece, PieceFactory, PieceNotFound, provide, provide_by_type
+from pieceful.registry import Registry, registry
+
+from .models import AbstractEngine, AbstractVehicle
+from .setup import refresh_after  # noqa: F401
+
+
+@runtime_checkable
+class Startable(Protocol):
+    def start(self) -> None: ...
+
+
+def test_provide_by_type_of_supertype():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    engine = provide_by_type(AbstractEngine)
+    assert isinstance(engine, Engine)
+    assert provide_by_type(Engine) is engine
+    assert provide(AbstractEngine, "engine") is engine
+
+
+def test_provide_by_type_of_factory_piece():
+    class Engine(AbstractEngine):
+        pass
+
+    @PieceFactory("engine")
+    def engine() -> Engine:
+        return Engine()
+
+    assert isinstance(provide_by_type(AbstractEngine), Engine)
+
+
+def test_provide_by_type_not_found():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    with pytest.raises(PieceNotFound):
+        provide_by_type(AbstractVehicle)
+
+
+def test_ambiguity_is_indexed_on_registration():
+    @Piece("diesel")
+    class Diesel(AbstractEngine):
+        pass
+
+    assert registry._type_index()[AbstractEngine] == ("diesel", registry.registry["diesel"][Diesel])
+
+    @Piece("petrol")
+    class Petrol(AbstractEngine):
+        pass
+
+    assert registry._type_index()[AbstractEngine] is None
+    with pytest.raises(AmbiguousPieceException, match="`diesel`.*`petrol`"):
+        provide_by_type(AbstractEngine)
+    assert isinstance(provide_by_type(Petrol), Petrol)
+
+
+def test_provide_by_type_of_protocol():
+    @Piece("engine")
+    class Engine:
+        def start(self) -> None: ...
+
+    @Piece("brakes")
+    class Brakes:
+        pass
+
+    assert isinstance(provide_by_type(Startable), Engine)
+
+
+def test_type_index_is_rebuilt_after_change():
+    @Piece("diesel")
+    class Diesel(AbstractEngine):
+        pass
+
+    @Piece("petrol")
+    class Petrol(AbstractEngine):
+        pass
+
+    snapshot = registry.snapshot()
+    registry.prune(["petrol"])
+    assert isinstance(provide_by_type(AbstractEngine), Petrol)
+
+    registry.restore(snapshot)
+    with pytest.raises(AmbiguousPieceException):
+        provide_by_type(AbstractEngine)
+
+    registry.clear()
+    with pytest.raises(PieceNotFound):
+        provide_by_type(AbstractEngine)
+
+
+def test_type_index_of_batch():
+    with registry.batch():
+
+        @Piece("engine")
+        class Engine(AbstractEngine):
+            pass
+
+        with pytest.raises(PieceNotFound):
+            provide_by_type(AbstractEngine)
+
+    assert isinstance(provide_by_type(AbstractEngine), Engine)
+
+    other = Registry()
+    other.add("engine", registry.registry["engine"][Engine])
+    assert isinstance(other.get_by_type(AbstractEngine), Engine)
+
+
+def test_type_index_is_built_on_first_use_and_extended_by_registrations():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    assert registry._types is None
+    assert isinstance(provide_by_type(AbstractEngine), Engine)
+    index = registry._types
+
+    @Piece("other_engine")
+    class OtherEngine(AbstractEngine):
+        pass
+
+    assert registry._types is index
+    assert isinstance(provide_by_type(OtherEngine), OtherEngine)
+    with pytest.raises(AmbiguousPieceException):
+        provide_by_type(AbstractEngine)
@@ -0,0 +1,110 @@
+import gc
+import weakref
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceNotFound, Scope, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Settings:
+    pass
+
+
+class Connection:
+    def __init__(self, settings: Annotated[Settings, "settings"]) -> None:
+        self.settings = settings
+
+
+def _register():
+    Piece("settings")(Settings)
+    Piece("connection")(Connection)
+
+
+def test_containers_hold_own_instances():
+    _register()
+    tenant_a, tenant_b = registry.container(), registry.container()
+
+    connection_a = tenant_a.provide(Connection, "connection")
+
+    assert tenant_a.get_object("connection", Connection) is connection_a
+    assert connection_a.settings is tenant_a.provide(Settings, "settings")
+    assert tenant_b.provide(Connection, "connection") is not connection_a
+    assert provide(Connection, "connection") is not connection_a
+    assert registry["connection"][Connection].get_instance() is not connection_a
+
+
+def test_container_shares_definitions():
+    _register()
+    tenant = registry.container()
+
+    @Piece("later", scope=Scope.ORIGINAL)
+    class Later:
+        pass
+
+    assert tenant.provide(Later, "later") is not tenant.provide(Later, "later")
+    with pytest.raises(PieceNotFound):
+        tenant.provide(Settings, "unknown")
+
+
+def test_container_clear():
+    _register()
+    tenant = registry.container()
+    settings = tenant.provide(Settings, "settings")
+
+    tenant.clear()
+    assert tenant.provide(Settings, "settings") is not settings
+
+
+def test_container_holds_weak_pieces_weakly():
+    created = []
+
+    @Piece("model", scope=Scope.WEAK)
+    class Model:
+        def __init__(self) -> None:
+            created.append(self)
+
+    tenant = registry.container()
+    model = tenant.provide(Model, "model")
+    assert tenant.provide(Model, "model") is model
+    assert provide(Model, "model") is not model
+
+    created.clear()
+    collected = weakref.ref(model)
+    del model
+    gc.collect()
+    assert collected() is None
+    assert created == [] and tenant.provide(Model, "model") is created[0]
+
+
+def test_trim_drops_idle_pieces_of_containers():
+    @Piece("model", idle=60)
+    class Model:
+        pass
+
+    tenant = registry.container()
+    model = tenant.provide(Model, "model")
+    assert tenant.provide(Model, "model") is model
+
+    assert registry.trim(force=True) == 1
+    assert tenant.provide(Model, "model") is not model
+
+
+def test_replace_and_override_drop_dependents_in_containers():
+    _register()
+    tenant = registry.container()
+    settings = tenant.provide(Settings, "settings")
+    connection = tenant.provide(Connection, "connection")
+    replacement = Settings()
+
+    with registry.override("settings", Settings, replacement):
+        assert tenant.provide(Connection, "connection").settings is replacement
+    assert tenant.provide(Settings, "settings") is settings
+    assert tenant.provide(Connection, "connection").settings is settings
+
+    registry.replace("settings", Settings, replacement)
+    assert tenant.provide(Connection, "connection").settings is replacement
+    assert tenant.provide(Connection, "connection") is not connection
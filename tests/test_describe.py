@@ -0,0 +1,87 @@
+from typing import Annotated
+
+from pieceful import (
+    AllOf,
+    InitStrategy,
+    Piece,
+    PieceDescriptor,
+    Scope,
+    describe_pieces_by_name,
+    describe_pieces_by_supertype,
+    provide,
+)
+from pieceful.registry import registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_describe_does_not_create_pieces():
+    created = []
+
+    @Piece("petrol_engine")
+    class PetrolEngine(AbstractEngine):
+        def __init__(self) -> None:
+            created.append(self)
+
+    @Piece("diesel_engine", scope=Scope.ORIGINAL)
+    class DieselEngine(AbstractEngine):
+        def __init__(self, other: Annotated[AbstractEngine, "petrol_engine"]) -> None:
+            created.append(self)
+
+    descriptors = {d.name: d for d in describe_pieces_by_supertype(AbstractEngine)}
+    assert created == []
+    assert descriptors["petrol_engine"] == PieceDescriptor(
+        "petrol_engine", PetrolEngine, Scope.UNIVERSAL, InitStrategy.LAZY, (), False, None  # type: ignore[arg-type]
+    )
+    diesel = descriptors["diesel_engine"]
+    assert (diesel.type, diesel.scope, diesel.dependencies) == (DieselEngine, Scope.ORIGINAL, ("petrol_engine",))
+
+
+def test_descriptor_provider_creates_on_demand():
+    created = []
+
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        def __init__(self) -> None:
+            created.append(self)
+
+    (descriptor,) = describe_pieces_by_name("^engine$")
+    assert not descriptor.instantiated and created == []
+
+    engine = descriptor.provider()
+    assert created == [engine]
+    assert descriptor.provider() is engine is provide(Engine, "engine")
+    assert describe_pieces_by_name("engine")[0].instantiated
+
+
+def test_describe_collection_dependencies():
+    @Piece("first")
+    class First(AbstractEngine):
+        pass
+
+    @Piece("second")
+    class Second(AbstractEngine):
+        pass
+
+    @Piece("garage")
+    class Garage:
+        def __init__(self, engines: Annotated[list[AbstractEngine], AllOf]) -> None:
+            self.engines = engines
+
+    (garage,) = describe_pieces_by_name("garage")
+    assert sorted(garage.dependencies) == ["first", "second"]
+    assert describe_pieces_by_name("^nothing") == []
+
+
+def test_describe_idle_piece_does_not_postpone_trim():
+    @Piece("engine", idle=60)
+    class Engine(AbstractEngine):
+        pass
+
+    provide(Engine, "engine")
+    piece_data = registry.registry["engine"].entries[0]
+    accessed = piece_data._accessed
+    (descriptor,) = describe_pieces_by_supertype(Engine)
+    assert descriptor.instantiated
+    assert piece_data._accessed == accessed
@@ -0,0 +1,141 @@
+import threading
+import time
+from typing import Annotated
+
+import pytest
+
+from pieceful import TTL, FactoryCache, Piece, Scope, provide
+from pieceful.parameters import DefaultFactoryParameter, SharedFactoryParameter
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+def counting_factory():
+    calls = []
+
+    def factory() -> int:
+        calls.append(None)
+        return len(calls)
+
+    return factory, calls
+
+
+def test_factory_is_called_for_every_construction_by_default():
+    factory, calls = counting_factory()
+
+    @Piece("piece", scope=Scope.ORIGINAL)
+    class Piece_:
+        def __init__(self, value: Annotated[int, factory]) -> None:
+            self.value = value
+
+    provide(Piece_, "piece")
+    provide(Piece_, "piece")
+
+    assert len(calls) == 2
+
+
+def test_process_cache_evaluates_factory_once_for_all_pieces():
+    factory, calls = counting_factory()
+
+    @Piece("a", scope=Scope.ORIGINAL)
+    class A:
+        def __init__(self, value: Annotated[int, factory, FactoryCache.PROCESS]) -> None:
+            self.value = value
+
+    @Piece("b", scope=Scope.ORIGINAL)
+    class B:
+        def __init__(self, value: Annotated[int, factory, FactoryCache.PROCESS]) -> None:
+            self.value = value
+
+    assert [provide(A, "a").value, provide(A, "a").value, provide(B, "b").value] == [1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_ttl_cache_evaluates_factory_again_after_expiration():
+    factory, calls = counting_factory()
+
+    @Piece("piece", scope=Scope.ORIGINAL)
+    class Piece_:
+        def __init__(self, value: Annotated[int, factory, TTL(0.05)]) -> None:
+            self.value = value
+
+    assert provide(Piece_, "piece").value == provide(Piece_, "piece").value == 1
+    time.sleep(0.06)
+    assert provide(Piece_, "piece").value == 2
+
+
+def test_resolution_cache_is_shared_within_one_resolution():
+    factory, calls = counting_factory()
+
+    @Piece("engine", scope=Scope.ORIGINAL)
+    class Engine:
+        def __init__(self, request_id: Annotated[int, factory, FactoryCache.RESOLUTION]) -> None:
+            self.request_id = request_id
+
+    @Piece("car", scope=Scope.ORIGINAL)
+    class Car:
+        def __init__(
+            self,
+            engine: Annotated[Engine, "engine"],
+            request_id: Annotated[int, factory, FactoryCache.RESOLUTION],
+        ) -> None:
+            self.engine = engine
+            self.request_id = request_id
+
+    first, second = provide(Car, "car"), provide(Car, "car")
+
+    assert first.request_id == first.engine.request_id == 1
+    assert second.request_id == second.engine.request_id == 2
+
+
+def test_cached_factory_is_evaluated_by_single_thread():
+    calls = []
+    started = threading.Barrier(8)
+
+    def slow_factory() -> int:
+        calls.append(None)
+        time.sleep(0.05)
+        return 42
+
+    @Piece("piece", scope=Scope.ORIGINAL)
+    class Piece_:
+        def __init__(self, value: Annotated[int, slow_factory, FactoryCache.PROCESS]) -> None:
+            self.value = value
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(provide(Piece_, "piece").value)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+
+
+def test_other_metadata_after_factory_is_ignored():
+    @Piece("piece")
+    class Piece_:
+        def __init__(
+            self,
+            value: Annotated[int, lambda: 1, "number of retries"],
+            shared: Annotated[list, list, "documentation", FactoryCache.PROCESS],
+        ) -> None:
+            self.value = value
+            self.shared = shared
+
+    piece = provide(Piece_, "piece")
+    assert piece.value == 1
+    value, shared = registry["piece"][Piece_].parameters
+    assert type(value) is DefaultFactoryParameter and isinstance(shared, SharedFactoryParameter)
+
+
+def test_invalid_ttl():
+    with pytest.raises(ValueError):
+        TTL(0)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Annotated, ForwardRef
+
+import pytest
+
+from pieceful import (
+    AllOf,
+    PieceException,
+    Provider,
+    Scope,
+    UnresolvableParameter,
+    inject,
+    provide,
+    register_piece,
+    register_piece_factory,
+)
+from pieceful.parameters import ForwardPieceParameter
+from pieceful.piece_data import piece_data_factory
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Car:
+    def __init__(self, engine: Annotated[Engine, "engine"], wheel: Wheel, wheels: Provider[Wheel]) -> None:
+        self.engine = engine
+        self.wheel = wheel
+        self.wheels = wheels
+
+
+class Garage:
+    def __init__(self, engines: Annotated[list[Engine], AllOf], size: Annotated[int, lambda: 2]) -> None:
+        self.engines = engines
+        self.size = size
+
+
+class Broken:
+    def __init__(self, engine: Annotated[NotDefined, "engine"]) -> None:  # noqa: F821
+        pass
+
+
+class Engine:
+    pass
+
+
+class Wheel:
+    pass
+
+
+def create_engine() -> Engine:
+    return Engine()
+
+
+def test_string_annotations_are_evaluated_on_first_resolution():
+    pd = piece_data_factory(Car, Scope.UNIVERSAL, Car)
+    engine, wheel, wheels = pd.parameters
+
+    assert all(isinstance(param, ForwardPieceParameter) for param in pd.parameters)
+    assert [param.piece_name for param in pd.parameters] == ["engine", "Wheel", "Wheel"]
+    assert engine.expression == "Engine"
+
+    register_piece_factory(create_engine, "engine")
+    register_piece(Wheel, scope=Scope.ORIGINAL)
+    register_piece(Car)
+
+    car = provide(Car)
+    assert isinstance(car.engine, Engine) and isinstance(car.wheel, Wheel)
+    assert isinstance(car.wheels(), Wheel)
+    assert engine.type is Engine and wheels.type == Provider[Wheel]
+
+
+def test_factory_and_all_of_string_annotations_are_evaluated_at_registration():
+    register_piece(Engine, "engine")
+    register_piece(Garage)
+
+    garage = provide(Garage)
+    assert [type(engine) for engine in garage.engines] == [Engine]
+    assert garage.size == 2
+
+
+def test_unresolvable_string_annotation_fails_on_resolution():
+    register_piece(Engine, "engine")
+    register_piece(Broken)
+
+    with pytest.raises(PieceException, match="NotDefined"):
+        provide(Broken)
+
+
+def test_inject_string_annotations():
+    register_piece(Engine, "engine")
+
+    @inject
+    def drive(speed: int, engine: Annotated[Engine, "engine"]) -> Engine:
+        return engine
+
+    assert drive(1) is provide(Engine, "engine")
+
+
+def test_string_return_type_of_factory():
+    def create() -> NotDefined:  # noqa: F821
+        pass
+
+    with pytest.raises(UnresolvableParameter):
+        register_piece_factory(create)
+
+
+def test_forward_ref_with_globals():
+    class Driver:
+        def __init__(self, engine: Annotated[ForwardRef("Engine"), "engine", globals()]) -> None:
+            self.engine = engine
+
+    register_piece(Engine, "engine")
+    register_piece(Driver, scope=Scope.ORIGINAL)
+
+    assert provide(Driver).engine is provide(Engine, "engine")
+
+
+def test_annotated_string_type_is_evaluated_in_module_of_constructor():
+    class Driver:
+        def __init__(self, engine) -> None:
+            self.engine = engine
+
+    Driver.__init__.__annotations__["engine"] = Annotated["Engine", "engine"]  # not postponed annotation
+    register_piece(Engine, "engine")
+    register_piece(Driver, scope=Scope.ORIGINAL)
+
+    (param,) = registry["Driver"][Driver].parameters
+    assert isinstance(param, ForwardPieceParameter) and param.namespace is globals()
+    assert provide(Driver).engine is provide(Engine, "engine")
+
+
+def test_override_and_replace_do_not_evaluate_string_annotations():
+    register_piece(Engine, "engine")
+    register_piece(Broken)
+    (param,) = registry["Broken"][Broken].parameters
+
+    with registry.override("engine", Engine, Engine()):
+        pass
+    registry.replace("engine", Engine, Engine())
+    assert not param.evaluated
+
+
+def test_string_annotations_of_reloaded_module(tmp_path, monkeypatch):
+    (tmp_path / "reloaded_pieces.py").write_text(
+        "from __future__ import annotations\n"
+        "from typing import Annotated\n"
+        "from pieceful import Piece\n"
+        "@Piece('service')\n"
+        "class Service:\n"
+        "    def __init__(self, repository: Annotated[Repository, 'repository']) -> None:\n"
+        "        self.repository = repository\n"
+        "@Piece('repository')\n"
+        "class Repository:\n"
+        "    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("reloaded_pieces")
+    try:
+        assert isinstance(provide(module.Service, "service").repository, module.Repository)
+
+        registry.clear()
+        module = importlib.reload(module)
+        assert isinstance(provide(module.Service, "service").repository, module.Repository)
+    finally:
+        sys.modules.pop("reloaded_pieces", None)
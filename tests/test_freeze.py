@@ -0,0 +1,60 @@
+from typing import Protocol, runtime_checkable
+
+import pytest
+
+from pieceful import Piece, PieceIncorrectUseException, PieceNotFound, provide
+from pieceful.registry import PieceTable, registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_lookup_miss_does_not_grow_registry():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    with pytest.raises(PieceNotFound):
+        provide(AbstractEngine, "missing_engine")
+
+    assert len(registry["missing_engine"]) == 0
+    assert set(registry.registry) == {"engine"}
+
+
+def test_frozen_registry_resolves_pieces():
+    @runtime_checkable
+    class Runnable(Protocol):
+        def run(self) -> None: ...
+
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        def run(self) -> None:
+            pass
+
+    @Piece("engine")
+    class PowerfulEngine(Engine):
+        pass
+
+    engine = provide(Engine, "engine")
+    registry.freeze()
+
+    assert isinstance(registry.registry["engine"], PieceTable)
+    assert provide(Engine, "engine") is engine
+    assert provide(AbstractEngine, "engine") is engine
+    assert provide(Runnable, "engine") is engine
+    assert provide(PowerfulEngine, "engine").__class__ is PowerfulEngine
+    assert registry["engine"][PowerfulEngine].type is PowerfulEngine
+    assert len(registry["engine"]) == 2
+
+
+def test_frozen_registry_rejects_registration():
+    registry.freeze()
+
+    with pytest.raises(PieceIncorrectUseException):
+
+        @Piece("engine")
+        class Engine(AbstractEngine):
+            pass
+
+    registry.clear()
+    assert not registry.frozen
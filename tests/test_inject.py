@@ -0,0 +1,103 @@
+import asyncio
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceNotFound, Scope, inject, provide
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_inject_fills_missing_arguments():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    def handler(request: str, engine: Annotated[AbstractEngine, "engine"], wheels: int = 4):
+        return request, engine, wheels
+
+    request, engine, wheels = handler("req")
+
+    assert request == "req"
+    assert engine is provide(Engine, "engine")
+    assert wheels == 4
+
+
+def test_inject_keeps_supplied_arguments():
+    @Piece()
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    def handler(engine: Annotated[AbstractEngine, "Engine"], *, other: Engine):
+        return engine, other
+
+    supplied = Engine()
+    assert handler(supplied, other=supplied) == (supplied, supplied)
+    assert handler(engine=supplied)[1] is provide(Engine)
+
+
+def test_inject_original_scope_creates_new_instances():
+    @Piece("engine", scope=Scope.ORIGINAL)
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    def handler(engine: Annotated[AbstractEngine, "engine"]):
+        return engine
+
+    assert handler() is not handler()
+
+
+def test_inject_universal_cache_invalidated_by_registry_change():
+    from pieceful.registry import registry
+
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    def handler(engine: Annotated[AbstractEngine, "engine"]):
+        return engine
+
+    first = handler()
+    assert handler() is first
+
+    registry.clear()
+    with pytest.raises(PieceNotFound):
+        handler()
+
+
+def test_inject_passes_held_pieces_until_registry_changes():
+    from pieceful.registry import registry
+
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    def handler(request: str, speed: int | None, engine: Annotated[AbstractEngine, "engine"]):
+        return engine
+
+    engine = handler("req", speed=1)
+    assert handler("req", None) is engine and handler("req", None) is engine
+    fake = Engine()
+    with registry.override("engine", Engine, fake):
+        assert handler("req", None) is fake
+        assert handler("req", speed=None) is fake
+    assert handler("req", None) is engine
+    assert handler("req", None, engine=fake) is fake
+
+
+def test_inject_async_function():
+    @Piece("engine")
+    class Engine(AbstractEngine):
+        pass
+
+    @inject
+    async def handler(engine: Annotated[AbstractEngine, "engine"]):
+        return engine
+
+    assert asyncio.run(handler()) is provide(Engine, "engine")
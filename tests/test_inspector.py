@@ -0,0 +1,119 @@
+import json
+from typing import Annotated
+
+from pieceful import AllOf, InitStrategy, Piece, Scope
+from pieceful.inspector import inspect_registry, load, main, warm_up
+
+from .setup import refresh_after  # noqa: F401
+
+APP = '''
+from typing import Annotated
+from pieceful import InitStrategy, Piece
+
+class Engine:
+    pass
+
+@Piece("engine", InitStrategy.EAGER)
+class V8(Engine):
+    pass
+
+@Piece("car")
+class Car:
+    def __init__(self, engine: Annotated[Engine, "engine"]) -> None:
+        self.engine = engine
+'''
+
+
+def test_inspect_registry_reports_pieces_and_unresolved_dependencies():
+    class Engine:
+        pass
+
+    @Piece("engine", InitStrategy.EAGER)
+    class V8(Engine):
+        pass
+
+    @Piece("car", scope=Scope.ORIGINAL)
+    class Car:
+        def __init__(
+            self,
+            engine: Annotated[Engine, "engine"],
+            engines: Annotated[list[Engine], AllOf],
+            driver: Annotated[object, "driver"],
+        ) -> None:
+            pass
+
+    report = inspect_registry()
+    engine, car = report.pieces
+
+    assert (engine.name, engine.scope, engine.init_strategy) == ("engine", "UNIVERSAL", "EAGER")
+    assert (car.name, car.scope, car.init_strategy) == ("car", "ORIGINAL", "LAZY")
+    assert [(edge.parameter, edge.piece_name, edge.resolved) for edge in car.dependencies] == [
+        ("engine", "engine", True),
+        ("engines", "engine", True),
+        ("driver", "driver", False),
+    ]
+    assert [(name, edge.parameter) for name, edge in report.unresolved] == [("car", "driver")]
+
+
+def test_warm_up_records_time_and_errors_per_piece():
+    @Piece("ok")
+    class Ok:
+        pass
+
+    @Piece("broken")
+    class Broken:
+        def __init__(self, missing: Annotated[int, "missing"]) -> None:
+            pass
+
+    ok, broken = warm_up(inspect_registry()).pieces
+
+    assert ok.warmup_ms is not None and ok.error is None
+    assert broken.warmup_ms is None and broken.error.startswith("PieceNotFound")
+
+
+def test_main_imports_modules_and_prints_json(tmp_path, monkeypatch, capsys):
+    (tmp_path / "inspected_app.py").write_text(APP)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert main(["inspected_app", "--format", "json", "--warmup", "--strict"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert [piece["name"] for piece in report["pieces"]] == ["engine", "car"]
+    assert report["unresolved"] == []
+    assert set(report["timings_ms"]) == {"import", "registration", "eager", "warmup"}
+    assert report["timings_ms"]["eager"] > 0
+
+
+def test_unresolvable_string_annotation_is_unresolved_dependency(tmp_path, monkeypatch, capsys):
+    (tmp_path / "inspected_typo.py").write_text(
+        "from typing import Annotated\n"
+        "from pieceful import Piece\n"
+        "@Piece('car')\n"
+        "class Car:\n"
+        "    def __init__(self, engine: 'Annotated[Engnie, \"engine\"]') -> None:\n"
+        "        pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert main(["inspected_typo", "--strict"]) == 1
+    assert "engine->engine (!)" in capsys.readouterr().out
+    ((name, edge),) = load(["inspected_typo"]).unresolved
+    assert (name, edge.type, edge.resolved) == ("car", "Engnie", False)
+
+
+def test_load_attributes_module_level_construction_to_import(tmp_path, monkeypatch):
+    (tmp_path / "inspected_script.py").write_text(
+        "import time\n"
+        "from pieceful import Piece, provide\n"
+        "@Piece('settings')\n"
+        "class Settings:\n"
+        "    def __init__(self) -> None:\n"
+        "        time.sleep(0.02)\n"
+        "settings = provide(Settings, 'settings')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    report = load(["inspected_script"])
+    assert report.registration_ms >= 0
+    assert report.eager_ms == 0
+    assert report.import_ms >= 20
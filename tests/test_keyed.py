@@ -0,0 +1,218 @@
+import threading
+import time
+from typing import Annotated
+
+import pytest
+
+from pieceful import (
+    Key,
+    Keyed,
+    KeyedStats,
+    Piece,
+    PieceFactory,
+    PieceIncorrectUseException,
+    PieceNotFound,
+    Scope,
+    provide,
+    register_piece_factory,
+)
+from pieceful.registry import Registry, registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Settings:
+    host = "db.local"
+
+
+class Connection:
+    def __init__(self, shard: str, settings: Settings) -> None:
+        self.shard = shard
+        self.settings = settings
+        self.closed = False
+
+
+def _register(policy: Keyed, created: list[str] | None = None) -> None:
+    Piece("settings")(Settings)
+
+    @PieceFactory("connection", keyed=policy)
+    def create_connection(shard: Annotated[str, Key], settings: Annotated[Settings, "settings"]) -> Connection:
+        if created is not None:
+            created.append(shard)
+        return Connection(shard, settings)
+
+
+def connection(shard: Annotated[str, Key], settings: Annotated[Settings, "settings"]) -> Connection:
+    return Connection(shard, settings)
+
+
+def test_instance_per_key():
+    _register(Keyed())
+
+    first = provide(Connection, "connection", key="shard-1")
+    assert first.shard == "shard-1"
+    assert first.settings is provide(Settings, "settings")
+    assert provide(Connection, "connection", key="shard-1") is first
+    assert provide(Connection, "connection", key="shard-2") is not first
+    assert registry.keyed_stats(Connection, "connection") == KeyedStats(size=2, hits=1, misses=2, evictions=0)
+
+
+def test_lru_eviction_calls_callback():
+    evicted = []
+    _register(Keyed(max_size=2, on_evict=lambda key, connection: evicted.append(key)))
+
+    for key in ("a", "b", "a", "c"):
+        provide(Connection, "connection", key=key)
+
+    assert evicted == ["b"]
+    stats = registry.keyed_stats(Connection, "connection")
+    assert (stats.size, stats.hits, stats.misses, stats.evictions) == (2, 1, 3, 1)
+
+
+def test_ttl_expiration():
+    created: list[str] = []
+    _register(Keyed(ttl=0.05), created)
+
+    first = provide(Connection, "connection", key="a")
+    assert provide(Connection, "connection", key="a") is first
+    time.sleep(0.06)
+    assert provide(Connection, "connection", key="a") is not first
+    assert created == ["a", "a"]
+    assert registry.keyed_stats(Connection, "connection").evictions == 1
+
+
+def test_evict():
+    closed = []
+    _register(Keyed(on_evict=lambda key, connection: closed.append(key)))
+    for key in ("a", "b", "c"):
+        provide(Connection, "connection", key=key)
+
+    registry.evict(Connection, "connection", "b")
+    assert closed == ["b"]
+    registry.evict(Connection, "connection")
+    assert sorted(closed) == ["a", "b", "c"]
+    assert registry.keyed_stats(Connection, "connection").size == 0
+
+
+def test_concurrent_requests_of_key_share_construction():
+    created: list[str] = []
+    barrier = threading.Barrier(8)
+
+    @PieceFactory("slow", keyed=Keyed())
+    def slow(key: Annotated[str, Key]) -> Connection:
+        created.append(key)
+        time.sleep(0.05)
+        return Connection(key, Settings())
+
+    def request():
+        barrier.wait()
+        return provide(Connection, "slow", key="a")
+
+    threads_results: list[Connection] = []
+    threads = [threading.Thread(target=lambda: threads_results.append(request())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert created == ["a"]
+    assert all(connection is threads_results[0] for connection in threads_results)
+
+
+def test_keyed_piece_requires_key():
+    _register(Keyed())
+
+    with pytest.raises(PieceIncorrectUseException, match="keyed"):
+        provide(Connection, "connection")
+    with pytest.raises(PieceIncorrectUseException, match="not keyed"):
+        provide(Settings, "settings", key="a")
+    with pytest.raises(PieceNotFound):
+        provide(Connection, "missing", key="a")
+
+
+def test_invalid_keyed_pieces():
+    with pytest.raises(PieceIncorrectUseException, match="exactly one"):
+
+        @Piece("no_key", keyed=Keyed())
+        class NoKey:
+            pass
+
+    with pytest.raises(PieceIncorrectUseException, match="UNIVERSAL"):
+
+        @Piece("original", scope=Scope.ORIGINAL, keyed=Keyed())
+        class Original:
+            def __init__(self, key: Annotated[str, Key]) -> None: ...
+
+    with pytest.raises(PieceIncorrectUseException, match="receives key"):
+
+        @Piece("not_keyed")
+        class NotKeyed:
+            def __init__(self, key: Annotated[str, Key]) -> None: ...
+
+        provide(NotKeyed, "not_keyed")
+
+    with pytest.raises(ValueError):
+        Keyed(max_size=0)
+
+
+def test_keyed_piece_from_blueprint():
+    Piece("settings")(Settings)
+    register_piece_factory(connection, keyed=Keyed(max_size=1))
+
+    other = Registry.from_blueprint(registry.blueprint())
+    first = other.get_keyed("connection", Connection, "a")
+    assert first.shard == "a"
+    assert other.get_keyed("connection", Connection, "a") is first
+    assert other.get_keyed("connection", Connection, "b").settings is other.get_object("settings", Settings)
+    assert other.keyed_stats(Connection, "connection").evictions == 1
+
+
+def test_keyed_piece_in_container():
+    _register(Keyed())
+    tenant = registry.container()
+
+    connection = tenant.provide(Connection, "connection", key="shard-1")
+    assert tenant.provide(Connection, "connection", key="shard-1") is connection
+    assert connection is not provide(Connection, "connection", key="shard-1")
+    assert connection.settings is tenant.provide(Settings, "settings")
+
+    with pytest.raises(PieceIncorrectUseException, match="key"):
+        tenant.provide(Connection, "connection")
+
+
+def test_replace_and_override_evict_instances_built_from_replaced_piece():
+    evicted = []
+    _register(Keyed(on_evict=lambda key, connection: evicted.append(key)))
+    old = provide(Connection, "connection", key="shard-1")
+
+    class Replica(Settings):
+        host = "replica.local"
+
+    with registry.override("settings", Settings, Replica()):
+        assert provide(Connection, "connection", key="shard-1").settings.host == "replica.local"
+    assert evicted == ["shard-1", "shard-1"]
+    assert provide(Connection, "connection", key="shard-1").settings.host == "db.local"
+
+    registry.replace("settings", Settings, Replica())
+    connection = provide(Connection, "connection", key="shard-1")
+    assert connection is not old and connection.settings.host == "replica.local"
+
+
+def test_override_keyed_piece_keeps_it_keyed():
+    evicted = []
+    _register(Keyed(max_size=1, on_evict=lambda key, connection: evicted.append(key)))
+    fake = Connection("fake", Settings())
+
+    def replica(shard: Annotated[str, Key]) -> Connection:
+        return Connection(f"replica-{shard}", Settings())
+
+    with registry.override("connection", Connection, fake):
+        assert provide(Connection, "connection", key="shard-1") is fake
+        assert provide(Connection, "connection", key="shard-2") is fake
+    assert evicted == []
+
+    with registry.override("connection", Connection, replica):
+        assert provide(Connection, "connection", key="shard-1").shard == "replica-shard-1"
+        provide(Connection, "connection", key="shard-2")
+        assert evicted == ["shard-1"]  # max_size of the original policy
+    assert provide(Connection, "connection", key="shard-1").shard == "shard-1"
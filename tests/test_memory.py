@@ -0,0 +1,93 @@
+import json
+import threading
+from typing import Annotated
+
+from pieceful import Piece, Scope, provide
+from pieceful.memory import deep_sizeof
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Table:
+    def __init__(self) -> None:
+        self.rows = [bytearray(1_000) for _ in range(100)]
+
+
+class Row:
+    pass
+
+
+class Service:
+    def __init__(self, table: Annotated[Table, "table"]) -> None:
+        self.table = table
+
+
+def test_memory_report():
+    Piece("table")(Table)
+    Piece("row", scope=Scope.ORIGINAL)(Row)
+    Piece("service")(Service)
+
+    registry.enable_memory_accounting()
+    try:
+        provide(Service, "service")
+        rows = [provide(Row, "row") for _ in range(3)]
+        del rows[0]
+        report = registry.memory_report()
+    finally:
+        registry.disable_memory_accounting()
+
+    pieces = {piece.name: piece for piece in report.pieces}
+
+    assert pieces["table"].allocated_bytes >= 100_000
+    assert pieces["table"].retained_bytes >= 100_000
+    assert pieces["service"].retained_bytes < 1_000  # table is accounted to its own piece
+    assert pieces["row"].constructions == 3
+    assert pieces["row"].live_instances == 2
+    assert report.live_instances == 4
+    assert report.retained_bytes == sum(piece.retained_bytes for piece in report.pieces)
+    assert json.loads(report.to_json())["pieces"][0]["name"] == "table"
+
+
+def test_memory_report_without_accounting():
+    Piece("table")(Table)
+    provide(Table, "table")
+
+    (table,) = registry.memory_report().pieces
+
+    assert table.allocated_bytes == 0
+    assert table.live_instances == 1
+    assert table.retained_bytes > 0
+
+
+def test_memory_report_does_not_postpone_trim():
+    Piece("table", idle=60)(Table)
+    provide(Table, "table")
+    piece_data = registry["table"][Table]
+    accessed = piece_data._accessed
+
+    (table,) = registry.memory_report().pieces
+    assert table.live_instances == 1
+    assert piece_data._accessed == accessed
+
+
+def test_memory_accounting_counts_concurrent_constructions():
+    Piece("row", scope=Scope.ORIGINAL)(Row)
+    registry.enable_memory_accounting()
+    try:
+        threads = [threading.Thread(target=lambda: [provide(Row, "row") for _ in range(200)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        (row,) = registry.memory_report().pieces
+    finally:
+        registry.disable_memory_accounting()
+
+    assert row.constructions == 1_600
+
+
+def test_deep_sizeof_excludes_given_objects():
+    shared = bytearray(10_000)
+    assert deep_sizeof([shared]) > 10_000
+    assert deep_sizeof([shared], {id(shared)}) < 10_000
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated
+
+import pytest
+
+from pieceful import AllOf, Piece, PieceFactory, PieceNotFound, Scope, aprovide, provide
+from pieceful.registry import registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_offloaded_constructor_runs_in_executor():
+    threads: dict[str, int] = {}
+
+    @Piece("config")
+    class Config:
+        def __init__(self) -> None:
+            threads["config"] = threading.get_ident()
+
+    @Piece("client", offload=True)
+    class Client:
+        def __init__(self, config: Annotated[Config, "config"]) -> None:
+            threads["client"] = threading.get_ident()
+            self.config = config
+
+    async def main():
+        return threading.get_ident(), await aprovide(Client, "client")
+
+    loop_thread, client = asyncio.run(main())
+    assert threads["config"] == loop_thread
+    assert threads["client"] != loop_thread
+    assert client is provide(Client, "client")
+    assert client.config is provide(Config, "config")
+
+
+def test_concurrent_awaiters_share_construction():
+    created = []
+
+    @PieceFactory("engine", offload=True)
+    def engine() -> AbstractEngine:
+        time.sleep(0.05)
+        created.append(object())
+        return AbstractEngine()
+
+    async def main():
+        return await asyncio.gather(*(aprovide(AbstractEngine, "engine") for _ in range(10)))
+
+    engines = asyncio.run(main())
+    assert len(created) == 1
+    assert all(engine is engines[0] for engine in engines)
+
+
+def test_original_scope_is_created_for_each_call():
+    @Piece("request", scope=Scope.ORIGINAL, offload=True)
+    class Request:
+        pass
+
+    async def main():
+        return await asyncio.gather(aprovide(Request, "request"), aprovide(Request, "request"))
+
+    first, second = asyncio.run(main())
+    assert first is not second
+
+
+def test_event_loop_is_not_blocked():
+    @Piece("slow", offload=True)
+    class Slow:
+        def __init__(self) -> None:
+            time.sleep(0.2)
+
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(aprovide(Slow, "slow"), ticker())
+
+    asyncio.run(main())
+    assert ticks[-1] - ticks[0] < 0.15
+
+
+def test_collection_and_custom_executor():
+    @Piece("diesel", offload=True)
+    class Diesel(AbstractEngine):
+        pass
+
+    @Piece("petrol")
+    class Petrol(AbstractEngine):
+        pass
+
+    @Piece("garage")
+    class Garage:
+        def __init__(self, engines: Annotated[list[AbstractEngine], AllOf]) -> None:
+            self.engines = engines
+
+    with ThreadPoolExecutor(1, thread_name_prefix="pieces") as executor:
+        registry.set_executor(executor)
+        try:
+            garage = asyncio.run(aprovide(Garage, "garage"))
+        finally:
+            registry.set_executor(None)
+
+    assert sorted(type(engine).__name__ for engine in garage.engines) == ["Diesel", "Petrol"]
+
+
+def test_failed_construction_is_raised_to_all_awaiters():
+    attempts = []
+
+    @PieceFactory("engine", offload=True)
+    def engine() -> AbstractEngine:
+        attempts.append(1)
+        time.sleep(0.02)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(*(aprovide(AbstractEngine, "engine") for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert [str(error) for error in errors] == ["boom"] * 3
+    assert len(attempts) == 1
+    with pytest.raises(PieceNotFound):
+        asyncio.run(aprovide(AbstractEngine, "missing"))
@@ -0,0 +1,92 @@
+import gc
+import weakref
+
+import pytest
+
+from pieceful import Piece, PieceKey, PieceNotFound, Scope, provide, register_piece, register_piece_factory
+from pieceful.piece_data import piece_data_factory
+from pieceful.registry import Registry, registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+class Engine(AbstractEngine):
+    pass
+
+
+def test_registration_returns_key():
+    key = register_piece(Engine, "engine")
+
+    assert isinstance(key, PieceKey)
+    assert (key.name, key.type) == ("engine", Engine)
+    assert registry.get(key) is provide(Engine, "engine")
+
+
+def test_key_lookup_by_supertype():
+    register_piece(Engine, "engine")
+
+    key = registry.key(AbstractEngine, "engine")
+    assert key is registry.key(AbstractEngine, "engine")
+    assert key is not registry.key(Engine, "engine")
+    assert isinstance(registry.get(key), Engine)
+
+
+def test_key_of_unknown_piece():
+    with pytest.raises(PieceNotFound):
+        registry.key(Engine, "engine")
+
+
+def test_key_survives_registering_again():
+    def engine() -> AbstractEngine:
+        return Engine()
+
+    key = register_piece_factory(engine, scope=Scope.ORIGINAL)
+    first = registry.get(key)
+    assert registry.get(key) is not first
+
+    registry.clear()
+    with pytest.raises(PieceNotFound):
+        registry.get(key)
+
+    register_piece(Engine, "engine")
+    assert isinstance(registry.get(key), Engine)
+
+
+def test_key_follows_override():
+    key = register_piece(Engine, "engine")
+    fake = Engine()
+
+    with registry.override("engine", Engine, fake):
+        assert registry.get(key) is fake
+    assert registry.get(key) is not fake
+
+
+def test_keys_created_after_binding():
+    other = Registry()
+    first = other._key("first", Engine)
+    with pytest.raises(PieceNotFound):
+        other.get(first)
+
+    second = other._key("second", Engine)
+    assert first.slot != second.slot
+    other.add("second", piece_data_factory(Engine, Scope.UNIVERSAL, Engine))
+    assert isinstance(other.get(second), Engine)
+
+
+def test_keys_are_held_weakly_and_bindings_released_on_clear():
+    @Piece("engine")
+    class Local(AbstractEngine):
+        pass
+
+    assert len(registry._keys) == 0  # decorators do not create keys
+    key = registry.key(Local, "engine")
+    registry.get(key)
+    assert key.slot in registry._bound[1]
+
+    registry.clear()
+    assert registry._bound[1] == {}
+    key_ref = weakref.ref(key)
+    del key
+    gc.collect()
+    assert key_ref() is None and len(registry._keys) == 0
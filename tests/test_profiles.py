@@ -0,0 +1,101 @@
+from typing import Annotated
+
+import pytest
+
+from pieceful import InitStrategy, Piece, PieceFactory, PieceIncorrectUseException, PieceNotFound, provide
+from pieceful.registry import Registry, registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def test_conditional_pieces_are_stubs_until_activation():
+    created = []
+
+    @Piece("engine", InitStrategy.EAGER, profiles="worker")
+    class WorkerEngine(AbstractEngine):
+        def __init__(self, unparsed) -> None:  # would fail parsing if it was parsed
+            created.append(self)
+
+    @Piece("engine", InitStrategy.EAGER, profiles=["api", "cron"])
+    class ApiEngine(AbstractEngine):
+        def __init__(self) -> None:
+            created.append(self)
+
+    assert created == []
+    assert [stub.name for stub in registry.inactive_pieces] == ["engine", "engine"]
+    with pytest.raises(PieceNotFound):
+        provide(AbstractEngine, "engine")
+
+    registry.activate("api")
+
+    assert [type(engine) for engine in created] == [ApiEngine]
+    assert provide(AbstractEngine, "engine") is created[0]
+    assert [stub.type for stub in registry.inactive_pieces] == [WorkerEngine]
+
+
+def test_pieces_registered_after_activation_are_evaluated_immediately():
+    registry.activate("worker")
+    checks = []
+
+    def enabled() -> bool:
+        checks.append(None)
+        return True
+
+    @Piece("engine", profiles="!api", condition=enabled)
+    class Engine(AbstractEngine):
+        pass
+
+    @PieceFactory("other", profiles="api")
+    def other() -> Engine:
+        return Engine()
+
+    assert isinstance(provide(AbstractEngine, "engine"), Engine)
+    assert len(checks) == 1
+    with pytest.raises(PieceNotFound):
+        provide(Engine, "other")
+
+
+def test_activation_inside_batch_registers_with_the_batch():
+    created = []
+
+    class Wheel:
+        pass
+
+    with registry.batch():
+
+        @Piece("engine", InitStrategy.EAGER, profiles="api")
+        class Engine(AbstractEngine):
+            def __init__(self, wheel: Annotated[Wheel, "wheel"]) -> None:
+                created.append(self)
+
+        registry.activate("api")
+        assert created == [] and "engine" not in registry.registry
+        Piece("wheel")(Wheel)  # EAGER engine depends on piece registered later in the batch
+
+    assert [type(engine) for engine in created] == [Engine]
+
+
+def test_condition_without_profiles():
+    registry.activate()
+
+    @Piece("on", condition=lambda: True)
+    class On:
+        pass
+
+    @Piece("off", condition=lambda: False)
+    class Off:
+        pass
+
+    assert isinstance(provide(On, "on"), On)
+    with pytest.raises(PieceNotFound):
+        provide(Off, "off")
+
+
+def test_profiles_from_environment_and_single_activation(monkeypatch):
+    monkeypatch.setenv("PIECEFUL_PROFILES", "api, cron")
+    other = Registry()
+
+    assert other.profiles == frozenset({"api", "cron"})
+    with pytest.raises(PieceIncorrectUseException):
+        other.activate("worker")
@@ -0,0 +1,136 @@
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceNotFound, Provider, Scope, inject, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Settings:
+    pass
+
+
+class Request:
+    def __init__(self, settings: Annotated[Settings, "settings"], retries: int = 3) -> None:
+        self.settings = settings
+        self.retries = retries
+
+
+class Client:
+    def __init__(self, requests: Annotated[Provider[Request], "request"]) -> None:
+        self.requests = requests
+
+
+def _register():
+    Piece("settings")(Settings)
+    Piece("request", scope=Scope.ORIGINAL)(Request)
+    Piece("client")(Client)
+
+
+def test_injected_provider_creates_original_instances():
+    _register()
+    client = provide(Client, "client")
+
+    first, second = client.requests(), client.requests()
+
+    assert isinstance(first, Request) and first is not second
+    assert first.settings is second.settings is provide(Settings, "settings")
+    assert first.retries == 3
+
+
+def test_provider_many():
+    _register()
+    requests = registry.provider(Request, "request").many(5)
+
+    assert len({id(r) for r in requests}) == 5
+    assert len({id(r.settings) for r in requests}) == 1
+
+
+def test_provider_of_universal_piece_returns_instance():
+    _register()
+    provider = registry.provider(Settings, "settings")
+
+    assert provider() is provider() is provide(Settings, "settings")
+    assert provider.many(2) == [provider(), provider()]
+
+
+def test_provider_nested_original_dependencies():
+    _register()
+
+    @Piece("batch", scope=Scope.ORIGINAL)
+    class Batch:
+        def __init__(self, request: Annotated[Request, "request"]) -> None:
+            self.request = request
+
+    batches = registry.provider(Batch, "batch").many(2)
+    assert batches[0].request is not batches[1].request
+
+
+def test_provider_auto_name_and_recompilation():
+    @Piece(scope=Scope.ORIGINAL)
+    class Engine:
+        pass
+
+    @Piece()
+    class Car:
+        def __init__(self, engines: Provider[Engine]) -> None:
+            self.engines = engines
+
+    provider = provide(Car).engines
+    assert isinstance(provider(), Engine)
+
+    with registry.override("Engine", Engine, lambda: "fake"):
+        assert provider() == "fake"
+
+
+def test_provider_of_unknown_piece():
+    with pytest.raises(PieceNotFound):
+        registry.provider(Settings, "settings")
+
+
+def test_provider_injected_into_function():
+    _register()
+
+    @inject
+    def handle(requests: Annotated[Provider[Request], "request"]) -> Request:
+        return requests()
+
+    first, second = handle(), handle()
+    assert isinstance(first, Request) and first is not second
+
+
+def test_provider_injected_in_container_creates_from_container():
+    _register()
+    tenant = registry.container()
+
+    client = tenant.provide(Client, "client")
+    request = client.requests()
+
+    assert request.settings is tenant.provide(Settings, "settings")
+    assert request.settings is not provide(Settings, "settings")
+
+
+def test_replace_rebuilds_piece_with_provider_parameter():
+    class Config:
+        def __init__(self, version: int = 1) -> None:
+            self.version = version
+
+    class Service:
+        def __init__(
+            self, config: Annotated[Config, "config"], requests: Annotated[Provider[Request], "request"]
+        ) -> None:
+            self.config = config
+            self.requests = requests
+
+    _register()
+    Piece("config")(Config)
+    Piece("service")(Service)
+    assert provide(Service, "service").config.version == 1
+
+    registry.replace("config", Config, Config(2))
+
+    service = provide(Service, "service")
+    assert service.config.version == 2
+    assert isinstance(service.requests(), Request)
@@ -0,0 +1,138 @@
+import gc
+import weakref
+from typing import Annotated
+
+import pytest
+
+from pieceful import AllOf, InitStrategy, Piece, PieceNotFound, Provider, get_pieces_by_supertype, provide
+from pieceful.registry import registry
+
+from .models import AbstractEngine
+from .setup import refresh_after  # noqa: F401
+
+
+def register_graph():
+    class Wheel:
+        pass
+
+    @Piece("engine")
+    class V8(AbstractEngine):
+        pass
+
+    @Piece("engine")
+    class V12(AbstractEngine):
+        pass
+
+    @Piece("wheel")
+    class SpareWheel(Wheel):
+        pass
+
+    @Piece("car")
+    class Car:
+        def __init__(self, engine: Annotated[V8, "engine"], wheels: Annotated[Provider[Wheel], "wheel"]) -> None:
+            self.engine = engine
+
+    @Piece("garage")
+    class Garage:
+        def __init__(self, engines: Annotated[list[AbstractEngine], AllOf]) -> None:
+            self.engines = engines
+
+    @Piece("unused")
+    class Unused:
+        pass
+
+    return V8, V12, Car, Garage
+
+
+def test_prune_removes_unreachable_pieces():
+    V8, V12, Car, Garage = register_graph()
+    provide(V12, "engine")
+
+    removed = registry.prune(["car"])
+
+    assert sorted((stub.name, stub.type.__name__) for stub in removed) == [
+        ("engine", "V12"),
+        ("garage", "Garage"),
+        ("unused", "Unused"),
+    ]
+    assert set(registry.registry) == {"engine", "wheel", "car"}
+    assert [pd.type for pd in registry["engine"].entries] == [V8]
+    assert isinstance(provide(Car, "car").engine, V8)
+    with pytest.raises(PieceNotFound):
+        provide(V12, "engine")
+
+
+def test_collections_reach_all_matching_pieces():
+    V8, V12, Car, Garage = register_graph()
+
+    removed = registry.prune([("garage", Garage)])
+
+    assert sorted(stub.name for stub in removed) == ["car", "unused", "wheel"]
+    assert len(provide(Garage, "garage").engines) == 2
+
+
+def test_prune_inside_batch_skips_eager_construction():
+    created = []
+
+    with registry.batch():
+
+        @Piece("used", InitStrategy.EAGER)
+        class Used:
+            def __init__(self) -> None:
+                created.append(self)
+
+        @Piece("unused", InitStrategy.EAGER)
+        class Unused:
+            def __init__(self) -> None:
+                created.append(self)
+
+        assert [stub.name for stub in registry.prune(["used"])] == ["unused"]
+
+    assert [type(piece) for piece in created] == [Used]
+    assert set(registry.registry) == {"used"}
+
+
+def test_unknown_root():
+    register_graph()
+
+    with pytest.raises(PieceNotFound):
+        registry.prune(["missing"])
+    assert len(registry.registry) == 5
+
+
+def test_pruned_instances_are_released():
+    class Plugin:
+        pass
+
+    @Piece("used")
+    class Used(Plugin):
+        pass
+
+    @Piece("unused")
+    class Unused(Plugin):
+        pass
+
+    key = registry.key(Unused, "unused")
+    assert len(list(get_pieces_by_supertype(Plugin))) == 2
+    released = weakref.ref(registry.get(key))
+
+    registry.prune(["used"])
+    gc.collect()
+    assert released() is None
+
+
+def test_pruned_instances_held_by_containers_are_released():
+    @Piece("used")
+    class Used:
+        pass
+
+    @Piece("unused")
+    class Unused:
+        pass
+
+    container = registry.container()
+    released = weakref.ref(container.provide(Unused, "unused"))
+
+    registry.prune(["used"])
+    gc.collect()
+    assert released() is None
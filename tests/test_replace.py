@@ -0,0 +1,75 @@
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceNotFound, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Config:
+    def __init__(self, value: int = 1) -> None:
+        self.value = value
+
+
+class Client:
+    def __init__(self, config: Annotated[Config, "config"]) -> None:
+        self.config = config
+
+
+class Service:
+    def __init__(self, client: Annotated[Client, "client"]) -> None:
+        self.client = client
+
+
+class Unrelated:
+    pass
+
+
+def _register():
+    Piece("config")(Config)
+    Piece("client")(Client)
+    Piece("service")(Service)
+    Piece("unrelated")(Unrelated)
+
+
+def test_replace_rebuilds_only_dependents():
+    _register()
+    service, unrelated = provide(Service, "service"), provide(Unrelated, "unrelated")
+
+    registry.replace("config", Config, Config(2))
+
+    new_service = registry["service"][Service].get_instance()
+    assert new_service is not None and new_service is not service
+    assert new_service.client.config.value == 2
+    assert provide(Service, "service") is new_service
+    assert provide(Unrelated, "unrelated") is unrelated
+
+
+def test_replace_keeps_not_instantiated_pieces_lazy():
+    _register()
+
+    def reloaded_config() -> Config:
+        return Config(3)
+
+    registry.replace("config", Config, reloaded_config)
+
+    assert registry["client"][Client].get_instance() is None
+    assert provide(Client, "client").config.value == 3
+
+
+def test_replace_in_background():
+    _register()
+    service = provide(Service, "service")
+
+    future = registry.replace("config", Config, Config(4), background=True)
+    future.result(timeout=5)
+
+    assert provide(Service, "service") is not service
+    assert provide(Service, "service").client.config.value == 4
+
+
+def test_replace_unknown_piece():
+    with pytest.raises(PieceNotFound):
+        registry.replace("config", Config, Config(2))
@@ -0,0 +1,153 @@
+import gc
+import weakref
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceFactory, PieceNotFound, Scope, provide
+from pieceful.piece_data import piece_data_factory
+from pieceful.pytest_plugin import piece_override, pieceful_registry  # noqa: F401
+from pieceful.registry import Registry, registry
+
+from .models import AbstractBrakes, AbstractEngine, AbstractVehicle
+from .setup import refresh_after  # noqa: F401
+
+
+class Engine(AbstractEngine):
+    pass
+
+
+class FakeEngine(AbstractEngine):
+    pass
+
+
+class Brakes(AbstractBrakes):
+    pass
+
+
+class Car(AbstractVehicle):
+    def __init__(self, engine: Annotated[AbstractEngine, "engine"]) -> None:
+        self.engine = engine
+
+
+def _register_car():
+    Piece("engine")(Engine)
+    Piece("brakes")(Brakes)
+    Piece("car")(Car)
+
+
+def test_restore_removes_later_pieces_and_instances():
+    Piece("engine")(Engine)
+    snapshot = registry.snapshot()
+
+    engine = provide(Engine, "engine")
+    Piece("brakes")(Brakes)
+    registry.restore(snapshot)
+
+    with pytest.raises(PieceNotFound):
+        provide(Brakes, "brakes")
+    assert provide(Engine, "engine") is not engine
+
+
+def test_restore_keeps_instances_created_before_snapshot():
+    Piece("engine")(Engine)
+    engine = provide(Engine, "engine")
+    snapshot = registry.snapshot()
+
+    registry.restore(snapshot)
+    assert provide(Engine, "engine") is engine
+
+
+def test_snapshot_does_not_hold_weak_instances_nor_access_idle_ones():
+    class Model:
+        pass
+
+    Piece("model", scope=Scope.WEAK)(Model)
+    Piece("engine", idle=60)(Engine)
+    model = provide(Model, "model")
+    provide(Engine, "engine")
+    idle = registry.registry["engine"].entries[0]
+    accessed = idle._accessed
+
+    snapshot = registry.snapshot()
+    assert idle._accessed == accessed
+    released = weakref.ref(model)
+    del model
+    gc.collect()
+    assert released() is None
+
+    registry.restore(snapshot)
+    assert provide(Model, "model") is not None
+
+
+def test_restore_brings_back_profiles_and_blueprint_pieces():
+    blueprint_source = Registry()
+    blueprint_source.add("brakes", piece_data_factory(Brakes, Scope.UNIVERSAL, Brakes))
+    Piece("engine", profiles="api")(Engine)
+    registry.load_blueprint(blueprint_source.blueprint())
+    snapshot = registry.snapshot()
+    assert "brakes" in registry._pending  # not built by snapshot
+
+    provide(Brakes, "brakes")
+    registry.activate("worker")
+    assert registry.profiles == frozenset({"worker"}) and "brakes" not in registry._pending
+
+    registry.restore(snapshot)
+    assert registry.profiles is None and "brakes" in registry._pending and "brakes" not in registry.registry
+    registry.activate("api")
+    assert isinstance(provide(AbstractEngine, "engine"), Engine)
+    assert isinstance(provide(Brakes, "brakes"), Brakes)
+
+
+def test_override_with_instance_invalidates_only_dependents():
+    _register_car()
+    car, brakes = provide(Car, "car"), provide(Brakes, "brakes")
+    fake = FakeEngine()
+
+    with registry.override("engine", AbstractEngine, fake):
+        assert provide(AbstractEngine, "engine") is fake
+        assert provide(Car, "car").engine is fake
+        assert provide(Brakes, "brakes") is brakes
+
+    assert provide(Car, "car") is car
+    assert car.engine.__class__ is Engine
+
+
+def test_override_with_factory():
+    _register_car()
+
+    @PieceFactory("fake", scope=Scope.ORIGINAL)
+    def fake_brakes() -> AbstractBrakes:
+        return Brakes()
+
+    def engine_factory(brakes: Annotated[AbstractBrakes, "fake"]) -> AbstractEngine:
+        return FakeEngine()
+
+    with registry.override("engine", Engine, engine_factory):
+        assert provide(Car, "car").engine.__class__ is FakeEngine
+
+
+def test_override_with_factory_keeps_policy_of_piece():
+    Piece("engine", idle=60, offload=True)(Engine)
+
+    with registry.override("engine", Engine, FakeEngine):
+        (replacement,) = registry["engine"].entries
+        assert (replacement.idle, replacement.offload) == (60, True)
+        assert provide(Engine, "engine") is provide(Engine, "engine")
+
+
+def test_override_frozen_registry():
+    _register_car()
+    registry.freeze()
+
+    with registry.override("engine", Engine, FakeEngine):
+        assert provide(Car, "car").engine.__class__ is FakeEngine
+    assert provide(Car, "car").engine.__class__ is Engine
+
+
+def test_pytest_plugin_fixtures(pieceful_registry: Registry, piece_override):
+    _register_car()
+    piece_override("engine", AbstractEngine, FakeEngine)
+
+    assert pieceful_registry is registry
+    assert provide(Car, "car").engine.__class__ is FakeEngine
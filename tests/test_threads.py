@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from typing import Annotated
+
+from pieceful import Piece, aprovide, get_pieces_by_supertype, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+def test_registration_during_iteration_does_not_affect_readers():
+    @Piece("engine")
+    class Engine:
+        pass
+
+    table = registry.registry["engine"]
+    pieces = get_pieces_by_supertype(object)
+    next(pieces)
+
+    @Piece("wheel")
+    class Wheel:
+        pass
+
+    assert list(pieces) == []
+    assert registry.registry["engine"] is table
+    assert set(registry.registry) == {"engine", "wheel"}
+
+
+def test_concurrent_registration_and_lookup():
+    class Engine:
+        pass
+
+    Piece("engine")(Engine)
+    errors = []
+
+    def register(offset: int):
+        try:
+            for i in range(100):
+                Piece(f"piece_{offset}_{i}")(type(f"Piece{i}", (), {}))
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    def read():
+        try:
+            for _ in range(500):
+                assert provide(Engine, "engine") is not None
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(4)]
+    threads += [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(registry.registry) == 401
+
+
+def test_concurrent_first_access_creates_one_instance():
+    created = []
+
+    @Piece("config")
+    class Config:
+        def __init__(self) -> None:
+            created.append(self)
+            time.sleep(0.01)
+
+    @Piece("engine")
+    class Engine:
+        def __init__(self, config: Annotated[Config, "config"]) -> None:
+            created.append(self)
+            time.sleep(0.01)
+
+    barrier = threading.Barrier(16)
+    results = []
+
+    def first_access():
+        barrier.wait()
+        results.append(provide(Engine, "engine"))
+
+    threads = [threading.Thread(target=first_access) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2
+    assert len(results) == 16 and all(engine is results[0] for engine in results)
+
+
+def test_sync_and_async_first_access_create_one_instance():
+    created = []
+    constructing = threading.Event()
+
+    @Piece("engine")
+    class Engine:
+        def __init__(self) -> None:
+            constructing.set()
+            time.sleep(0.05)
+            created.append(self)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(provide(Engine, "engine")))
+    thread.start()
+    constructing.wait()
+    results.append(asyncio.run(aprovide(Engine, "engine")))
+    thread.join()
+
+    assert len(created) == 1
+    assert results[0] is results[1]
+
+
+def test_concurrent_first_access_in_container_creates_one_instance():
+    created = []
+
+    @Piece("engine")
+    class Engine:
+        def __init__(self) -> None:
+            created.append(self)
+            time.sleep(0.01)
+
+    tenant = registry.container()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def first_access():
+        barrier.wait()
+        results.append(tenant.provide(Engine, "engine"))
+
+    threads = [threading.Thread(target=first_access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert len(results) == 8 and all(engine is results[0] for engine in results)
@@ -0,0 +1,65 @@
+import json
+from typing import Annotated
+
+from pieceful import Piece, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+class Engine:
+    pass
+
+
+class Car:
+    def __init__(self, engine: Annotated[Engine, "engine"]) -> None:
+        self.engine = engine
+
+
+def _register():
+    Piece("engine")(Engine)
+    Piece("car")(Car)
+
+
+def test_tracing_records_nested_resolutions(tmp_path):
+    _register()
+    tracer = registry.enable_tracing()
+    try:
+        provide(Car, "car")
+        provide(Car, "car")
+    finally:
+        registry.disable_tracing()
+
+    events = [(e.phase, e.piece_name, e.singleton_hit) for e in tracer.events()]
+    assert events == [
+        ("B", "car", False),
+        ("B", "engine", False),
+        ("E", "engine", False),
+        ("E", "car", False),
+        ("B", "car", True),
+        ("E", "car", True),
+    ]
+
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(path)
+    trace = json.loads(path.read_text())
+    assert [e["name"] for e in trace["traceEvents"]] == ["car", "engine", "engine", "car", "car", "car"]
+    assert trace["traceEvents"][0]["args"] == {"type": "Car", "scope": "UNIVERSAL", "singleton_hit": False}
+
+    stacks = [line.rsplit(" ", 1)[0] for line in tracer.to_collapsed_stacks().splitlines()]
+    assert stacks == ["car:Car;engine:Engine", "car:Car"]
+
+
+def test_tracing_ring_buffer_is_bounded():
+    _register()
+    tracer = registry.enable_tracing(capacity=4)
+    try:
+        for _ in range(10):
+            provide(Car, "car")
+    finally:
+        registry.disable_tracing()
+
+    events = tracer.events()
+    assert len(events) == 4
+    assert events[-1].seq == 21
+    assert tracer.to_collapsed_stacks().startswith("car:Car ")
@@ -0,0 +1,122 @@
+import gc
+import time
+from typing import Annotated
+
+import pytest
+
+from pieceful import Piece, PieceIncorrectUseException, Provider, Scope, inject, provide
+from pieceful.registry import registry
+
+from .setup import refresh_after  # noqa: F401
+
+
+def test_weak_piece_is_created_again_after_collection():
+    created = []
+
+    @Piece("model", scope=Scope.WEAK)
+    class Model:
+        def __init__(self) -> None:
+            created.append(self)
+
+    model = provide(Model, "model")
+    assert provide(Model, "model") is model
+    assert len(created) == 1
+
+    del model
+    created.clear()
+    gc.collect()
+    model = provide(Model, "model")
+    assert created == [model]
+
+
+def test_weak_piece_is_not_held_by_dependents_caches():
+    @Piece("model", scope=Scope.WEAK)
+    class Model:
+        pass
+
+    @inject
+    def handler(model: Annotated[Model, "model"]) -> int:
+        return id(model)
+
+    @Piece("service", scope=Scope.ORIGINAL)
+    class Service:
+        def __init__(self, model: Annotated[Model, "model"]) -> None:
+            self.model = model
+
+    handler()
+    Provider(registry, Service, "service")()
+    gc.collect()
+    assert registry.registry["model"].entries[0].get_instance() is None
+
+
+def test_weak_piece_requires_weak_references():
+    @Piece("table", scope=Scope.WEAK)
+    class Table:
+        __slots__ = ()
+
+    with pytest.raises(PieceIncorrectUseException, match="weak references"):
+        provide(Table, "table")
+
+
+def test_trim_drops_idle_pieces():
+    created = []
+
+    @Piece("model", idle=0.05)
+    class Model:
+        def __init__(self) -> None:
+            created.append(self)
+
+    @Piece("table")
+    class Table:
+        pass
+
+    model, table = provide(Model, "model"), provide(Table, "table")
+    assert registry.trim() == 0
+
+    time.sleep(0.06)
+    assert registry.trim() == 1
+    assert provide(Model, "model") is not model
+    assert provide(Table, "table") is table
+    assert len(created) == 2
+
+
+def test_access_postpones_idle_eviction():
+    @Piece("model", idle=0.1)
+    class Model:
+        pass
+
+    model = provide(Model, "model")
+    for _ in range(3):
+        time.sleep(0.04)
+        assert provide(Model, "model") is model
+    assert registry.trim() == 0
+
+
+def test_forced_trim_invalidates_injected_instances():
+    @Piece("model", idle=60)
+    class Model:
+        pass
+
+    @inject
+    def handler(model: Annotated[Model, "model"]) -> Model:
+        return model
+
+    first = handler()
+    assert registry.trim(force=True) == 1
+    assert handler() is not first
+    assert registry.trim(force=True) == 1
+    assert registry.trim(force=True) == 0
+
+
+def test_invalid_idle_pieces():
+    with pytest.raises(PieceIncorrectUseException, match="Idle"):
+
+        @Piece("model", scope=Scope.ORIGINAL, idle=1)
+        class Model:
+            pass
+
+    with pytest.raises(PieceIncorrectUseException, match="Idle"):
+
+        @Piece("other", idle=0)
+        class Other:
+            pass
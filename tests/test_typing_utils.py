@@ -119,6 +119,7 @@ def test_is_subclass():
     assert not is_subclass(int, Literal[1])
     assert not is_subclass(Literal[1, "string"], int)
     assert not is_subclass(int, str)
+    assert not is_subclass(Character, Inventory[int])
     assert not is_subclass(Literal[ArmorInventory()], Literal[Inventory[Armor]()])
     assert not is_subclass(Literal[Inventory[str]()], Literal[Inventory[int]()])
     assert not is_subclass(Literal[Inventory[str]()], Literal[Inventory[str]()])